@@ -0,0 +1,465 @@
+import re
+from array import array
+from datetime import timedelta
+
+from clock import to_ticks, travel_ticks
+
+TRUCK_PATTERN = re.compile(r"only be on truck (\d+)", re.IGNORECASE)
+DELAYED_PATTERN = re.compile(r"until (\d{1,2}):(\d{2}) ?([ap])\.?m", re.IGNORECASE)
+DELIVERED_WITH_PATTERN = re.compile(r"delivered with ([\d,\s]+)", re.IGNORECASE)
+
+
+def parse_notes(notes):
+    """
+    Extracts loading constraints from a package's special notes.
+
+    Recognized notes:
+    - "Can only be on truck N": the package must ride on truck N.
+    - "Delayed ... until 9:05 am": the package is not at the hub before that time.
+    - "Must be delivered with 13, 19": the package must share a truck with those packages.
+
+    Returns:
+    - A tuple (truck_number, available_time, delivered_with), where truck_number is an int or None,
+      available_time is a timedelta or None, and delivered_with is a list of package IDs.
+
+    Time Complexity: O(m), where m is the length of the notes.
+    """
+    notes = notes or ""
+    truck_number = None
+    available_time = None
+    delivered_with = []
+
+    match = TRUCK_PATTERN.search(notes)
+    if match:
+        truck_number = int(match.group(1))
+    match = DELAYED_PATTERN.search(notes)
+    if match:
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == 'p' else 0)
+        available_time = timedelta(hours=hour, minutes=int(match.group(2)))
+    match = DELIVERED_WITH_PATTERN.search(notes)
+    if match:
+        delivered_with = [int(package_id) for package_id in re.findall(r"\d+", match.group(1))]
+    return truck_number, available_time, delivered_with
+
+
+def assign_packages(trucks, package_data, package_ids, distance_index, relocation_passes=2, candidate_trucks=3):
+    """
+    Assigns packages to trucks, respecting their notes, capacity, departure times and deadlines.
+
+    Process Flow:
+    1. Parse each package's notes and merge packages that must travel together into groups. A package
+       with an address correction is not available before the corrected address is known.
+       Compatible groups sharing an address are merged as well, since they cost nothing extra.
+    2. Place groups one at a time, most constrained and most urgent first, on the feasible truck
+       whose current stops are closest to the group's addresses. Groups with a deadline go on the
+       closest truck whose simulated route still delivers everything on time, when there is one.
+    3. Simulate each truck's nearest neighbor route and move groups off trucks that deliver late.
+    4. Relocate groups between nearby trucks while doing so lowers the total simulated mileage.
+    5. Store the resulting package lists on the trucks.
+
+    Parameters:
+    - trucks: The Truck objects to load. Each truck's `packages` list is replaced.
+    - package_data: The hash table of packages.
+    - package_ids: The IDs of the packages to assign.
+    - distance_index: The DistanceIndex used for routing.
+    - relocation_passes: How many relocation passes to run over all groups.
+    - candidate_trucks: How many of the closest feasible trucks to try per relocation.
+
+    Returns:
+    - A dictionary mapping each truck number to its list of package IDs.
+
+    Raises:
+    - ValueError: If a group's constraints conflict or no truck can take a group.
+
+    Time Complexity: O(g * k + p * a + r * g * c * t^2), where g is the number of groups, k the number
+    of trucks, p the number of packages, a the number of addresses, r the relocation passes,
+    c the candidate trucks and t the packages per truck.
+    """
+    packages = {package_id: package_data.lookup(package_id) for package_id in package_ids}
+    groups = _build_groups(packages, distance_index, max(truck.capacity for truck in trucks))
+    plans = [_TruckPlan(truck, distance_index) for truck in trucks]
+
+    groups.sort(key=lambda group: (group.truck_number is None,
+                                   float('inf') if group.deadline is None else group.deadline,
+                                   -len(group.package_ids)))
+    for group in groups:
+        feasible = [plan for plan in plans if plan.accepts(group)]
+        if not feasible:
+            raise ValueError(f"No truck can carry packages {group.package_ids}")
+        feasible.sort(key=lambda plan: (plan.attach_cost(group), plan.truck.depart_ticks))
+        best = feasible[0]
+        if group.deadline is not None:
+            best = next((plan for plan in feasible[:candidate_trucks] if plan.stays_on_time(group)), best)
+        best.add(group)
+
+    _repair_deadlines(plans)
+    for _ in range(relocation_passes):
+        if not _relocate(groups, plans, candidate_trucks):
+            break
+
+    assignments = {}
+    for plan in plans:
+        plan.truck.packages = [package_id for group in plan.groups for package_id in group.package_ids]
+        assignments[plan.truck.truck_number] = list(plan.truck.packages)
+    return assignments
+
+
+class _Group:
+    """
+    Packages that must be loaded onto the same truck.
+
+    Times are in ticks, the integer microseconds the router uses, so the solver's lateness checks
+    agree with the routed result to the microsecond.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty group with no constraints.
+
+        Time Complexity: O(1).
+        """
+        self.package_ids = []
+        self.stops = []  # (address id, deadline in ticks or None) per package
+        self.addresses = set()
+        self.truck_number = None
+        self.available = None
+        self.deadline = None
+        self.plan = None
+
+    def merge(self, other):
+        """
+        Absorbs another group's packages and constraints.
+
+        Raises:
+        - ValueError: If the two groups are restricted to different trucks.
+
+        Time Complexity: O(s), where s is the size of the other group.
+        """
+        if None not in (self.truck_number, other.truck_number) and self.truck_number != other.truck_number:
+            raise ValueError(f"Packages {self.package_ids + other.package_ids} are restricted to different trucks")
+        self.package_ids += other.package_ids
+        self.stops += other.stops
+        self.addresses |= other.addresses
+        self.truck_number = self.truck_number or other.truck_number
+        self.available = _latest(self.available, other.available)
+        self.deadline = _earliest(self.deadline, other.deadline)
+
+    def compatible(self, other, capacity):
+        """
+        Checks whether merging with another group keeps it loadable and on time.
+
+        Groups must share the same truck restriction, and delayed packages are never merged with
+        packages that have a deadline, so a constraint on one package cannot hold back another.
+
+        Time Complexity: O(1).
+        """
+        if self.truck_number != other.truck_number:
+            return False
+        available = _latest(self.available, other.available)
+        deadline = _earliest(self.deadline, other.deadline)
+        if available is not None and deadline is not None:
+            return False
+        return len(self.package_ids) + len(other.package_ids) <= capacity
+
+
+def _latest(first, second):
+    """
+    Returns the later of two optional times.
+
+    Time Complexity: O(1).
+    """
+    return second if first is None else first if second is None else max(first, second)
+
+
+def _earliest(first, second):
+    """
+    Returns the earlier of two optional times.
+
+    Time Complexity: O(1).
+    """
+    return second if first is None else first if second is None else min(first, second)
+
+
+def _build_groups(packages, distance_index, capacity):
+    """
+    Groups packages that must travel together, then merges compatible groups at shared addresses.
+
+    Time Complexity: O(p * α(p)), where p is the number of packages, using union-find.
+    """
+    parent = {package_id: package_id for package_id in packages}
+
+    def find(package_id):
+        while parent[package_id] != package_id:
+            parent[package_id] = parent[parent[package_id]]
+            package_id = parent[package_id]
+        return package_id
+
+    constraints = {}
+    for package_id, package in packages.items():
+        constraints[package_id] = parse_notes(package.notes)
+        for other_id in constraints[package_id][2]:
+            if other_id in parent:
+                parent[find(other_id)] = find(package_id)
+
+    groups = {}
+    for package_id, package in packages.items():
+        truck_number, available_time, _ = constraints[package_id]
+        available = to_ticks(available_time)
+        if package.address_correction is not None:
+            # The package waits at the hub until its corrected address is known
+            available = _latest(available, package.address_correction.ticks)
+        single = _Group()
+        single.package_ids.append(package_id)
+        address_id = distance_index.id_of(package.delivery_address)
+        single.stops.append((address_id, package.deadline_ticks))
+        single.addresses.add(address_id)
+        single.truck_number = truck_number
+        single.available = available
+        single.deadline = package.deadline_ticks
+        root = find(package_id)
+        if root in groups:
+            groups[root].merge(single)
+        else:
+            groups[root] = single
+
+    by_address = {}
+    merged = []
+    for group in groups.values():
+        target = None
+        if len(group.addresses) == 1:
+            address_id = next(iter(group.addresses))
+            target = by_address.get(address_id)
+            if target is not None and target.compatible(group, capacity):
+                target.merge(group)
+                continue
+            by_address[address_id] = group
+        merged.append(group)
+    return merged
+
+
+class _TruckPlan:
+    """
+    The groups loaded onto one truck, plus a cache of attachment distances for fast placement.
+    """
+
+    def __init__(self, truck, distance_index):
+        """
+        Initializes an empty plan for a truck.
+
+        Attributes:
+        - attach: For every address id, the distance to the closest address already on the truck
+          (or the hub), so placement cost is an O(1) lookup.
+
+        Time Complexity: O(a), where a is the number of addresses.
+        """
+        self.truck = truck
+        self.distance_index = distance_index
+        self.hub = distance_index.id_of(truck.start_location)
+        self.groups = []
+        self.size = 0
+        self.attach = array('d', distance_index.row(self.hub))
+        self.depart_ticks = truck.depart_ticks
+        self._route_cache = None
+
+    def accepts(self, group):
+        """
+        Checks whether the group can be loaded onto this truck.
+
+        A group with a deadline is rejected when even a direct trip from the hub would be late.
+
+        Time Complexity: O(s), where s is the number of addresses in the group.
+        """
+        truck = self.truck
+        if self.size + len(group.package_ids) > truck.capacity:
+            return False
+        if group.truck_number is not None and group.truck_number != truck.truck_number:
+            return False
+        if group.available is not None and self.depart_ticks < group.available:
+            return False
+        if group.deadline is not None:
+            direct = min(self.distance_index.distance_by_id(self.hub, address) for address in group.addresses)
+            if self.depart_ticks + travel_ticks(direct, truck.speed) > group.deadline:
+                return False
+        return True
+
+    def attach_cost(self, group):
+        """
+        Returns the distance from the group's closest address to the truck's current stops.
+
+        Time Complexity: O(s), where s is the number of addresses in the group.
+        """
+        return min(self.attach[address] for address in group.addresses)
+
+    def add(self, group):
+        """
+        Loads a group and updates the attachment cache.
+
+        Time Complexity: O(s * a), where s is the number of new addresses and a the number of addresses.
+        """
+        self.groups.append(group)
+        self.size += len(group.package_ids)
+        group.plan = self
+        attach = self.attach
+        for address in group.addresses:
+            row = self.distance_index.row(address)
+            for index in range(len(attach)):
+                if row[index] < attach[index]:
+                    attach[index] = row[index]
+        self._route_cache = None
+
+    def remove(self, group):
+        """
+        Unloads a group and rebuilds the attachment cache from the remaining groups.
+
+        Time Complexity: O(g * s * a), where g is the number of groups on the truck.
+        """
+        self.groups.remove(group)
+        group.plan = None
+        remaining = self.groups
+        self.groups = []
+        self.size = 0
+        self.attach = array('d', self.distance_index.row(self.hub))
+        for other in remaining:
+            self.add(other)
+
+    def route(self, adding=None, removing=None):
+        """
+        Simulates the truck's nearest neighbor route over its groups.
+
+        Parameters:
+        - adding: An optional group to include, without loading it.
+        - removing: An optional group to leave out, without unloading it.
+
+        Returns:
+        - A tuple (miles, late_groups), where late_groups lists the groups with a late package.
+
+        Time Complexity: O(t^2), where t is the number of packages on the truck. The plain route is
+        cached until the plan changes.
+        """
+        if adding is None and removing is None:
+            if self._route_cache is None:
+                self._route_cache = self._simulate(self.groups)
+            return self._route_cache
+        groups = [group for group in self.groups if group is not removing]
+        if adding is not None:
+            groups.append(adding)
+        return self._simulate(groups)
+
+    def stays_on_time(self, group):
+        """
+        Checks whether loading the group delivers it on time without making other deliveries late.
+
+        Time Complexity: O(t^2), where t is the number of packages on the truck.
+        """
+        late = self.route(adding=group)[1]
+        return group not in late and len(late) <= len(self.route()[1])
+
+    def _simulate(self, groups):
+        """
+        Runs nearest neighbor routing from the hub over the given groups.
+
+        Time Complexity: O(t^2), where t is the number of packages in the groups.
+        """
+        return _simulate(self.hub, self.depart_ticks, self.truck.speed, groups,
+                         self.distance_index.distance_by_id)
+
+
+def _simulate(hub, depart_ticks, speed, groups, distance):
+    """
+    Runs nearest neighbor routing over address ids, without touching any Package objects.
+
+    The clock advances leg by leg with `travel_ticks`, exactly as the router's does, so a package
+    counts as late here exactly when the routed truck would deliver it late.
+
+    Time Complexity: O(t^2), where t is the number of packages.
+    """
+    remaining = [(address, deadline, group) for group in groups for address, deadline in group.stops]
+    location = hub
+    miles = 0.0
+    ticks = depart_ticks
+    late = []
+    while remaining:
+        best = 0
+        shortest = float('inf')
+        for index, stop in enumerate(remaining):
+            length = distance(location, stop[0])
+            if length < shortest:
+                shortest = length
+                best = index
+        address, deadline, group = remaining.pop(best)
+        miles += shortest
+        ticks += travel_ticks(shortest, speed)
+        location = address
+        if deadline is not None and ticks > deadline and group not in late:
+            late.append(group)
+    return miles, late
+
+
+def _repair_deadlines(plans):
+    """
+    Moves groups delivered late to another truck where they arrive on time without making
+    any of that truck's other deliveries late.
+
+    Among the trucks that can take a late group, the one whose mileage grows least is chosen.
+
+    Time Complexity: O(l * k * t^2), where l is the number of late groups, k the number of trucks
+    and t the packages per truck.
+    """
+    for plan in plans:
+        _, late = plan.route()
+        for group in list(late):
+            best = None
+            best_increase = float('inf')
+            for other in plans:
+                if other is plan or not other.accepts(group):
+                    continue
+                current_miles, current_late = other.route()
+                miles, other_late = other.route(adding=group)
+                if group in other_late or len(other_late) > len(current_late):
+                    continue
+                if miles - current_miles < best_increase:
+                    best = other
+                    best_increase = miles - current_miles
+            if best is not None:
+                plan.remove(group)
+                best.add(group)
+
+
+def _relocate(groups, plans, candidate_trucks):
+    """
+    Moves groups to one of the closest other trucks when total simulated mileage drops.
+
+    A move is only kept when it introduces no late deliveries on either truck.
+
+    Returns:
+    - True if any group moved.
+
+    Time Complexity: O(g * (k + c * t^2)), where c is `candidate_trucks`.
+    """
+    moved = False
+    for group in groups:
+        source = group.plan
+        if len(source.groups) == 1:
+            continue
+        candidates = sorted((plan for plan in plans if plan is not source and plan.accepts(group)),
+                            key=lambda plan: plan.attach_cost(group))[:candidate_trucks]
+        if not candidates:
+            continue
+        source_miles, source_late = source.route()
+        reduced_miles, reduced_late = source.route(removing=group)
+        if len(reduced_late) > len(source_late):
+            continue
+        best = None
+        best_saving = 1e-9
+        for target in candidates:
+            target_miles, target_late = target.route()
+            miles, late = target.route(adding=group)
+            saving = (source_miles + target_miles) - (reduced_miles + miles)
+            if len(late) <= len(target_late) and saving > best_saving:
+                best = target
+                best_saving = saving
+        if best is not None:
+            source.remove(group)
+            best.add(group)
+            moved = True
+    return moved
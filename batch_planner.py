@@ -0,0 +1,304 @@
+"""
+Plans many depots and days in one process.
+
+The distance matrix is loaded once and shared with a pool of worker processes. Each worker
+reuses its Truck objects across plans, resetting them with `clear()`.
+
+Manifests are laid out one directory per depot, one CSV per day:
+    manifests/<depot>/<day>.csv
+
+Depots are configured in a JSON file:
+    {
+      "addresses": "./csv/addresses.csv",
+      "distances": "./csv/distances.csv",
+      "depots": {
+        "slc": {"hub": "4001 South 700 East", "departures": ["08:00:00", "09:05:00", "10:20:00"],
+                "corrections": {"9": {"address": "410 S State St", "zip": "84111", "time": "10:20:00"}}}
+      }
+    }
+
+A correction applies only to a package whose notes say "Wrong address listed". Depots have none
+by default.
+
+Run from the repository root:
+    python batch_planner.py --depots depots.json --manifests manifests --output-dir plans
+
+Exit status is 0 when every plan succeeds, 1 when any plan fails, 2 for invalid arguments and 3
+when the configuration or shared input files cannot be read.
+"""
+import argparse
+import json
+import os
+import sys
+
+from cli import EXIT_INPUT, EXIT_OK, EXIT_USAGE, RecordWriter, parse_clock
+from distance_cache import load_cached_distance_index
+from ingest import ADDRESSES_PATH, DISTANCES_PATH, IngestError, load_packages
+from main import DEPARTURE_TIMES, route_day
+from package import attach_address_corrections
+from parallel_routing import shared_distance_pool, worker_distance_index
+from truck import Truck
+
+EXIT_FAILED_PLANS = 1
+
+PLAN_FIELDS = ('depot', 'day', 'packages', 'trucks', 'miles', 'late', 'error')
+ROUTE_FIELDS = ('depot', 'day', 'truck', 'depart_time', 'finish_time', 'miles', 'route')
+DELIVERY_FIELDS = ('depot', 'day', 'package_id', 'truck', 'stop', 'depart_time', 'delivery_time',
+                   'delivery_deadline', 'on_time')
+
+# Trucks kept by each worker process between plans, keyed by depot name
+_worker_trucks = {}
+
+
+class Depot:
+    """
+    A hub and its fleet: where the trucks start, when they leave, and how much they carry.
+    """
+
+    def __init__(self, name, hub, departure_times=DEPARTURE_TIMES, capacity=16, address_corrections=None):
+        """
+        Initializes a depot.
+
+        Parameters:
+        - name: The depot's name, matching its manifest directory.
+        - hub: The address its trucks start from.
+        - departure_times: One departure time per truck, numbered from 1.
+        - capacity: The maximum packages per truck.
+        - address_corrections: Corrections for packages listed with a wrong address, as taken by
+          `package.attach_address_corrections`. Defaults to none.
+
+        Time Complexity: O(1).
+        """
+        self.name = name
+        self.hub = hub
+        self.departure_times = tuple(departure_times)
+        self.capacity = capacity
+        self.address_corrections = dict(address_corrections or {})
+
+    def make_trucks(self):
+        """
+        Builds the depot's fleet.
+
+        Time Complexity: O(k), where k is the number of trucks.
+        """
+        trucks = [Truck(number, self.hub, depart_time)
+                  for number, depart_time in enumerate(self.departure_times, start=1)]
+        for truck in trucks:
+            truck.capacity = self.capacity
+        return trucks
+
+
+def load_depots(path):
+    """
+    Reads the depot configuration file.
+
+    Returns:
+    - A tuple (depots, addresses_path, distances_path), where depots maps names to Depot objects.
+      Relative input paths are taken relative to the current directory.
+
+    Raises:
+    - ValueError: If a depot is missing its hub or has an invalid departure time or correction.
+
+    Time Complexity: O(d), where d is the number of depots.
+    """
+    with open(path) as file:
+        config = json.load(file)
+    depots = {}
+    for name, settings in config.get('depots', {}).items():
+        if not settings.get('hub'):
+            raise ValueError(f"depot {name!r} has no hub")
+        departure_times = DEPARTURE_TIMES
+        if 'departures' in settings:
+            try:
+                departure_times = [parse_clock(text) for text in settings['departures']]
+            except argparse.ArgumentTypeError as error:
+                raise ValueError(f"depot {name!r}: {error}") from None
+        corrections = {}
+        for package_id, correction in settings.get('corrections', {}).items():
+            try:
+                corrections[int(package_id)] = (correction['address'], str(correction['zip']),
+                                                parse_clock(correction['time']))
+            except (argparse.ArgumentTypeError, KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"depot {name!r}: invalid correction for package {package_id}: {error}") from None
+        depots[name] = Depot(name, settings['hub'], departure_times, int(settings.get('capacity', 16)),
+                             corrections)
+    return depots, config.get('addresses', ADDRESSES_PATH), config.get('distances', DISTANCES_PATH)
+
+
+def find_manifests(manifest_dir, depots):
+    """
+    Lists every (depot, day, path) to plan, sorted by depot and day.
+
+    Raises:
+    - ValueError: If a manifest directory has no matching depot configuration.
+
+    Time Complexity: O(m log m), where m is the number of manifests.
+    """
+    plans = []
+    for depot_name in sorted(os.listdir(manifest_dir)):
+        depot_dir = os.path.join(manifest_dir, depot_name)
+        if not os.path.isdir(depot_dir):
+            continue
+        if depot_name not in depots:
+            raise ValueError(f"no configuration for depot {depot_name!r}")
+        for file_name in sorted(os.listdir(depot_dir)):
+            day, extension = os.path.splitext(file_name)
+            if extension.lower() == '.csv':
+                plans.append((depots[depot_name], day, os.path.join(depot_dir, file_name)))
+    return plans
+
+
+def plan_manifest(depot, day, manifest_path, distance_index, truck_cache):
+    """
+    Assigns and routes one day's manifest for one depot.
+
+    Process Flow:
+    1. Take the depot's trucks from `truck_cache` and clear them, or build them on first use.
+    2. Load the manifest, schedule the depot's address corrections for packages whose notes ask
+       for one, and route it with the same assignment and routing as main().
+    3. Summarize the trucks and deliveries into plain tuples.
+
+    Returns:
+    - A dictionary with the plan summary, one route per truck and one delivery per package.
+      If the manifest cannot be planned, only the summary is filled and `error` says why.
+
+    Time Complexity: O(n log n + t^2), where n is the number of packages and t the packages per truck.
+    """
+    result = {'depot': depot.name, 'day': day, 'packages': 0, 'trucks': len(depot.departure_times),
+              'miles': 0.0, 'late': 0, 'error': None, 'routes': [], 'deliveries': []}
+    trucks = truck_cache.get(depot.name)
+    if trucks is None:
+        trucks = truck_cache[depot.name] = depot.make_trucks()
+    else:
+        for truck in trucks:
+            truck.clear()
+
+    try:
+        package_data = load_packages(manifest_path)
+        for package_id in attach_address_corrections(package_data, depot.address_corrections):
+            address = package_data.lookup(package_id).address_correction.address
+            if address not in distance_index:
+                raise ValueError(f"Corrected address {address!r} of package {package_id} is not in the distance data")
+        route_day(trucks, package_data, distance_index)
+    except (OSError, IngestError, KeyError, ValueError) as error:
+        result['error'] = str(error)
+        return result
+
+    for truck in trucks:
+        result['routes'].append((truck.truck_number, truck.depart_time, truck.total_time_traveled,
+                                 round(truck.miles, 2), list(truck.packages)))
+        for stop, package_id in enumerate(truck.packages, start=1):
+            package = package_data.lookup(package_id)
+            deadline = package.deadline_ticks
+            on_time = deadline is None or package.delivery_ticks <= deadline
+            result['late'] += not on_time
+            result['deliveries'].append((package_id, truck.truck_number, stop, truck.depart_time,
+                                         package.delivery_time, package.delivery_deadline, on_time))
+    result['packages'] = len(package_data)
+    result['miles'] = round(sum(truck.miles for truck in trucks), 2)
+    return result
+
+
+def _plan_in_worker(task):
+    """
+    Plans one manifest in a worker of the shared distance pool.
+
+    Time Complexity: See `plan_manifest`.
+    """
+    depot, day, manifest_path = task
+    return plan_manifest(depot, day, manifest_path, worker_distance_index(), _worker_trucks)
+
+
+def plan_batch(plans, distance_index, workers=None):
+    """
+    Plans every (depot, day, path) and returns the results in the same order.
+
+    With more than one worker, the plans are spread over a process pool that shares the distance
+    matrix. With one worker they run in this process, which avoids the pool's startup cost for
+    small batches.
+
+    Parameters:
+    - plans: (Depot, day, manifest path) tuples, as returned by `find_manifests`.
+    - distance_index: The shared DistanceIndex. Every depot's hub must be in it.
+    - workers: The number of worker processes, defaulting to the CPU count.
+
+    Time Complexity: O(a^2 + P * c / w), where a is the number of addresses, P the number of plans,
+    c the cost of one plan and w the number of workers.
+    """
+    for depot in {depot.name: depot for depot, _, _ in plans}.values():
+        if depot.hub not in distance_index:
+            raise ValueError(f"hub {depot.hub!r} of depot {depot.name!r} is not in the distance data")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(plans) <= 1:
+        truck_cache = {}
+        return [plan_manifest(depot, day, path, distance_index, truck_cache) for depot, day, path in plans]
+    with shared_distance_pool(distance_index, min(workers, len(plans))) as pool:
+        chunk_size = max(1, len(plans) // (4 * workers))
+        return list(pool.map(_plan_in_worker, plans, chunksize=chunk_size))
+
+
+def write_results(results, output_dir, output_format='csv'):
+    """
+    Writes consolidated plans, routes and deliveries files for every result.
+
+    Time Complexity: O(n), where n is the total number of packages across all plans.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    extension = 'csv' if output_format == 'csv' else 'jsonl'
+    outputs = (('plans', PLAN_FIELDS), ('routes', ROUTE_FIELDS), ('deliveries', DELIVERY_FIELDS))
+    files = [open(os.path.join(output_dir, f"{name}.{extension}"), 'w', newline='', buffering=1 << 20)
+             for name, _ in outputs]
+    try:
+        plans, routes, deliveries = [RecordWriter(file, output_format, fields)
+                                     for file, (_, fields) in zip(files, outputs)]
+        for result in results:
+            depot, day = result['depot'], result['day']
+            plans.write([result[field] for field in PLAN_FIELDS])
+            for route in result['routes']:
+                routes.write((depot, day) + route)
+            for delivery in result['deliveries']:
+                deliveries.write((depot, day) + delivery)
+    finally:
+        for file in files:
+            file.close()
+
+
+def main(argv=None):
+    """
+    Plans every manifest under a directory and writes the consolidated results.
+
+    Returns:
+    - EXIT_OK, EXIT_FAILED_PLANS, EXIT_USAGE or EXIT_INPUT.
+
+    Time Complexity: See `plan_batch`.
+    """
+    parser = argparse.ArgumentParser(description="Plan many WGUPS depots and days at once.")
+    parser.add_argument('--depots', required=True, help="Depot configuration JSON file.")
+    parser.add_argument('--manifests', required=True, help="Directory of <depot>/<day>.csv manifests.")
+    parser.add_argument('--output-dir', required=True, help="Directory for the consolidated results.")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='csv', help="Output format.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    args = parser.parse_args(argv)
+
+    try:
+        depots, addresses_path, distances_path = load_depots(args.depots)
+        plans = find_manifests(args.manifests, depots)
+        distance_index = load_cached_distance_index(addresses_path, distances_path)
+        results = plan_batch(plans, distance_index, args.workers)
+    except (OSError, IngestError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return EXIT_INPUT
+    if not plans:
+        print(f"error: no manifests found under {args.manifests}", file=sys.stderr)
+        return EXIT_USAGE
+
+    write_results(results, args.output_dir, args.format)
+    failed = [result for result in results if result['error']]
+    for result in failed:
+        print(f"{result['depot']}/{result['day']}: {result['error']}", file=sys.stderr)
+    print(f"Planned {len(results) - len(failed)} of {len(results)} manifests into {args.output_dir}")
+    return EXIT_FAILED_PLANS if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
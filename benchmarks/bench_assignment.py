@@ -0,0 +1,115 @@
+"""
+Benchmarks the automatic package assignment against the original fixed truck lists.
+
+Run from the repository root:
+    python -m benchmarks.bench_assignment
+"""
+import math
+import random
+from datetime import timedelta
+from time import perf_counter
+
+import main
+from assignment import assign_packages
+from benchmarks.workload import HUB, service_area
+from hash_table import HashTable
+from ingest import load_addresses, load_distance_index, load_packages
+from package import Package, attach_address_corrections
+from truck import Truck
+
+FIXED_ASSIGNMENT = {
+    1: [1, 13, 14, 15, 16, 19, 20, 29, 30, 31, 34, 37, 40],
+    2: [3, 6, 12, 17, 18, 21, 22, 23, 24, 26, 27, 33, 35, 36, 38, 39],
+    3: [2, 4, 5, 7, 8, 9, 10, 11, 25, 28, 32],
+}
+
+
+def shipped_trucks():
+    """
+    Returns the three trucks used by main(), with their original departure times.
+    """
+    return [Truck(1, HUB, timedelta(hours=8)),
+            Truck(2, HUB, timedelta(hours=9, minutes=5)),
+            Truck(3, HUB, timedelta(hours=10, minutes=20))]
+
+
+def route_summary(trucks, package_data, package_ids, distance_index):
+    """
+    Routes every truck with nearest neighbor and returns (total miles, late package count).
+    """
+    for truck in trucks:
+        main.nearest_neighbor_delivery(truck, package_data, distance_index)
+    late = 0
+    for package_id in package_ids:
+        package = package_data.lookup(package_id)
+        deadline = package.deadline_ticks
+        if deadline is not None and package.delivery_ticks > deadline:
+            late += 1
+    return sum(truck.miles for truck in trucks), late
+
+
+def synthetic_day(package_count, seed):
+    """
+    Builds a random service area, manifest and fleet sized for `package_count` packages.
+    """
+    rng = random.Random(seed)
+    address_count = max(27, package_count // 2)
+    distance_index = service_area(address_count, rng)
+    addresses = distance_index.addresses
+
+    truck_count = math.ceil(package_count / 16 * 1.25)
+    trucks = [Truck(number, HUB, timedelta(hours=8, minutes=20 * (number % 7)))
+              for number in range(1, truck_count + 1)]
+
+    package_data = HashTable(package_count * 2)
+    for package_id in range(1, package_count + 1):
+        roll = rng.random()
+        deadline = '9:00 AM' if roll < 0.03 else '10:30 AM' if roll < 0.25 else 'EOD'
+        notes = ''
+        if deadline == 'EOD' and rng.random() < 0.05:
+            notes = f"Can only be on truck {rng.randint(1, truck_count)}"
+        elif deadline == 'EOD' and rng.random() < 0.08:
+            notes = 'Delayed on flight---will not arrive to depot until 9:05 am'
+        package_data.insert(package_id, Package(
+            package_id, addresses[rng.randrange(1, address_count)], deadline, 'Salt Lake City',
+            'UT', '84101', float(rng.randint(1, 50)), notes, 'at hub'))
+    return trucks, package_data, distance_index
+
+
+def main_benchmark():
+    """
+    Compares mileage and lateness on the shipped data, then times the solver on larger manifests.
+    """
+    address_list = load_addresses()
+    distance_index = load_distance_index(address_list)
+    package_ids = range(1, 41)
+
+    trucks = shipped_trucks()
+    package_data = load_packages()
+    attach_address_corrections(package_data, main.ADDRESS_CORRECTIONS)
+    for truck in trucks:
+        truck.packages = list(FIXED_ASSIGNMENT[truck.truck_number])
+    miles, late = route_summary(trucks, package_data, package_ids, distance_index)
+    print(f"fixed assignment     packages=40    miles={miles:8.1f}  late={late}")
+
+    trucks = shipped_trucks()
+    package_data = load_packages()
+    attach_address_corrections(package_data, main.ADDRESS_CORRECTIONS)
+    start = perf_counter()
+    assign_packages(trucks, package_data, package_ids, distance_index)
+    elapsed = perf_counter() - start
+    miles, late = route_summary(trucks, package_data, package_ids, distance_index)
+    print(f"automatic assignment packages=40    miles={miles:8.1f}  late={late}  solve={elapsed:.4f}s")
+
+    for package_count in (250, 1000, 2000):
+        trucks, package_data, synthetic_index = synthetic_day(package_count, seed=package_count)
+        ids = range(1, package_count + 1)
+        start = perf_counter()
+        assign_packages(trucks, package_data, ids, synthetic_index)
+        elapsed = perf_counter() - start
+        miles, late = route_summary(trucks, package_data, ids, synthetic_index)
+        print(f"automatic assignment packages={package_count:<5} miles={miles:8.1f}  late={late}  solve={elapsed:.4f}s")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,123 @@
+"""
+Compares the deadline-aware router with nearest neighbor on lateness, mileage and run time.
+
+Run from the repository root:
+    python -m benchmarks.bench_deadline_routing
+    python -m benchmarks.bench_deadline_routing --stops 1000 5000
+"""
+import argparse
+import math
+import random
+from datetime import timedelta
+from time import perf_counter
+
+import main
+from assignment import assign_packages
+from benchmarks.bench_assignment import FIXED_ASSIGNMENT, shipped_trucks, synthetic_day
+from benchmarks.workload import AREA_MILES, HUB, service_area
+from deadline_routing import deadline_aware_delivery, late_packages
+from hash_table import HashTable
+from ingest import load_addresses, load_distance_index, load_packages
+from package import Package, attach_address_corrections
+from truck import Truck
+
+ROUTERS = (('nearest', main.nearest_neighbor_delivery), ('deadline', deadline_aware_delivery))
+WORKDAY_HOURS = 8
+
+
+def route_all(trucks, package_data, distance_index, router):
+    """
+    Routes every truck with one router.
+
+    Returns:
+    - A tuple (total miles, late packages, seconds spent routing).
+    """
+    start = perf_counter()
+    for truck in trucks:
+        router(truck, package_data, distance_index)
+    elapsed = perf_counter() - start
+    late = sum(len(packages) for packages in late_packages(trucks, package_data).values())
+    return sum(truck.miles for truck in trucks), late, elapsed
+
+
+def large_truck_day(stop_count, seed):
+    """
+    Builds one truck carrying `stop_count` packages over a random service area.
+
+    The truck's speed is scaled so the route takes about a workday, and deadlines follow the same
+    few enough of them by 10:00 AM and noon that a deadline-first route can meet every one.
+    """
+    rng = random.Random(seed)
+    address_count = max(27, stop_count // 2)
+    distance_index = service_area(address_count, rng)
+    addresses = distance_index.addresses
+
+    truck = Truck(1, HUB, timedelta(hours=8))
+    # Expected length of a good tour through n random points in an area A is about 0.7 * sqrt(n * A)
+    truck.speed = max(18, round(0.7 * math.sqrt(address_count * AREA_MILES ** 2) / WORKDAY_HOURS))
+    package_data = HashTable(stop_count * 2)
+    for package_id in range(1, stop_count + 1):
+        roll = rng.random()
+        deadline = '10:00 AM' if roll < 0.01 else '12:00 PM' if roll < 0.06 else 'EOD'
+        package_data.insert(package_id, Package(
+            package_id, addresses[rng.randrange(1, address_count)], deadline, 'Salt Lake City',
+            'UT', '84101', 1.0, '', 'at hub'))
+    truck.packages = list(range(1, stop_count + 1))
+    return truck, package_data, distance_index
+
+
+def print_row(label, results):
+    """
+    Prints one scenario's results for every router on one line.
+    """
+    columns = [f"{name}: miles={miles:9.1f} late={late:<4} time={elapsed:.3f}s"
+               for name, (miles, late, elapsed) in results]
+    print(f"{label:<28}" + "   ".join(columns))
+
+
+def main_benchmark(argv=None):
+    """
+    Runs the shipped day, synthetic fleets and single large trucks through both routers.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark deadline-aware routing against nearest neighbor.")
+    parser.add_argument('--fleets', type=int, nargs='+', default=[250, 1000, 2000],
+                        help="Package counts for synthetic multi-truck days.")
+    parser.add_argument('--stops', type=int, nargs='+', default=[500, 1000, 2000, 5000],
+                        help="Stop counts for a single large truck.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    distance_index = load_distance_index(load_addresses())
+    package_ids = range(1, 41)
+    for label, fixed in (('shipped, fixed assignment', True), ('shipped, automatic', False)):
+        results = []
+        for name, router in ROUTERS:
+            trucks = shipped_trucks()
+            package_data = load_packages()
+            attach_address_corrections(package_data, main.ADDRESS_CORRECTIONS)
+            if fixed:
+                for truck in trucks:
+                    truck.packages = list(FIXED_ASSIGNMENT[truck.truck_number])
+            else:
+                assign_packages(trucks, package_data, package_ids, distance_index)
+            results.append((name, route_all(trucks, package_data, distance_index, router)))
+        print_row(label, results)
+
+    for package_count in args.fleets:
+        results = []
+        for name, router in ROUTERS:
+            trucks, package_data, synthetic_index = synthetic_day(package_count, seed=args.seed + package_count)
+            assign_packages(trucks, package_data, range(1, package_count + 1), synthetic_index)
+            results.append((name, route_all(trucks, package_data, synthetic_index, router)))
+        print_row(f"fleet, {package_count} packages", results)
+
+    for stop_count in args.stops:
+        results = []
+        for name, router in ROUTERS:
+            truck, package_data, synthetic_index = large_truck_day(stop_count, seed=args.seed + stop_count)
+            results.append((name, route_all([truck], package_data, synthetic_index, router)))
+        print_row(f"one truck, {stop_count} stops", results)
+
+
+if __name__ == "__main__":
+    main_benchmark()
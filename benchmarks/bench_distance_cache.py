@@ -0,0 +1,49 @@
+"""
+Compares a cold parse of distances.csv with a warm load from the memory-mapped binary cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_distance_cache
+"""
+import os
+import tempfile
+from time import perf_counter
+
+from benchmarks.bench_ingest import write_addresses, write_distances
+from distance_cache import load_cached_distance_index
+
+
+def first_route_query(index):
+    """
+    Reads one distance, the first thing routing does after loading.
+    """
+    return index.distance(index.addresses[0], index.addresses[-1])
+
+
+def main_benchmark(address_counts=(27, 1_000, 5_000)):
+    """
+    Times startup to the first distance query for a cold cache and a warm cache.
+    """
+    print(f"{'addresses':>10} {'cold parse + write':>20} {'warm mmap':>12} {'warm, no CRC':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in address_counts:
+            addresses_path = os.path.join(directory, f'addresses_{count}.csv')
+            distances_path = os.path.join(directory, f'distances_{count}.csv')
+            write_addresses(addresses_path, count)
+            write_distances(distances_path, count)
+
+            start = perf_counter()
+            first_route_query(load_cached_distance_index(addresses_path, distances_path))
+            cold = perf_counter() - start
+
+            start = perf_counter()
+            first_route_query(load_cached_distance_index(addresses_path, distances_path))
+            warm = perf_counter() - start
+
+            start = perf_counter()
+            first_route_query(load_cached_distance_index(addresses_path, distances_path, verify=False))
+            unverified = perf_counter() - start
+            print(f"{count:>10} {cold:>19.4f}s {warm:>11.4f}s {unverified:>13.4f}s {cold / unverified:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,111 @@
+"""
+Benchmarks HashTable insert and lookup throughput against the original fixed-size table and dict.
+
+Run from the repository root:
+    python -m benchmarks.bench_hash_table
+"""
+import random
+from time import perf_counter
+
+from hash_table import HashTable
+
+
+class FixedHashTable:
+    """
+    The original fixed-size, linear-probing table that scanned Package objects by package_id.
+    It cannot grow, so the benchmark sizes it to the package count up front.
+    """
+
+    def __init__(self, size=40):
+        self.size = size
+        self.table = [None] * size
+
+    def _hash(self, key):
+        return key % self.size
+
+    def insert(self, package_id, package):
+        index = self._hash(package_id)
+        while self.table[index] is not None:
+            if self.table[index].package_id == package_id:
+                self.table[index] = package
+                return
+            index = (index + 1) % self.size
+        self.table[index] = package
+
+    def lookup(self, package_id):
+        index = self._hash(package_id)
+        while self.table[index] is not None:
+            if self.table[index].package_id == package_id:
+                return self.table[index]
+            index = (index + 1) % self.size
+        return None
+
+
+class DictTable:
+    """
+    A dict with the HashTable interface, as the reference point.
+    """
+
+    def __init__(self):
+        self.table = {}
+
+    def insert(self, package_id, package):
+        self.table[package_id] = package
+
+    def lookup(self, package_id):
+        return self.table.get(package_id)
+
+
+class _Package:
+    """
+    A minimal stand-in for Package; the tables only read `package_id`.
+    """
+
+    __slots__ = ('package_id',)
+
+    def __init__(self, package_id):
+        self.package_id = package_id
+
+
+def measure(table, package_ids, packages, queries):
+    """
+    Returns (inserts per second, lookups per second) for one table.
+    """
+    insert = table.insert
+    start = perf_counter()
+    for package_id, package in zip(package_ids, packages):
+        insert(package_id, package)
+    insert_rate = len(package_ids) / (perf_counter() - start)
+
+    lookup = table.lookup
+    start = perf_counter()
+    for package_id in queries:
+        lookup(package_id)
+    lookup_rate = len(queries) / (perf_counter() - start)
+    return insert_rate, lookup_rate
+
+
+def main_benchmark(sizes=(10_000, 100_000, 1_000_000), seed=0):
+    """
+    Prints insert and lookup throughput for every table at each manifest size.
+    """
+    rng = random.Random(seed)
+    print(f"{'packages':>10}  {'table':<28} {'inserts/s':>12} {'lookups/s':>12}")
+    for count in sizes:
+        package_ids = list(range(1, count + 1))
+        rng.shuffle(package_ids)
+        packages = [_Package(package_id) for package_id in package_ids]
+        queries = [rng.randint(1, count) for _ in range(count)]
+        tables = [
+            ("HashTable (grows from 40)", HashTable()),
+            ("HashTable (pre-sized)", HashTable(int(count / 0.7) + 1)),
+            ("FixedHashTable (pre-sized)", FixedHashTable(count)),
+            ("dict", DictTable()),
+        ]
+        for name, table in tables:
+            insert_rate, lookup_rate = measure(table, package_ids, packages, queries)
+            print(f"{count:>10}  {name:<28} {insert_rate:>12,.0f} {lookup_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
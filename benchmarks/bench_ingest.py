@@ -0,0 +1,99 @@
+"""
+Measures CSV ingestion throughput for a large manifest and distance matrix.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingest
+"""
+import csv
+import os
+import random
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from ingest import iter_package_chunks, load_addresses, load_distance_index, load_packages
+from package_store import PackageStore
+
+
+def write_addresses(path, address_count):
+    """
+    Writes an addresses.csv with `address_count` rows.
+    """
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        for index in range(address_count):
+            writer.writerow([index, f"Stop {index}", f"{index} Synthetic Way"])
+
+
+def write_distances(path, address_count, seed=0):
+    """
+    Writes a lower-triangular distances.csv for `address_count` addresses.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        for i in range(address_count):
+            row = [f"{rng.uniform(0.5, 15):.1f}" for _ in range(i)] + ['0.0']
+            writer.writerow(row + [''] * (address_count - i - 1))
+
+
+def write_packages(path, package_count, address_count, seed=0):
+    """
+    Writes a packages.csv with `package_count` rows spread over the addresses.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['PackageID', 'Address', 'City', 'State', 'Zip', 'Deadline', 'Weight', 'Notes'])
+        for package_id in range(1, package_count + 1):
+            writer.writerow([package_id, f"{rng.randrange(1, address_count)} Synthetic Way", 'Salt Lake City',
+                             'UT', 84100 + rng.randint(0, 99), rng.choice(['EOD', 'EOD', '10:30 AM', '9:00 AM']),
+                             rng.randint(1, 80), ''])
+
+
+def timed(label, rows, function, trace=False):
+    """
+    Runs `function` and prints its rows per second.
+
+    With `trace`, it also prints peak traced memory. tracemalloc slows allocation-heavy code a
+    lot, so traced runs are only used where the memory bound is the point.
+    """
+    if trace:
+        tracemalloc.start()
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    line = f"{label:<40} {rows:>9} rows {elapsed:8.2f}s {rows / elapsed:>12,.0f} rows/s"
+    if trace:
+        line += f"  peak {tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f} MiB"
+        tracemalloc.stop()
+    print(line)
+    return result
+
+
+def main_benchmark(package_count=100_000, address_count=5_000):
+    """
+    Generates the input files in a temporary directory and times each loader.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        addresses_path = os.path.join(directory, 'addresses.csv')
+        distances_path = os.path.join(directory, 'distances.csv')
+        packages_path = os.path.join(directory, 'packages.csv')
+        write_addresses(addresses_path, address_count)
+        write_distances(distances_path, address_count)
+        write_packages(packages_path, package_count, address_count)
+
+        address_list = timed("addresses", address_count, lambda: load_addresses(addresses_path))
+        timed("distance matrix (packed buffer)", address_count,
+              lambda: load_distance_index(address_list, distances_path))
+        timed("packages, streamed and discarded", package_count,
+              lambda: sum(len(chunk) for chunk in iter_package_chunks(packages_path)))
+        timed("packages, streamed (traced)", package_count,
+              lambda: sum(len(chunk) for chunk in iter_package_chunks(packages_path)), trace=True)
+        timed("packages into HashTable", package_count, lambda: load_packages(packages_path))
+        timed("packages into PackageStore", package_count,
+              lambda: load_packages(packages_path, PackageStore()))
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,99 @@
+"""
+Measures memory per package with tracemalloc for the original Package, the __slots__ Package
+and the columnar PackageStore.
+
+Run from the repository root:
+    python -m benchmarks.bench_package_memory
+"""
+import random
+import tracemalloc
+
+from clock import to_ticks
+from package import Package, parse_deadline
+from package_store import PackageStore
+
+
+class DictPackage:
+    """
+    The same fields as Package, kept in a per-instance __dict__ instead of __slots__.
+    """
+
+    def __init__(self, package_id, address, deadline, city, state, zip_code, weight, notes, status):
+        self.package_id = package_id
+        self.delivery_address = address
+        self._delivery_deadline = deadline
+        self.deadline_ticks = to_ticks(parse_deadline(deadline))
+        self.delivery_city = city
+        self.delivery_state = state
+        self.delivery_zip_code = str(zip_code)
+        self.package_weight = weight
+        self.notes = notes
+        self.status = status
+        self.truck = None
+        self.depart_ticks = None
+        self.delivery_ticks = None
+        self.address_correction = None
+
+
+def manifest_rows(count, seed=0):
+    """
+    Yields package fields as fresh strings per row, the way csv.DictReader produces them.
+    Addresses are drawn from a service area of 5,000 delivery points.
+    """
+    rng = random.Random(seed)
+    deadlines = ['EOD'] * 7 + ['10:30 AM'] * 2 + ['9:00 AM']
+    for package_id in range(1, count + 1):
+        yield (package_id, f"{rng.randint(1, 5000)} South 900 East", rng.choice(deadlines),
+               "Salt Lake City"[:], "UT"[:], str(84100 + rng.randint(0, 99)), float(rng.randint(1, 80)),
+               "" if rng.random() < 0.9 else "Can only be on truck 2", "at hub")
+
+
+def measure(build, count):
+    """
+    Returns the bytes retained per package by `build`, including every string it keeps alive.
+
+    Rows are generated inside the measurement, so strings count for layouts that hold on to them,
+    and only the interned copies count for the store.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(manifest_rows(count))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def build_objects(cls):
+    """
+    Returns a builder that creates one object of `cls` per row.
+    """
+    def build(rows):
+        return [cls(*row) for row in rows]
+    return build
+
+
+def build_store(rows):
+    """
+    Loads every row into a PackageStore.
+    """
+    store = PackageStore()
+    for row in rows:
+        store.insert(row[0], Package(*row))
+    return store
+
+
+def main_benchmark(counts=(10_000, 100_000, 1_000_000)):
+    """
+    Prints bytes per package for each representation.
+    """
+    print(f"{'packages':>10}  {'representation':<24} {'bytes/package':>14}")
+    for count in counts:
+        for name, build in (("Package with __dict__", build_objects(DictPackage)),
+                            ("Package with __slots__", build_objects(Package)),
+                            ("PackageStore", build_store)):
+            print(f"{count:>10}  {name:<24} {measure(build, count):>14,.1f}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,294 @@
+"""
+Times each stage of the routing pipeline on deterministic synthetic workloads and checks how
+each stage scales against the complexity documented in its docstring.
+
+Results are written as JSON so a later run can be compared with an earlier one.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --sizes 40 1000 --output before.json
+    python -m benchmarks.bench_pipeline --sizes 40 1000 --compare before.json
+"""
+import argparse
+import gc
+import hashlib
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from benchmarks.workload import HUB, generate_workload
+from hash_table import HashTable
+from ingest import iter_package_chunks, load_addresses, load_distance_index
+from main import nearest_neighbor_delivery
+from timeline import DeliveryTimeline
+from truck import Truck
+
+DEFAULT_SIZES = (40, 1000, 10000, 100000)
+DEPARTURES = (timedelta(hours=8), timedelta(hours=9, minutes=5), timedelta(hours=10, minutes=20))
+ROUTE_LIMIT = 1000  # Packages per truck; nearest neighbor is quadratic, so larger loads take minutes
+QUERY_COUNT = 10000
+MIN_FIT_SECONDS = 1e-3  # Shorter timings are dominated by fixed overhead and bend the fitted slope
+FIT_TOLERANCE = 0.3
+REGRESSION_TOLERANCE = 0.25
+
+# stage name -> (size measured against, documented complexity, exponent of that complexity)
+STAGES = {
+    'load_addresses': ('addresses', 'O(a)', 1),
+    'load_distances': ('addresses', 'O(a^2)', 2),
+    'parse_packages': ('packages', 'O(n)', 1),
+    'hash_table_build': ('packages', 'O(n)', 1),
+    'hash_table_lookup': ('packages', 'O(n) for n lookups', 1),
+    'route_truck': ('truck_packages', 'O(t^2) per truck', 2),
+    'timeline_build': ('routed_packages', 'O(n)', 1),
+    'status_query': ('routed_packages', 'O(log e) per query', 0),
+}
+
+
+def best_of(function, repeat, setup=None):
+    """
+    Runs `function` `repeat` times and returns (fastest seconds, every timing, last result).
+
+    `setup`, if given, runs untimed before each repetition and its result is passed to `function`.
+    As in timeit, the garbage collector is paused while timing, so collections triggered by
+    earlier allocations do not land in whichever stage happens to be running.
+    """
+    samples = []
+    result = None
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = perf_counter()
+            result = function(argument) if setup else function()
+            samples.append(perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(samples), samples, result
+
+
+def workload_digest(workload):
+    """
+    Returns a SHA-256 digest of a workload's three files, so runs can confirm they used the same input.
+    """
+    sha = hashlib.sha256()
+    for path in (workload.addresses_path, workload.distances_path, workload.packages_path):
+        with open(path, 'rb') as file:
+            sha.update(file.read())
+    return sha.hexdigest()
+
+
+def load_trucks(package_count, route_limit):
+    """
+    Returns three trucks like main()'s, each loaded with a block of consecutive package IDs.
+    """
+    per_truck = min(math.ceil(package_count / len(DEPARTURES)), route_limit)
+    trucks = []
+    for number, depart_time in enumerate(DEPARTURES, start=1):
+        truck = Truck(number, HUB, depart_time)
+        first = (number - 1) * per_truck + 1
+        truck.packages = list(range(first, min(first + per_truck, package_count + 1)))
+        trucks.append(truck)
+    return [truck for truck in trucks if truck.packages]
+
+
+def bench_size(directory, package_count, seed, repeat, route_limit):
+    """
+    Generates one workload and times every stage on it.
+
+    Returns:
+    - A dictionary with the workload's parameters and one entry per stage.
+    """
+    workload = generate_workload(directory, package_count, seed)
+    stages = {}
+
+    def record(name, size, ops, timing):
+        seconds, samples, result = timing
+        stages[name] = {'size': size, 'ops': ops, 'seconds': seconds,
+                        'per_op': seconds / ops if ops else None, 'samples': samples}
+        return result
+
+    address_count = workload.address_count
+    address_list = record('load_addresses', address_count, address_count,
+                          best_of(lambda: load_addresses(workload.addresses_path), repeat))
+    distance_index = record('load_distances', address_count, address_count * address_count,
+                            best_of(lambda: load_distance_index(address_list, workload.distances_path), repeat))
+    packages = record('parse_packages', package_count, package_count, best_of(
+        lambda: [package for chunk in iter_package_chunks(workload.packages_path) for package in chunk], repeat))
+
+    def build():
+        package_data = HashTable()
+        for package in packages:
+            package_data.insert(package.package_id, package)
+        return package_data
+    package_data = record('hash_table_build', package_count, package_count, best_of(build, repeat))
+
+    lookup_ids = list(range(1, package_count + 1))
+    random.Random(seed).shuffle(lookup_ids)
+    lookup = package_data.lookup
+    record('hash_table_lookup', package_count, package_count,
+           best_of(lambda: [lookup(package_id) for package_id in lookup_ids], repeat))
+
+    def route(trucks):
+        for truck in trucks:
+            nearest_neighbor_delivery(truck, package_data, distance_index)
+        return trucks
+    trucks = load_trucks(package_count, route_limit)
+    truck_packages = len(trucks[0].packages)
+    seconds, samples, trucks = best_of(route, repeat, setup=lambda: load_trucks(package_count, route_limit))
+    # Record the mean time per truck; the trucks carry equal loads except possibly the last
+    record('route_truck', truck_packages, truck_packages,
+           (seconds / len(trucks), [sample / len(trucks) for sample in samples], None))
+
+    routed_ids = [package_id for truck in trucks for package_id in truck.packages]
+    timeline = record('timeline_build', len(routed_ids), len(routed_ids),
+                      best_of(lambda: DeliveryTimeline(package_data, routed_ids), repeat))
+    rng = random.Random(seed)
+    queries = [(rng.choice(routed_ids), timedelta(seconds=rng.randrange(8 * 3600, 17 * 3600)))
+               for _ in range(QUERY_COUNT)]
+    status = timeline.status
+    record('status_query', len(routed_ids), QUERY_COUNT,
+           best_of(lambda: [status(package_id, time) for package_id, time in queries], repeat))
+
+    return {'workload': dict(workload.as_dict(), digest=workload_digest(workload),
+                             truck_packages=truck_packages, routed_packages=len(routed_ids)),
+            'stages': stages}
+
+
+def fit_exponent(points):
+    """
+    Fits seconds = c * size^k by least squares on a log-log scale and returns k.
+
+    Returns:
+    - The fitted exponent, or None if fewer than two distinct sizes have usable timings.
+    """
+    usable = [(size, seconds) for size, seconds in points if size > 0 and seconds >= MIN_FIT_SECONDS]
+    if len({size for size, _ in usable}) < 2:
+        return None
+    xs = [math.log(size) for size, _ in usable]
+    ys = [math.log(seconds) for _, seconds in usable]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def scaling_report(runs):
+    """
+    Compares each stage's observed growth with its documented complexity.
+
+    Returns:
+    - A dictionary of stage name -> documented complexity, expected and fitted exponents, and a verdict.
+    """
+    report = {}
+    for name, (size_name, documented, expected) in STAGES.items():
+        points = [(run['stages'][name]['size'], run['stages'][name]['seconds']) for run in runs]
+        fitted = fit_exponent(points)
+        if fitted is None:
+            verdict = 'not enough data'
+        elif fitted <= expected + FIT_TOLERANCE:
+            verdict = 'ok'
+        else:
+            verdict = 'grows faster than documented'
+        report[name] = {'size': size_name, 'documented': documented, 'expected_exponent': expected,
+                        'fitted_exponent': fitted, 'verdict': verdict}
+    return report
+
+
+def compare_results(previous, current, tolerance=REGRESSION_TOLERANCE):
+    """
+    Prints the change in each stage's time against an earlier result file for matching workloads.
+
+    Stages that took under MIN_FIT_SECONDS are skipped, because their timings are mostly noise.
+
+    Returns:
+    - The number of stages that got slower by more than `tolerance`.
+    """
+    earlier = {run['workload']['packages']: run for run in previous['runs']}
+    regressions = 0
+    for run in current['runs']:
+        package_count = run['workload']['packages']
+        before = earlier.get(package_count)
+        if before is None:
+            continue
+        if before['workload']['digest'] != run['workload']['digest']:
+            print(f"packages={package_count}: different input files, skipped")
+            continue
+        for name, stage in run['stages'].items():
+            if name not in before['stages'] or before['stages'][name]['seconds'] < MIN_FIT_SECONDS:
+                continue
+            ratio = stage['seconds'] / before['stages'][name]['seconds']
+            flag = ''
+            if ratio > 1 + tolerance:
+                regressions += 1
+                flag = '  REGRESSION'
+            print(f"packages={package_count:<7} {name:<18} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def print_results(results):
+    """
+    Prints the timings of every run followed by the scaling report.
+    """
+    for run in results['runs']:
+        workload = run['workload']
+        print(f"\npackages={workload['packages']} addresses={workload['addresses']} "
+              f"truck_packages={workload['truck_packages']}")
+        for name, stage in run['stages'].items():
+            print(f"  {name:<18} size={stage['size']:>8} {stage['seconds']:10.4f}s "
+                  f"{stage['per_op'] * 1e6:12.3f} us/op")
+    print("\nScaling")
+    for name, fit in results['scaling'].items():
+        fitted = 'n/a' if fit['fitted_exponent'] is None else f"{fit['fitted_exponent']:.2f}"
+        print(f"  {name:<18} {fit['documented']:<20} expected k={fit['expected_exponent']} "
+              f"fitted k={fitted:<5} {fit['verdict']}")
+
+
+def main_benchmark(argv=None):
+    """
+    Runs the benchmark for each size, writes the JSON results and optionally compares them.
+
+    Returns:
+    - 1 if a comparison found a regression, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the WGUPS routing pipeline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--route-limit', type=int, default=ROUTE_LIMIT)
+    parser.add_argument('--output', default='bench_pipeline.json')
+    parser.add_argument('--compare', help="An earlier result file to compare against.")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for package_count in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            runs.append(bench_size(directory, package_count, args.seed, args.repeat, args.route_limit))
+    results = {
+        'meta': {'created': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                 'implementation': platform.python_implementation(), 'machine': platform.machine(),
+                 'seed': args.seed, 'repeat': args.repeat, 'route_limit': args.route_limit},
+        'runs': runs,
+        'scaling': scaling_report(runs),
+    }
+    print_results(results)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+        print(f"\nCompared with {args.compare}")
+        if compare_results(previous, results):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
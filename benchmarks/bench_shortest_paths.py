@@ -0,0 +1,86 @@
+"""
+Times the shortest-path closure of a distance matrix and incremental road additions.
+
+Run from the repository root:
+    python -m benchmarks.bench_shortest_paths
+    python -m benchmarks.bench_shortest_paths --addresses 500 1000 2000 --roads 8
+"""
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.workload import service_area
+from shortest_paths import add_roads, metric_closure
+
+# Above this many addresses, the unblocked reference is skipped because it takes minutes
+REFERENCE_LIMIT = 1000
+# Direct distances are stretched by detours of up to 60%, like a road network's
+DETOUR = 0.6
+
+
+def reference_closure(distance_index):
+    """
+    Floyd-Warshall with one whole-matrix step per pivot, the unblocked form of `metric_closure`.
+    """
+    matrix = distance_index.as_numpy().copy()
+    for pivot in range(len(matrix)):
+        np.minimum(matrix, matrix[:, pivot, None] + matrix[pivot], out=matrix)
+    return matrix
+
+
+def new_address_roads(distance_index, road_count, seed):
+    """
+    Returns roads from one new address to `road_count` random known addresses, and one shortcut
+    between two known addresses.
+    """
+    rng = random.Random(seed)
+    targets = rng.sample(distance_index.addresses, road_count + 2)
+    roads = [('1 New Street', target, round(rng.uniform(0.2, 3.0), 1)) for target in targets[:road_count]]
+    shortcut = (targets[-2], targets[-1], round(distance_index.distance(targets[-2], targets[-1]) / 3, 1))
+    return roads, [shortcut]
+
+
+def main_benchmark(argv=None):
+    """
+    Prints the share of distances the closure shortens, its time with and without blocking, and
+    the time to add one new address, or one shortcut, to the closure in place.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the shortest-path closure.")
+    parser.add_argument('--addresses', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--roads', type=int, default=5, help="Roads from each new address.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'addresses':>10} {'shortened':>10} {'unblocked':>10} {'blocked':>9} "
+          f"{'new address':>12} {'shortcut':>10}")
+    for count in args.addresses:
+        distance_index = service_area(count, random.Random(args.seed + count), detour=DETOUR)
+
+        start = perf_counter()
+        closure = metric_closure(distance_index)
+        blocked = perf_counter() - start
+        shortened = np.count_nonzero(closure.as_numpy() < distance_index.as_numpy()) / count ** 2
+
+        reference = '-'
+        if count <= REFERENCE_LIMIT:
+            start = perf_counter()
+            expected = reference_closure(distance_index)
+            reference = f"{perf_counter() - start:.2f}s"
+            assert np.allclose(expected, closure.as_numpy(), rtol=0, atol=1e-9)
+
+        roads, shortcut = new_address_roads(distance_index, args.roads, args.seed)
+        start = perf_counter()
+        add_roads(closure, roads)
+        added = perf_counter() - start
+        start = perf_counter()
+        add_roads(closure, shortcut)
+        shortened_road = perf_counter() - start
+
+        print(f"{count:>10} {shortened:>9.0%} {reference:>10} {blocked:>8.2f}s "
+              f"{added * 1000:>10.1f}ms {shortened_road * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,137 @@
+"""
+Load-tests the status server with many concurrent keep-alive connections and checks every answer.
+
+By default a server is started in a separate process on a free port. Run from the repository root:
+    python -m benchmarks.load_test_status
+    python -m benchmarks.load_test_status --connections 100 --requests 50000
+    python -m benchmarks.load_test_status --port 8080   # test a server that is already running
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+from datetime import timedelta
+from time import perf_counter
+
+from cli import STATUS_FIELDS, format_clock
+from main import plan_day
+
+
+def _run_server(port_queue, cache_size):
+    """
+    Plans the day and serves it in a child process, reporting the chosen port through a queue.
+    """
+    from status_server import StatusService, start_server
+
+    _, package_data, timeline = plan_day()
+    service = StatusService(timeline, sorted(package_data), cache_size)
+
+    async def serve():
+        server = await start_server(service, '127.0.0.1', 0)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+    asyncio.run(serve())
+
+
+def expected_record(timeline, package_id, time):
+    """
+    Returns the record the server should send for a package at a time.
+    """
+    status = timeline.status(package_id, time)
+    values = [format_clock(value) if isinstance(value, timedelta) else value for value in (time,) + tuple(status)]
+    return dict(zip(STATUS_FIELDS, values))
+
+
+async def _client(host, port, queries, expected, results):
+    """
+    Sends queries over one keep-alive connection and counts wrong answers.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    wrong = 0
+    for package_id, clock in queries:
+        writer.write(f"GET /status?id={package_id}&at={clock} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        length = 0
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        body = await reader.readexactly(length)
+        if b' 200 ' not in status_line or json.loads(body) != expected[package_id, clock]:
+            wrong += 1
+    writer.close()
+    await writer.wait_closed()
+    results.append(wrong)
+
+
+async def run_load(host, port, connections, requests, distinct_times, seed, timeline, package_ids):
+    """
+    Spreads `requests` random status queries over `connections` concurrent connections.
+
+    Returns:
+    - A tuple (elapsed seconds, wrong answers).
+    """
+    rng = random.Random(seed)
+    times = sorted({rng.randrange(7 * 3600, 14 * 3600) for _ in range(distinct_times)})
+    clocks = [format_clock(timedelta(seconds=seconds)) for seconds in times]
+    queries = [(rng.choice(package_ids), rng.choice(clocks)) for _ in range(requests)]
+    expected = {}
+    for package_id, clock in queries:
+        if (package_id, clock) not in expected:
+            hours, minutes, seconds = map(int, clock.split(':'))
+            time = timedelta(hours=hours, minutes=minutes, seconds=seconds)
+            expected[package_id, clock] = expected_record(timeline, package_id, time)
+
+    results = []
+    start = perf_counter()
+    await asyncio.gather(*(_client(host, port, queries[index::connections], expected, results)
+                           for index in range(connections)))
+    return perf_counter() - start, sum(results)
+
+
+def main_benchmark(argv=None):
+    """
+    Runs the load test and prints throughput and correctness.
+
+    Returns:
+    - 1 if any answer was wrong, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description="Load-test the WGUPS status server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="Test a running server instead of starting one.")
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--distinct-times', type=int, default=600, help="Distinct query times to draw from.")
+    parser.add_argument('--cache-size', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    _, package_data, timeline = plan_day()
+    server = None
+    port = args.port
+    if port is None:
+        port_queue = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_run_server, args=(port_queue, args.cache_size), daemon=True)
+        server.start()
+        port = port_queue.get(timeout=30)
+    try:
+        elapsed, wrong = asyncio.run(run_load(args.host, port, args.connections, args.requests,
+                                              args.distinct_times, args.seed, timeline, sorted(package_data)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+    print(f"{args.requests} requests over {args.connections} connections in {elapsed:.2f}s: "
+          f"{args.requests / elapsed:,.0f} requests/s, {wrong} wrong answers")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
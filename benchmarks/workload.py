@@ -0,0 +1,177 @@
+"""
+Generates deterministic synthetic input files in the same format as the csv/ directory.
+
+The same seed and sizes always produce byte-identical files, so benchmark runs on different
+machines or commits measure the same workload. `service_area` builds the same kind of random
+service area in memory, for benchmarks that do not need the files.
+
+Run from the repository root to write one set of files:
+    python -m benchmarks.workload --packages 1000 --seed 7 --output-dir /tmp/wgups-1000
+"""
+import argparse
+import csv
+import math
+import os
+import random
+from array import array
+
+from distance_index import DistanceIndex
+
+HUB = '4001 South 700 East'
+# The first generated addresses keep their original names, so files from earlier seeds are unchanged
+FIXED_ADDRESSES = (HUB, '300 State St', '410 S State St')
+AREA_MILES = 15
+DEADLINES = ('EOD', 'EOD', 'EOD', '10:30 AM', '9:00 AM')
+MAX_ADDRESSES = 2000
+
+
+def address_count_for(package_count, max_addresses=MAX_ADDRESSES):
+    """
+    Returns the number of addresses to generate for a manifest of `package_count` packages.
+
+    The shipped data has 27 addresses for 40 packages. Larger manifests get one address per four
+    packages, capped at `max_addresses` because the distance matrix grows with its square.
+
+    Time Complexity: O(1).
+    """
+    return max(len(FIXED_ADDRESSES), min(max(27, package_count // 4), max_addresses))
+
+
+def random_points(rng, count):
+    """
+    Places `count` addresses at random points on the square service area.
+
+    Time Complexity: O(count).
+    """
+    return [(rng.uniform(0, AREA_MILES), rng.uniform(0, AREA_MILES)) for _ in range(count)]
+
+
+def service_area(address_count, rng, detour=0.0):
+    """
+    Builds a random service area as an in-memory DistanceIndex, with the hub first.
+
+    Distances are straight-line distances rounded to 0.1 miles, as in `generate_workload`. With a
+    `detour`, each distance is stretched by a random factor of up to 1 + detour, like a road
+    network's, so many direct distances are longer than a path through another address.
+
+    Parameters:
+    - address_count: The number of addresses, including the hub.
+    - rng: A random.Random. Benchmarks that go on to draw a manifest from it get the same
+      manifest for the same seed.
+    - detour: The largest extra share of a distance added by detours.
+
+    Returns:
+    - A DistanceIndex over the hub followed by numbered synthetic streets.
+
+    Time Complexity: O(a^2), where a is the number of addresses.
+    """
+    points = random_points(rng, address_count)
+    addresses = [HUB] + [f"{index} Synthetic Way" for index in range(1, address_count)]
+    distances = array('d', bytes(8 * address_count * address_count))
+    for i, (x1, y1) in enumerate(points):
+        for j in range(i):
+            x2, y2 = points[j]
+            distance = math.hypot(x1 - x2, y1 - y2)
+            if detour:
+                distance *= rng.uniform(1.0, 1.0 + detour)
+            distances[i * address_count + j] = distances[j * address_count + i] = round(distance, 1)
+    return DistanceIndex(addresses, distances)
+
+
+class Workload:
+    """
+    The paths and sizes of one generated set of input files.
+    """
+
+    def __init__(self, directory, package_count, address_count, seed):
+        """
+        Initializes the description of a workload written to `directory`.
+
+        Time Complexity: O(1).
+        """
+        self.directory = directory
+        self.package_count = package_count
+        self.address_count = address_count
+        self.seed = seed
+        self.packages_path = os.path.join(directory, 'packages.csv')
+        self.distances_path = os.path.join(directory, 'distances.csv')
+        self.addresses_path = os.path.join(directory, 'addresses.csv')
+
+    def as_dict(self):
+        """
+        Returns the workload's parameters for a JSON report.
+
+        Time Complexity: O(1).
+        """
+        return {'packages': self.package_count, 'addresses': self.address_count, 'seed': self.seed}
+
+
+def generate_workload(directory, package_count, seed=0, address_count=None):
+    """
+    Writes addresses.csv, distances.csv and packages.csv for a random service area.
+
+    Process Flow:
+    1. Place the addresses at random points on a 15 x 15 mile grid, with the hub first.
+    2. Write the lower-triangular distance matrix of straight-line distances, rounded to 0.1 miles
+       like the shipped data.
+    3. Write a manifest with random addresses (never the hub), deadlines and weights.
+
+    Parameters:
+    - directory: An existing directory to write the files into.
+    - package_count: The number of packages in the manifest.
+    - seed: The random seed. The random generator is seeded with both the seed and the sizes,
+      so each size is independent of the others in a run.
+    - address_count: The number of addresses, defaulting to `address_count_for(package_count)`.
+
+    Returns:
+    - A Workload describing the files.
+
+    Time Complexity: O(n + a^2), where n is the number of packages and a the number of addresses.
+    """
+    if address_count is None:
+        address_count = address_count_for(package_count)
+    if address_count < len(FIXED_ADDRESSES):
+        raise ValueError(f"address_count must be at least {len(FIXED_ADDRESSES)}")
+    rng = random.Random(f"{seed}:{package_count}:{address_count}")
+    workload = Workload(directory, package_count, address_count, seed)
+    addresses = list(FIXED_ADDRESSES)
+    addresses += [f"{index} Synthetic Way" for index in range(len(addresses), address_count)]
+    points = random_points(rng, address_count)
+
+    with open(workload.addresses_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        for index, address in enumerate(addresses):
+            writer.writerow([index, f"Stop {index}", address])
+
+    with open(workload.distances_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        for i, (x1, y1) in enumerate(points):
+            row = [f"{math.hypot(x1 - x2, y1 - y2):.1f}" for x2, y2 in points[:i]] + ['0.0']
+            writer.writerow(row + [''] * (address_count - i - 1))
+
+    with open(workload.packages_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['PackageID', 'Address', 'City', 'State', 'Zip', 'Deadline', 'Weight', 'Notes'])
+        for package_id in range(1, package_count + 1):
+            writer.writerow([package_id, addresses[rng.randrange(1, address_count)], 'Salt Lake City', 'UT',
+                             84100 + rng.randrange(100), rng.choice(DEADLINES), rng.randint(1, 80), ''])
+    return workload
+
+
+def main_generate():
+    """
+    Writes one workload from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic WGUPS input set.")
+    parser.add_argument('--packages', type=int, default=1000)
+    parser.add_argument('--addresses', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output-dir', required=True)
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+    workload = generate_workload(args.output_dir, args.packages, args.seed, args.addresses)
+    print(f"Wrote {workload.package_count} packages and {workload.address_count} addresses to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main_generate()
@@ -0,0 +1,93 @@
+"""
+Checks the integer clock against timedelta arithmetic.
+
+Routing used to add `timedelta(hours=distance / speed)` per leg, and now adds `travel_ticks`.
+The two must agree to the microsecond for every leg, including hours that fall exactly halfway
+between two ticks, so routes and delivery times stay the same.
+
+Run from the repository root:
+    python -m checks.check_clock
+    python -m checks.check_clock --samples 1000000 --seed 3
+"""
+import argparse
+import random
+import sys
+from datetime import timedelta
+
+from clock import TICKS_PER_HOUR, hours_to_ticks, parse_ticks, to_ticks, to_timedelta, travel_ticks
+
+
+def random_hours(rng):
+    """
+    Returns a number of hours of the kinds routing produces, or one that is hard to round.
+    """
+    roll = rng.random()
+    if roll < 0.4:
+        # A leg of a tenth of a mile or more at a typical truck speed
+        return round(rng.uniform(0, 20), 1) / rng.choice((18, 25, 35, 60))
+    if roll < 0.6:
+        # Exactly halfway between two ticks
+        return (rng.randrange(24 * TICKS_PER_HOUR) + 0.5) / TICKS_PER_HOUR
+    if roll < 0.8:
+        return rng.uniform(0, 24)
+    return rng.uniform(0, 1e-6)
+
+
+def check_clock(samples, seed):
+    """
+    Compares the clock functions with timedelta on `samples` random inputs.
+
+    Returns:
+    - None if they always agreed, otherwise a description of the first difference.
+    """
+    rng = random.Random(seed)
+    for _ in range(samples):
+        hours = random_hours(rng)
+        expected = to_ticks(timedelta(hours=hours))
+        if hours_to_ticks(hours) != expected:
+            return f"hours_to_ticks({hours!r}) is {hours_to_ticks(hours)}, timedelta gives {expected}"
+        if to_ticks(to_timedelta(expected)) != expected:
+            return f"{expected} ticks do not survive a round trip through timedelta"
+
+    # A whole truck route, leg by leg
+    for _ in range(max(samples // 1000, 1)):
+        speed = rng.choice((18, 25, 35))
+        ticks = parse_ticks("08:00:00")
+        time = timedelta(hours=8)
+        for _ in range(rng.randint(1, 60)):
+            distance = round(rng.uniform(0, 8), 1)
+            ticks += travel_ticks(distance, speed)
+            time += timedelta(hours=distance / speed)
+            if ticks != to_ticks(time):
+                return f"a route at {speed} mph drifted to {to_timedelta(ticks)}, timedelta gives {time}"
+
+    for _ in range(max(samples // 100, 1)):
+        hours, minutes, seconds = rng.randrange(24), rng.randrange(60), rng.randrange(60)
+        text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        if parse_ticks(text) != to_ticks(timedelta(hours=hours, minutes=minutes, seconds=seconds)):
+            return f"parse_ticks({text!r}) is {parse_ticks(text)}"
+    return None
+
+
+def main_check(argv=None):
+    """
+    Runs the comparison and prints the first failure.
+
+    Returns:
+    - The exit status: 0 if every sample matched, otherwise 1.
+    """
+    parser = argparse.ArgumentParser(description="Compare the integer clock with timedelta arithmetic.")
+    parser.add_argument('--samples', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failure = check_clock(args.samples, args.seed)
+    if failure:
+        print(f"seed {args.seed}: {failure}")
+        return 1
+    print(f"The clock matched timedelta on {args.samples} samples")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,191 @@
+"""
+Checks the dispatcher's invariants over random sequences of live events.
+
+Each round plans the shipped day, or a seeded synthetic day, and applies random events to it:
+corrected addresses, new details, delayed hub arrivals, and invalid changes. After every event:
+- Every package is still on exactly one truck, within the truck's capacity.
+- Deliveries made before the event keep their truck, position and time.
+- Each truck's deliveries are in time order, and its time matches its last delivery.
+- A package moved for a delayed arrival rides a truck that leaves after it arrives.
+- A rejected event leaves every package and truck exactly as it was.
+- A timeline refreshed from the returned package IDs matches one rebuilt from scratch.
+
+Run from the repository root:
+    python -m checks.check_dispatcher
+    python -m checks.check_dispatcher --rounds 50 --events 20 --seed 3
+"""
+import argparse
+import random
+import sys
+from datetime import timedelta
+
+import main
+from assignment import assign_packages
+from benchmarks.bench_assignment import synthetic_day
+from clock import TICKS_PER_HOUR, to_ticks, to_timedelta
+from dispatcher import Dispatcher
+from distance_cache import load_cached_distance_index
+from timeline import DeliveryTimeline
+
+DEADLINES = ('EOD', '9:00 AM', '10:30 AM', '5:00 PM')
+INVALID_CHANGES = ({'deadline': 'bogus'}, {'weight': 'heavy'}, {'address': 'Nowhere'}, {'color': 'red'})
+
+
+def shipped_day(rng):
+    """
+    Plans the shipped day with main's defaults.
+    """
+    trucks, package_data, _ = main.plan_day()
+    return trucks, package_data, load_cached_distance_index()
+
+
+def random_day(rng):
+    """
+    Assigns and routes a seeded synthetic day of 100 to 400 packages.
+    """
+    while True:
+        trucks, package_data, distance_index = synthetic_day(rng.randint(100, 400), rng.randrange(1 << 30))
+        try:
+            assign_packages(trucks, package_data, sorted(package_data), distance_index)
+            break
+        except ValueError:
+            continue  # The random notes of some days cannot all be met, so draw another day
+    for truck in trucks:
+        main.nearest_neighbor_delivery(truck, package_data, distance_index)
+    return trucks, package_data, distance_index
+
+
+def state(trucks, package_data):
+    """
+    Returns everything an event may change, for comparing before and after.
+    """
+    routes = [(list(truck.packages), truck.miles, truck.time_ticks) for truck in trucks]
+    packages = {package_id: (str(package), package.address_correction) for package_id, package in package_data.items()}
+    return routes, packages
+
+
+def random_event(rng, package_data, distance_index, ticks):
+    """
+    Returns a random (package_id, change) for an event at `ticks`, sometimes an invalid one.
+    """
+    package_id = rng.choice(sorted(package_data))
+    roll = rng.random()
+    if roll < 0.4:
+        change = {'address': rng.choice(distance_index.addresses), 'zip_code': rng.randint(84100, 84199)}
+    elif roll < 0.6:
+        change = {'deadline': rng.choice(DEADLINES), 'weight': rng.randint(1, 50), 'notes': f"Note {rng.random():.3f}"}
+    elif roll < 0.8:
+        change = {'available_time': to_timedelta(ticks + rng.randrange(3 * TICKS_PER_HOUR))}
+    else:
+        change = dict(rng.choice(INVALID_CHANGES))
+        if rng.random() < 0.5:
+            change['address'] = rng.choice(distance_index.addresses)  # A valid part before the invalid one
+    return package_id, change
+
+
+def check_trucks(trucks, package_data, expected_ids):
+    """
+    Checks that every package is on one truck and each route is consistent.
+
+    Returns:
+    - None if the trucks are consistent, otherwise a description of the problem.
+    """
+    seen = [package_id for truck in trucks for package_id in truck.packages]
+    if sorted(seen) != expected_ids:
+        return "packages were lost or duplicated"
+    for truck in trucks:
+        if len(truck.packages) > truck.capacity:
+            return f"truck {truck.truck_number} carries {len(truck.packages)} packages"
+        last = truck.depart_ticks
+        for package_id in truck.packages:
+            package = package_data.lookup(package_id)
+            if package.truck != truck.truck_number or package.depart_ticks != truck.depart_ticks:
+                return f"package {package_id} does not record truck {truck.truck_number}"
+            if package.delivery_ticks < last:
+                return f"truck {truck.truck_number} delivers package {package_id} out of time order"
+            last = package.delivery_ticks
+        if truck.packages and truck.time_ticks != last:
+            return f"truck {truck.truck_number}'s time does not match its last delivery"
+    return None
+
+
+def check_round(rng, day, events):
+    """
+    Applies random events to one planned day.
+
+    Returns:
+    - None if every invariant held, otherwise a description of the first failure.
+    """
+    trucks, package_data, distance_index = day(rng)
+    expected_ids = sorted(package_data)
+    dispatcher = Dispatcher(trucks, package_data, distance_index)
+    trucks_by_number = {truck.truck_number: truck for truck in trucks}
+    timeline = DeliveryTimeline(package_data, expected_ids)
+    ticks = to_ticks(timedelta(hours=8))
+    for step in range(events):
+        ticks += rng.randrange(TICKS_PER_HOUR // 2)
+        package_id, change = random_event(rng, package_data, distance_index, ticks)
+        before = state(trucks, package_data)
+        done = {done_id: (truck.truck_number, position, package_data.lookup(done_id).delivery_ticks)
+                for truck in trucks for position, done_id in enumerate(truck.packages)
+                if package_data.lookup(done_id).delivery_ticks < ticks}
+        event = f"step {step}: {change} for package {package_id} at {to_timedelta(ticks)}"
+        try:
+            reroute = dispatcher.apply_event(to_timedelta(ticks), package_id, change)
+        except ValueError:
+            if state(trucks, package_data) != before:
+                return f"{event} was rejected but changed the plan"
+            continue
+
+        problem = check_trucks(trucks, package_data, expected_ids)
+        if problem:
+            return f"after {event}, {problem}"
+        for done_id, (truck_number, position, delivery_ticks) in done.items():
+            truck = trucks_by_number[truck_number]
+            if (truck.packages[position:position + 1] != [done_id]
+                    or package_data.lookup(done_id).delivery_ticks != delivery_ticks):
+                return f"after {event}, the delivery of package {done_id} before the event changed"
+        if package_id not in reroute.package_ids:
+            return f"after {event}, the changed package is not in the returned package IDs"
+        package = package_data.lookup(package_id)
+        if 'address' in change and package.delivery_address != change['address']:
+            return f"after {event}, the package is going to {package.delivery_address}"
+        available_time = change.get('available_time')
+        if available_time is not None and package.depart_ticks < to_ticks(available_time):
+            return f"after {event}, the package leaves at {package.depart_time} before it arrives"
+
+        timeline.update(package_data, reroute.package_ids)
+        rebuilt = DeliveryTimeline(package_data, expected_ids)
+        for hour in range(7, 20):
+            query = timedelta(hours=hour, minutes=rng.randrange(60))
+            if timeline.snapshot(query, expected_ids) != rebuilt.snapshot(query, expected_ids):
+                return f"after {event}, the refreshed timeline differs at {query}"
+    return None
+
+
+def main_check(argv=None):
+    """
+    Runs the random rounds and prints the first failure.
+
+    Returns:
+    - The exit status: 0 if every round passed, otherwise 1.
+    """
+    parser = argparse.ArgumentParser(description="Check the dispatcher's invariants over random events.")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--events', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for round_number in range(args.rounds):
+        rng = random.Random(f"{args.seed}:{round_number}")
+        day = shipped_day if round_number % 2 == 0 else random_day
+        failure = check_round(rng, day, args.events)
+        if failure:
+            print(f"round {round_number} (seed {args.seed}, {day.__name__}): {failure}")
+            return 1
+    print(f"The dispatcher kept its invariants in {args.rounds} rounds of {args.events} events")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
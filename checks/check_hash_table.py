@@ -0,0 +1,86 @@
+"""
+Checks HashTable against a dict over random sequences of inserts, lookups and deletes.
+
+Keys are drawn from a small range, so the same IDs are inserted, deleted and reinserted many
+times, which exercises tombstone reuse and rebuilds as well as growth. After every operation the
+table must hold exactly the dict's items.
+
+Run from the repository root:
+    python -m checks.check_hash_table
+    python -m checks.check_hash_table --rounds 200 --operations 5000 --seed 3
+"""
+import argparse
+import random
+import sys
+
+from hash_table import HashTable
+
+
+def check_round(rng, operations, key_range):
+    """
+    Runs one random sequence of operations on a fresh table and a dict.
+
+    Returns:
+    - None if they always agreed, otherwise a description of the first difference.
+    """
+    table = HashTable(rng.choice((1, 2, 40, 1000)), max_load_factor=rng.choice((0.5, 0.7, 0.9)))
+    expected = {}
+    for step in range(operations):
+        key = rng.randrange(-key_range, key_range) if rng.random() < 0.1 else rng.randrange(key_range)
+        roll = rng.random()
+        if roll < 0.5:
+            value = object()
+            table.insert(key, value)
+            expected[key] = value
+            operation = f"insert({key})"
+        elif roll < 0.8:
+            removed = table.delete(key)
+            if removed is not expected.pop(key, None):
+                return f"step {step}: delete({key}) returned the wrong value"
+            operation = f"delete({key})"
+        else:
+            if table.lookup(key) is not expected.get(key):
+                return f"step {step}: lookup({key}) returned the wrong value"
+            operation = f"lookup({key})"
+
+        if len(table) != len(expected):
+            return f"step {step}: after {operation}, len is {len(table)}, expected {len(expected)}"
+        if (key in table) != (key in expected):
+            return f"step {step}: after {operation}, membership of {key} is wrong"
+        if table.count + table.deleted >= table.size:
+            return f"step {step}: after {operation}, the table has no empty slot"
+
+    if sorted(table) != sorted(expected):
+        return "the table iterates over the wrong keys"
+    if any(expected.get(key) is not value for key, value in table.items()):
+        return "items() returned the wrong values"
+    if any(table.lookup(key) is not value for key, value in expected.items()):
+        return "a final lookup returned the wrong value"
+    return None
+
+
+def main_check(argv=None):
+    """
+    Runs the random rounds and prints the first failure.
+
+    Returns:
+    - The exit status: 0 if every round passed, otherwise 1.
+    """
+    parser = argparse.ArgumentParser(description="Compare HashTable with dict on random operations.")
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--operations', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for round_number in range(args.rounds):
+        rng = random.Random(f"{args.seed}:{round_number}")
+        failure = check_round(rng, args.operations, key_range=rng.choice((8, 64, 512, 1 << 40)))
+        if failure:
+            print(f"round {round_number} (seed {args.seed}): {failure}")
+            return 1
+    print(f"HashTable matched dict in {args.rounds} rounds of {args.operations} operations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,250 @@
+"""
+Non-interactive command line for the WGUPS Routing Program.
+
+Plans the day once and writes the results as JSON Lines or CSV, to a file or stdout:
+    python cli.py plan
+    python cli.py status --at 09:00:00 10:30:00 --id 9 14 --format csv
+    python cli.py report --output report.jsonl
+    python cli.py report --router deadline
+    python cli.py plan --router vectorized
+    python cli.py plan --workers 3
+    python cli.py plan --shortest-paths --roads roads.csv
+
+Exit status is 0 on success, 2 for invalid arguments and 3 when an input file cannot be read.
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+from datetime import timedelta
+
+from ingest import ADDRESSES_PATH, DISTANCES_PATH, PACKAGES_PATH
+from main import plan_day
+from timeline import PackageStatus
+
+EXIT_OK = 0
+EXIT_USAGE = 2
+EXIT_INPUT = 3
+
+TIME_PATTERN = re.compile(r"^(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d$")
+OUTPUT_BUFFER = 1 << 20
+
+PLAN_FIELDS = ('truck', 'start_location', 'depart_time', 'finish_time', 'miles', 'package_count', 'route')
+STATUS_FIELDS = ('query_time',) + PackageStatus._fields
+REPORT_FIELDS = PackageStatus._fields + ('on_time',)
+
+
+def parse_clock(text):
+    """
+    Parses an HH:MM:SS argument into a timedelta since midnight.
+
+    Raises:
+    - argparse.ArgumentTypeError: If the text is not a valid time of day.
+
+    Time Complexity: O(1).
+    """
+    if not TIME_PATTERN.match(text):
+        raise argparse.ArgumentTypeError(f"invalid time {text!r}, expected HH:MM:SS (e.g., 08:35:00)")
+    hours, minutes, seconds = map(int, text.split(":"))
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def parse_workers(text):
+    """
+    Parses a --workers argument into a positive number of worker processes.
+
+    Raises:
+    - argparse.ArgumentTypeError: If the text is not a positive integer.
+
+    Time Complexity: O(1).
+    """
+    if not text.isdigit() or int(text) < 1:
+        raise argparse.ArgumentTypeError(f"invalid worker count {text!r}, expected a positive integer")
+    return int(text)
+
+
+def format_clock(time):
+    """
+    Formats a timedelta since midnight as HH:MM:SS, rounded to the nearest second.
+
+    Time Complexity: O(1).
+    """
+    total = round(time.total_seconds())
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+class RecordWriter:
+    """
+    Writes records with a fixed set of fields as JSON Lines or CSV.
+    """
+
+    def __init__(self, file, output_format, fields):
+        """
+        Initializes the writer and, for CSV, writes the header row.
+
+        Time Complexity: O(f), where f is the number of fields.
+        """
+        self.file = file
+        self.fields = fields
+        self.csv_writer = None
+        if output_format == 'csv':
+            self.csv_writer = csv.writer(file)
+            self.csv_writer.writerow(fields)
+
+    def write(self, values):
+        """
+        Writes one record, given its values in field order.
+
+        Times are written as HH:MM:SS. CSV cells hold lists as space-separated values and None as
+        an empty cell, while JSON keeps lists and null.
+
+        Time Complexity: O(f), where f is the number of fields.
+        """
+        values = [format_clock(value) if isinstance(value, timedelta) else value for value in values]
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([' '.join(map(str, value)) if isinstance(value, list) else value
+                                      for value in values])
+        else:
+            self.file.write(json.dumps(dict(zip(self.fields, values))))
+            self.file.write('\n')
+
+
+def write_plan(writer, trucks, package_data, timeline, args):
+    """
+    Writes one record per truck: its departure, finish time, mileage and delivery order.
+
+    Time Complexity: O(n), where n is the number of packages.
+    """
+    for truck in trucks:
+        writer.write((truck.truck_number, truck.start_location, truck.depart_time, truck.total_time_traveled,
+                      round(truck.miles, 2), len(truck.packages), list(truck.packages)))
+
+
+def write_status(writer, trucks, package_data, timeline, args):
+    """
+    Writes each requested package's status at each requested time, from the precomputed timeline.
+
+    Time Complexity: O(q * n log e), for q query times and n packages.
+    """
+    package_ids = args.ids
+    if package_ids is None:
+        package_ids = sorted(package_data)
+    for time in args.at:
+        for status in timeline.snapshot(time, package_ids):
+            writer.write((time,) + tuple(status))
+
+
+def write_report(writer, trucks, package_data, timeline, args):
+    """
+    Writes every package's final delivery status and whether it met its deadline.
+
+    Time Complexity: O(n), where n is the number of packages.
+    """
+    for package_id in sorted(package_data):
+        package = package_data.lookup(package_id)
+        deadline = package.deadline_ticks
+        on_time = deadline is None or (package.delivery_ticks is not None and package.delivery_ticks <= deadline)
+        writer.write([getattr(package, field) for field in PackageStatus._fields] + [on_time])
+
+
+def select_router(name):
+    """
+    Returns the routing function for a --router choice, or None for the default nearest neighbor.
+
+    The deadline-aware and vectorized routers need NumPy, so they are only imported when chosen.
+
+    Time Complexity: O(1).
+    """
+    if name == 'deadline':
+        from deadline_routing import deadline_aware_delivery
+        return deadline_aware_delivery
+    if name == 'vectorized':
+        from vectorized_delivery import vectorized_nearest_neighbor_delivery
+        return vectorized_nearest_neighbor_delivery
+    return None
+
+
+COMMANDS = {
+    'plan': (write_plan, PLAN_FIELDS),
+    'status': (write_status, STATUS_FIELDS),
+    'report': (write_report, REPORT_FIELDS),
+}
+
+
+def build_parser():
+    """
+    Builds the argument parser with the plan, status and report subcommands.
+
+    Time Complexity: O(1).
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help="Output format.")
+    common.add_argument('--output', '-o', metavar='FILE', help="Write to FILE instead of stdout.")
+    common.add_argument('--packages', default=PACKAGES_PATH, help="Package manifest CSV.")
+    common.add_argument('--addresses', default=ADDRESSES_PATH, help="Address list CSV.")
+    common.add_argument('--distances', default=DISTANCES_PATH, help="Distance matrix CSV.")
+    common.add_argument('--router', choices=('nearest', 'deadline', 'vectorized'), default='nearest',
+                        help="Route each truck by nearest neighbor, keep deadlines on time first, or run "
+                             "nearest neighbor with NumPy for large manifests.")
+    common.add_argument('--shortest-paths', action='store_true',
+                        help="Route with the shortest distance through other addresses, not the direct one.")
+    common.add_argument('--roads', metavar='FILE',
+                        help="CSV of address,address,miles roads, adding addresses missing from the "
+                             "distance table. Implies --shortest-paths.")
+
+    parser = argparse.ArgumentParser(description="Plan WGUPS deliveries and export the results.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan = commands.add_parser('plan', parents=[common], help="Write each truck's route and mileage.")
+    plan.add_argument('--workers', type=parse_workers, metavar='N',
+                      help="Route the trucks in N worker processes that share one copy of the distance matrix.")
+    status = commands.add_parser('status', parents=[common], help="Write package statuses at given times.")
+    status.add_argument('--at', type=parse_clock, nargs='+', action='extend', required=True,
+                        metavar='HH:MM:SS', help="One or more times of day.")
+    status.add_argument('--id', dest='ids', type=int, nargs='+', action='extend', metavar='N',
+                        help="Package IDs to include. Defaults to every package.")
+    commands.add_parser('report', parents=[common], help="Write every package's final delivery status.")
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs one subcommand and returns its exit status.
+
+    Process Flow:
+    1. Parse the arguments. argparse exits with status 2 on invalid ones.
+    2. Plan the day from the input files.
+    3. Check any requested package IDs, then write the subcommand's records.
+
+    Returns:
+    - EXIT_OK, EXIT_USAGE or EXIT_INPUT.
+
+    Time Complexity: The planning cost (see `main.plan_day`) plus the output size.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        trucks, package_data, timeline = plan_day(args.packages, args.addresses, args.distances,
+                                                  router=select_router(args.router),
+                                                  shortest_paths=args.shortest_paths, roads_path=args.roads,
+                                                  workers=getattr(args, 'workers', None))
+    except (OSError, ValueError, KeyError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return EXIT_INPUT
+
+    unknown = [package_id for package_id in getattr(args, 'ids', None) or () if package_id not in timeline]
+    if unknown:
+        print(f"error: unknown package IDs {unknown}", file=sys.stderr)
+        return EXIT_USAGE
+
+    write_records, fields = COMMANDS[args.command]
+    if args.output:
+        with open(args.output, 'w', newline='', buffering=OUTPUT_BUFFER) as file:
+            write_records(RecordWriter(file, args.format, fields), trucks, package_data, timeline, args)
+    else:
+        write_records(RecordWriter(sys.stdout, args.format, fields), trucks, package_data, timeline, args)
+        sys.stdout.flush()
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
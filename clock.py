@@ -0,0 +1,76 @@
+"""
+Integer time for the simulation core.
+
+Times of day are kept as ticks: whole microseconds since midnight, held in plain ints. A
+timedelta stores the same integer internally, and PackageStore already keeps its time columns
+in microseconds, so converting between them is exact. Routing adds ticks, and a timedelta is
+only built where a time is reported.
+"""
+import math
+from datetime import timedelta
+
+TICKS_PER_SECOND = 1000000
+TICKS_PER_HOUR = 3600 * TICKS_PER_SECOND
+
+_TICK = timedelta(microseconds=1)
+
+
+def to_ticks(time):
+    """
+    Converts a timedelta since midnight to ticks. None stays None.
+
+    Time Complexity: O(1).
+    """
+    return None if time is None else time // _TICK
+
+
+def to_timedelta(ticks):
+    """
+    Converts ticks to a timedelta since midnight, for reporting. None stays None.
+
+    Time Complexity: O(1).
+    """
+    return None if ticks is None else timedelta(microseconds=ticks)
+
+
+def hours_to_ticks(hours):
+    """
+    Converts a non-negative number of hours to ticks.
+
+    Rounds exactly as `timedelta(hours=hours)` does, so adding ticks leg by leg gives the same
+    times, to the microsecond, as adding timedeltas.
+
+    Time Complexity: O(1).
+    """
+    fraction, whole = math.modf(hours)
+    ticks = int(whole) * TICKS_PER_HOUR
+    if fraction == 0.0:
+        return ticks
+    fraction, whole = math.modf(fraction * TICKS_PER_HOUR)
+    ticks += int(whole)
+    if fraction == 0.5:
+        # Exactly halfway between two ticks: round so the total is even, as timedelta does
+        return ticks + ticks % 2
+    return ticks + round(fraction)
+
+
+def travel_ticks(distance, speed):
+    """
+    Returns the time to drive `distance` miles at `speed` miles per hour, in ticks.
+
+    Time Complexity: O(1).
+    """
+    return hours_to_ticks(distance / speed)
+
+
+def parse_ticks(text):
+    """
+    Parses an HH:MM:SS time of day into ticks.
+
+    Raises:
+    - ValueError: If the text does not have three numeric fields.
+
+    Time Complexity: O(1).
+    """
+    hours, minutes, seconds = map(int, text.split(":"))
+    return (hours * 3600 + minutes * 60 + seconds) * TICKS_PER_SECOND
@@ -0,0 +1,230 @@
+from collections import namedtuple
+
+from clock import TICKS_PER_HOUR, travel_ticks
+from package import apply_address_correction
+
+# Tolerance, in hours, when comparing planned arrivals with deadlines
+EPSILON = 1e-9
+
+LatePackage = namedtuple('LatePackage', ['package_id', 'deadline', 'delivery_time'])
+LatePackage.__doc__ = """
+A package delivered after its deadline, or not delivered at all (delivery_time is None).
+"""
+
+
+def deadline_aware_delivery(truck, package_data, distance_index):
+    """
+    Routes a truck so that as many packages as possible meet their deadlines, then by mileage.
+
+    Each package's deadline closes its time window. The truck's nearest neighbor route is planned
+    first and kept if it is already on time. Otherwise a deadline-paced route is planned with
+    `_paced_route`, and it is driven if it has fewer late packages. Without deadlines, or when
+    nearest neighbor meets them all, the result is exactly `nearest_neighbor_delivery`.
+
+    Process Flow:
+    1. Retrieve the truck's packages and reset their delivery details.
+    2. Plan the nearest neighbor route and time it without delivering anything.
+    3. If any package would be late, plan and time the deadline-paced route, and keep the route
+       with fewer late packages, then fewer miles.
+    4. Drive the chosen route, updating the truck's location, mileage, and time traveled, and
+       each package's delivery time and status.
+
+    Time Complexity: O(t^2), where t is the number of packages assigned to the truck. Each of the
+    t steps of a plan is a handful of vectorized passes.
+    """
+    packages = [package_data.lookup(package_id) for package_id in truck.packages]
+    truck.packages.clear()
+    if not packages:
+        return
+
+    for package in packages:
+        package.reset_package()
+    nearest = _paced_route(truck, packages, distance_index, paced=False)
+    best = _time_route(truck, packages, nearest, distance_index)
+    if best[0]:
+        paced = _time_route(truck, packages, _paced_route(truck, packages, distance_index), distance_index)
+        best = min(best, paced, key=lambda plan: plan[:2])
+
+    for index in best[2]:
+        package = packages[index]
+        apply_address_correction(package, truck.time_ticks)
+        distance = distance_index.distance(truck.location, package.delivery_address)
+        truck.packages.append(package.package_id)
+        truck.miles += distance
+        truck.time_ticks += travel_ticks(distance, truck.speed)
+        truck.location = package.delivery_address
+        package.delivery_ticks = truck.time_ticks
+        package.depart_ticks = truck.depart_ticks
+        package.status = "Delivered"
+        package.truck = truck.truck_number
+
+
+def _paced_route(truck, packages, distance_index, paced=True):
+    """
+    Plans a nearest neighbor route that is paced to reach every deadline package on time.
+
+    The deadline packages are first put in a delivery order of their own by `_deadline_order`,
+    which also gives the latest time the truck may reach each of them for the rest to stay on
+    time. The truck then takes the nearest package it can visit and still reach the next
+    deadline package by its latest time, and drives straight to that package when there is
+    none. Deadline packages are delivered in their own order, and the route is plain nearest
+    neighbor once they are all delivered.
+
+    Parameters:
+    - paced: False to ignore deadlines and plan plain nearest neighbor, with the same choices as
+      `vectorized_nearest_neighbor_delivery`.
+
+    Returns:
+    - The package indexes in delivery order.
+
+    Time Complexity: O(t^2), where t is the number of packages, in t vectorized passes.
+    """
+    import numpy as np
+
+    matrix = distance_index.as_numpy()
+    time = truck.time_ticks
+    for package in packages:
+        apply_address_correction(package, time)
+    address_ids = np.fromiter(
+        (distance_index.id_of(package.delivery_address) for package in packages),
+        dtype=np.intp,
+        count=len(packages),
+    )
+    # Only packages whose address depends on the time of day need re-resolving between steps
+    dynamic = [index for index, package in enumerate(packages) if package.address_correction is not None]
+    delivered = np.zeros(len(packages), dtype=bool)
+    location_id = distance_index.id_of(truck.location)
+    order, latest = np.empty(0, dtype=np.intp), None
+    if paced:
+        order, latest = _deadline_order(truck, packages, address_ids, matrix, location_id)
+    paced_packages = np.zeros(len(packages), dtype=bool)
+    paced_packages[order] = True
+    following = 0  # Position in `order` of the next deadline package
+    route = []
+
+    for _ in range(len(packages)):
+        for index in dynamic:
+            if not delivered[index]:
+                apply_address_correction(packages[index], time)
+                address_ids[index] = distance_index.id_of(packages[index].delivery_address)
+
+        candidates = matrix[location_id, address_ids]
+        candidates[delivered] = np.inf
+        while following < len(order) and delivered[order[following]]:
+            following += 1
+        if following < len(order):
+            target = order[following]
+            arrivals = time / TICKS_PER_HOUR + candidates / truck.speed
+            detours = arrivals + matrix[address_ids, address_ids[target]] / truck.speed
+            allowed = (detours <= latest[following] + EPSILON) & ~paced_packages
+            allowed[target] = True
+            candidates[~allowed] = np.inf
+
+        nearest = int(candidates.argmin())
+        delivered[nearest] = True
+        route.append(nearest)
+        time += travel_ticks(float(candidates[nearest]), truck.speed)
+        location_id = address_ids[nearest]
+    return route
+
+
+def _time_route(truck, packages, route, distance_index):
+    """
+    Times a planned route with the same arithmetic as driving it, without delivering anything.
+
+    A corrected address is resolved at the time the truck would leave for it, as when driving.
+
+    Returns:
+    - A tuple (late packages, miles, route).
+
+    Time Complexity: O(t), where t is the number of packages.
+    """
+    time = truck.time_ticks
+    location = truck.location
+    late = 0
+    miles = 0.0
+    for index in route:
+        package = packages[index]
+        apply_address_correction(package, time)
+        distance = distance_index.distance(location, package.delivery_address)
+        miles += distance
+        time += travel_ticks(distance, truck.speed)
+        location = package.delivery_address
+        late += package.deadline_ticks is not None and time > package.deadline_ticks
+    return late, miles, route
+
+
+def _deadline_order(truck, packages, address_ids, matrix, location_id):
+    """
+    Orders the deadline packages for `_paced_route`: earliest deadline first, and nearest neighbor
+    among packages with the same deadline.
+
+    Packages that would be late even on a route of deadline packages alone are left out, so the
+    rest can be paced. They are delivered like end-of-day packages.
+
+    Returns:
+    - A tuple (order, latest): package indexes in delivery order, and for each the latest time in
+      hours at which the truck may reach it and still deliver every later one on time.
+
+    Time Complexity: O(d^2), where d is the number of deadline packages.
+    """
+    import numpy as np
+
+    deadlines = np.fromiter(
+        (np.inf if package.deadline_ticks is None else package.deadline_ticks / TICKS_PER_HOUR
+         for package in packages),
+        dtype=np.float64,
+        count=len(packages),
+    )
+    start_hours = truck.time_ticks / TICKS_PER_HOUR
+    order = []
+    origin = location_id
+    for deadline in np.unique(deadlines[np.isfinite(deadlines)]):
+        tier = np.flatnonzero(deadlines == deadline)
+        while len(tier):
+            nearest = tier[int(matrix[origin, address_ids[tier]].argmin())]
+            order.append(nearest)
+            origin = address_ids[nearest]
+            tier = tier[tier != nearest]
+
+    order = np.array(order, dtype=np.intp)
+    while len(order):
+        stops = address_ids[order]
+        previous = np.concatenate(([location_id], stops[:-1]))
+        arrivals = start_hours + np.cumsum(matrix[previous, stops]) / truck.speed
+        on_time = arrivals <= deadlines[order] + EPSILON
+        if on_time.all():
+            break
+        order = order[on_time]
+    if not len(order):
+        return order, None
+
+    # Working backwards, the latest arrival at each stop is its own deadline or the latest
+    # arrival at the next stop minus the leg between them, whichever is earlier
+    legs = matrix[address_ids[order[:-1]], address_ids[order[1:]]] / truck.speed
+    offsets = np.concatenate(([0.0], np.cumsum(legs)))
+    latest = np.minimum.accumulate((deadlines[order] - offsets)[::-1])[::-1] + offsets
+    return order, latest
+
+
+def late_packages(trucks, package_data):
+    """
+    Checks routed trucks against their packages' deadlines.
+
+    Works with any router, since it only reads the delivery times the router recorded.
+
+    Returns:
+    - A dictionary mapping each truck number to a list of LatePackage, in delivery order.
+      Trucks with every package on time map to an empty list.
+
+    Time Complexity: O(n), where n is the number of routed packages.
+    """
+    report = {}
+    for truck in trucks:
+        late = report[truck.truck_number] = []
+        for package_id in truck.packages:
+            package = package_data.lookup(package_id)
+            deadline = package.deadline_ticks
+            if deadline is not None and (package.delivery_ticks is None or package.delivery_ticks > deadline):
+                late.append(LatePackage(package_id, package.deadline_time, package.delivery_time))
+    return report
@@ -0,0 +1,255 @@
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from clock import to_ticks, travel_ticks
+from package import apply_address_correction, clear_address_correction, parse_deadline
+
+# Package fields an event may change, by the key used in the change dictionary
+CHANGE_FIELDS = {
+    'address': 'delivery_address',
+    'city': 'delivery_city',
+    'state': 'delivery_state',
+    'zip_code': 'delivery_zip_code',
+    'deadline': 'delivery_deadline',
+    'weight': 'package_weight',
+    'notes': 'notes',
+}
+
+Reroute = namedtuple('Reroute', ['trucks', 'package_ids'])
+Reroute.__doc__ = """
+The outcome of an event: the trucks that were re-routed and the packages whose delivery changed.
+"""
+
+
+class Dispatcher:
+    """
+    Applies live events to a planned day, re-routing only the trucks they affect.
+
+    Each truck's stop times, in ticks, and cumulative mileage are kept per stop in flat arrays, so
+    the point a truck has reached at any time is found by binary search. Only the stops after that point are re-routed.
+    """
+
+    def __init__(self, trucks, package_data, distance_index):
+        """
+        Indexes the routed trucks.
+
+        Parameters:
+        - trucks: Trucks that have been routed, with `packages` in delivery order.
+        - package_data: The hash table of routed packages. Events update it in place.
+        - distance_index: The DistanceIndex the trucks were routed with.
+
+        Time Complexity: O(n), where n is the number of routed packages.
+        """
+        self.trucks = list(trucks)
+        self.package_data = package_data
+        self.distance_index = distance_index
+        self._truck_of = {}
+        self._stop_times = {}
+        self._stop_miles = {}
+        for truck in self.trucks:
+            times = array('q')
+            miles = array('d')
+            location = truck.start_location
+            total = 0.0
+            for package_id in truck.packages:
+                package = package_data.lookup(package_id)
+                total += distance_index.distance(location, package.delivery_address)
+                location = package.delivery_address
+                times.append(package.delivery_ticks)
+                miles.append(total)
+                self._truck_of[package_id] = truck
+            self._stop_times[truck.truck_number] = times
+            self._stop_miles[truck.truck_number] = miles
+
+    def apply_event(self, time, package_id, change):
+        """
+        Applies a change to one package at a time of day and re-routes the trucks it affects.
+
+        Supported changes:
+        - 'address', 'city', 'state', 'zip_code': A corrected delivery address. The package's truck
+          is re-routed from where it is at `time`.
+        - 'deadline', 'weight', 'notes': Updated details. No truck is re-routed.
+
+        Every change is checked before any is applied, so a rejected event leaves the package as it
+        was. An address set by an event replaces any scheduled address correction of the package.
+        - 'available_time': A delayed arrival at the hub. If the package's truck leaves before then,
+          the package moves to the earliest truck that leaves after it arrives and has room, and
+          both trucks are re-routed.
+
+        A truck keeps every delivery made before `time` and finishes the leg it is driving. If that
+        leg leads to the changed package, the truck still reaches the old address but keeps the
+        package. The rest of its stops, including that package, are re-routed with nearest neighbor.
+
+        Parameters:
+        - time: A timedelta since midnight.
+        - package_id: The package the event is about.
+        - change: A dictionary of the changes above.
+
+        Returns:
+        - A Reroute with the affected trucks and the IDs of the packages whose delivery or details
+          changed. The changed package is always included, so a timeline refreshed from them
+          serves its new details.
+
+        Raises:
+        - KeyError: If the package is not on any truck.
+        - ValueError: If the change is unknown or invalid, the address is not in the distance data,
+          the package was already delivered, or no truck can take a delayed package.
+
+        Time Complexity: O(log t + r^2), where t is the number of stops on the affected truck and
+        r the number of stops it still has to make.
+        """
+        updates = _validate_change(change, self.distance_index)
+        ticks = to_ticks(time)
+        truck = self._truck_of[package_id]
+        package = self.package_data.lookup(package_id)
+        if package.delivery_ticks is not None and package.delivery_ticks < ticks:
+            raise ValueError(f"Package {package_id} was already delivered at {package.delivery_time}")
+
+        target = truck
+        available_time = change.get('available_time')
+        if available_time is not None and truck.depart_ticks < to_ticks(available_time):
+            if truck.depart_ticks <= ticks:
+                raise ValueError(f"Package {package_id} already left on truck {truck.truck_number}")
+            target = self._truck_for_delayed(available_time, ticks, truck)
+
+        old_address = package.delivery_address
+        for field, value in updates.items():
+            setattr(package, field, value)
+        if 'address' in change:
+            clear_address_correction(package)
+        if target is truck and 'address' not in change:
+            return Reroute([], [package_id])
+
+        rerouted = self._reroute(truck, ticks, package_id, old_address, remove=target is not truck)
+        trucks = [truck]
+        if target is not truck:
+            rerouted += self._reroute(target, ticks, package_id, old_address, add=True)
+            trucks.append(target)
+        return Reroute(trucks, rerouted)
+
+    def _truck_for_delayed(self, available_time, ticks, current):
+        """
+        Picks the earliest truck that leaves after a delayed package arrives and still has room.
+
+        Time Complexity: O(k), where k is the number of trucks.
+        """
+        available_ticks = to_ticks(available_time)
+        candidates = [truck for truck in self.trucks
+                      if truck is not current and truck.depart_ticks >= available_ticks
+                      and truck.depart_ticks > ticks and len(truck.packages) < truck.capacity]
+        if not candidates:
+            raise ValueError(f"No truck leaves after {available_time} with room for the package")
+        return min(candidates, key=lambda truck: truck.depart_ticks)
+
+    def _reroute(self, truck, ticks, package_id, old_address, remove=False, add=False):
+        """
+        Re-routes a truck's remaining stops from where it is at `ticks`.
+
+        Parameters:
+        - old_address: The changed package's address before the event.
+        - remove, add: Whether to take `package_id` off the truck or put it on.
+
+        Returns:
+        - The IDs of the packages on the re-routed part of the route.
+
+        Time Complexity: O(log t + r^2), where r is the number of remaining stops.
+        """
+        route = truck.packages
+        times = self._stop_times[truck.truck_number]
+        miles = self._stop_miles[truck.truck_number]
+        kept = 0
+        start = None  # (location, ticks, mileage) to continue from, if not the last kept stop
+        if truck.depart_ticks <= ticks:
+            kept = bisect_left(times, ticks)  # Deliveries strictly before `ticks` are done
+            if kept < len(route) and route[kept] != package_id:
+                kept += 1  # The truck finishes the leg it is driving
+            elif kept < len(route):
+                # The leg leads to the changed package's old address. The truck still gets there,
+                # then continues with the package still on board.
+                start = (old_address, times[kept], miles[kept])
+        if start is None:
+            if kept:
+                start = (self.package_data.lookup(route[kept - 1]).delivery_address, times[kept - 1], miles[kept - 1])
+            else:
+                start = (truck.start_location, truck.depart_ticks, 0.0)
+
+        remaining = route[kept:]
+        if remove:
+            remaining.remove(package_id)
+        if add:
+            remaining.append(package_id)
+            self._truck_of[package_id] = truck
+        del route[kept:], times[kept:], miles[kept:]
+
+        truck.location, truck.time_ticks, truck.miles = start
+        self._route_from(truck, [self.package_data.lookup(remaining_id) for remaining_id in remaining])
+        return remaining
+
+    def _route_from(self, truck, packages):
+        """
+        Delivers packages by nearest neighbor from the truck's current location, time and mileage,
+        with the same arithmetic as `nearest_neighbor_delivery`.
+
+        Time Complexity: O(r^2), where r is the number of packages.
+        """
+        distance = self.distance_index.distance
+        times = self._stop_times[truck.truck_number]
+        miles = self._stop_miles[truck.truck_number]
+        while packages:
+            nearest_index = -1
+            shortest_distance = float('inf')
+            for index, package in enumerate(packages):
+                apply_address_correction(package, truck.time_ticks)
+                candidate = distance(truck.location, package.delivery_address)
+                if candidate < shortest_distance:
+                    shortest_distance = candidate
+                    nearest_index = index
+
+            package = packages.pop(nearest_index)
+            truck.packages.append(package.package_id)
+            truck.miles += shortest_distance
+            truck.time_ticks += travel_ticks(shortest_distance, truck.speed)
+            truck.location = package.delivery_address
+            package.delivery_ticks = truck.time_ticks
+            package.depart_ticks = truck.depart_ticks
+            package.status = "Delivered"
+            package.truck = truck.truck_number
+            times.append(package.delivery_ticks)
+            miles.append(truck.miles)
+
+
+def _validate_change(change, distance_index):
+    """
+    Checks and converts an event's changes without applying any of them.
+
+    Returns:
+    - A dictionary mapping package fields to their new values, with the zip code as a string,
+      the weight as a float and the deadline checked to parse.
+
+    Raises:
+    - ValueError: If a change is unknown, a value is invalid, or the address is not in the distance data.
+
+    Time Complexity: O(c), where c is the number of changes.
+    """
+    unknown = set(change) - set(CHANGE_FIELDS) - {'available_time'}
+    if unknown:
+        raise ValueError(f"Unknown changes {sorted(unknown)}")
+    if 'address' in change and change['address'] not in distance_index:
+        raise ValueError(f"Address {change['address']!r} is not in the distance data")
+    updates = {}
+    for key, field in CHANGE_FIELDS.items():
+        if key not in change:
+            continue
+        value = change[key]
+        try:
+            if key == 'deadline':
+                parse_deadline(value)
+            elif key == 'weight':
+                value = float(value)
+            elif key == 'zip_code':
+                value = str(value)
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError(f"Invalid {key} {value!r}") from None
+        updates[field] = value
+    return updates
@@ -0,0 +1,217 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from distance_index import DistanceIndex
+from ingest import ADDRESSES_PATH, DISTANCES_PATH, load_addresses, load_distance_index
+
+MAGIC = b'WGUPSDC1'
+VERSION = 1
+# magic, version, byte order, address count, address block length, payload CRC-32,
+# then (mtime_ns, size, SHA-256) for the distances CSV and for the addresses CSV
+HEADER = struct.Struct('<8sIBQQIqq32sqq32s')
+ALIGNMENT = 8
+
+
+class _Source:
+    """
+    The identity of a source CSV: its modification time, size and content hash.
+    """
+
+    def __init__(self, path):
+        """
+        Reads the file's modification time and size. The hash is computed only when needed.
+
+        Time Complexity: O(1).
+        """
+        stat = os.stat(path)
+        self.path = path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self._digest = None
+
+    @property
+    def digest(self):
+        """
+        The SHA-256 digest of the file's contents.
+
+        Time Complexity: O(f), where f is the file size. Computed once.
+        """
+        if self._digest is None:
+            sha = hashlib.sha256()
+            with open(self.path, 'rb') as file:
+                for block in iter(lambda: file.read(1 << 20), b''):
+                    sha.update(block)
+            self._digest = sha.digest()
+        return self._digest
+
+    def matches(self, mtime_ns, size, digest):
+        """
+        Checks whether the file is unchanged since the cache was written.
+
+        A matching modification time and size is trusted. Otherwise, for example after a fresh
+        checkout, the contents are hashed and compared.
+
+        Time Complexity: O(1) when the modification time matches, otherwise O(f).
+        """
+        if (self.mtime_ns, self.size) == (mtime_ns, size):
+            return True
+        return self.size == size and self.digest == digest
+
+
+def default_cache_path(distances_path=DISTANCES_PATH, shortest_paths=False):
+    """
+    Returns the cache file path used for a distances CSV, or for its shortest-path closure.
+
+    Time Complexity: O(1).
+    """
+    return os.path.splitext(distances_path)[0] + ('.paths.cache' if shortest_paths else '.cache')
+
+
+def load_cached_distance_index(addresses_path=ADDRESSES_PATH, distances_path=DISTANCES_PATH,
+                               cache_path=None, verify=True, shortest_paths=False):
+    """
+    Loads the distance index from a memory-mapped binary cache, rebuilding it if the CSVs changed.
+
+    Process Flow:
+    1. If a cache exists and both source CSVs match the fingerprints in its header, map it into
+       memory and wrap the matrix without copying or parsing it. A source that only matched by
+       its hash has its modification time refreshed in the header, so later runs skip the hash.
+    2. Otherwise parse the CSVs with the ingest module, close the matrix with
+       `shortest_paths.metric_closure` if requested, and write a new cache for the next run.
+       If the cache cannot be written, for example in a read-only directory, the parsed index is
+       still returned.
+
+    Parameters:
+    - addresses_path, distances_path: The source CSV files.
+    - cache_path: Where to keep the cache. Defaults to the distances path with a .cache extension.
+    - verify: Whether to check the payload's CRC-32 when opening an existing cache.
+    - shortest_paths: Whether to load shortest distances through other addresses instead of the
+      direct ones. The closure is cached in its own file, so it is only computed when a CSV
+      changes. Requires NumPy.
+
+    Returns:
+    - A DistanceIndex.
+
+    Time Complexity: O(a + a^2 / B) to open a valid cache, where B reflects the CRC-32 check
+    (skipped with verify=False), or O(a^2) to parse and rebuild it, O(a^3) with shortest_paths.
+    """
+    cache_path = cache_path or default_cache_path(distances_path, shortest_paths)
+    distances_source = _Source(distances_path)
+    addresses_source = _Source(addresses_path)
+    index = open_cache(cache_path, distances_source, addresses_source, verify)
+    if index is not None:
+        return index
+
+    address_list = load_addresses(addresses_path)
+    index = load_distance_index(address_list, distances_path)
+    if shortest_paths:
+        from shortest_paths import metric_closure
+        index = metric_closure(index)
+    try:
+        write_cache(cache_path, index, distances_source, addresses_source)
+    except OSError:
+        pass  # The cache only saves time on the next run
+    return index
+
+
+def write_cache(cache_path, index, distances_source, addresses_source):
+    """
+    Writes a DistanceIndex and the fingerprints of its sources to a cache file.
+
+    The file is written under a temporary name and then renamed, so a reader never sees a
+    partial cache.
+
+    Time Complexity: O(a^2), where a is the number of addresses.
+    """
+    addresses = '\n'.join(index.addresses).encode('utf-8')
+    padding = b'\0' * (-(HEADER.size + len(addresses)) % ALIGNMENT)
+    payload = memoryview(index.distances).cast('B')
+    checksum = zlib.crc32(payload, zlib.crc32(addresses))
+    header = HEADER.pack(MAGIC, VERSION, sys.byteorder == 'little', index.size, len(addresses), checksum,
+                         distances_source.mtime_ns, distances_source.size, distances_source.digest,
+                         addresses_source.mtime_ns, addresses_source.size, addresses_source.digest)
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'wb') as file:
+            file.write(header)
+            file.write(addresses)
+            file.write(padding)
+            file.write(payload)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def open_cache(cache_path, distances_source, addresses_source, verify=True):
+    """
+    Maps a cache file into memory and returns its DistanceIndex, or None if it is missing or stale.
+
+    The matrix is a read-only view of the mapped file, so pages are loaded on first use. When a
+    source matched by its hash rather than its modification time, for example after a `touch` or
+    a fresh checkout, the header is rewritten with the new times so the next run skips the hash.
+
+    Time Complexity: O(a) for the address list, plus O(a^2) for the CRC-32 check when `verify` is set.
+    """
+    try:
+        file = open(cache_path, 'rb')
+    except FileNotFoundError:
+        return None
+    with file:
+        if os.fstat(file.fileno()).st_size < HEADER.size:
+            return None
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, version, little_endian, size, address_length, checksum,
+     distances_mtime, distances_size, distances_digest,
+     addresses_mtime, addresses_size, addresses_digest) = HEADER.unpack_from(mapped)
+    matrix_start = HEADER.size + address_length + (-(HEADER.size + address_length) % ALIGNMENT)
+    if (magic != MAGIC or version != VERSION or little_endian != (sys.byteorder == 'little')
+            or len(mapped) != matrix_start + 8 * size * size
+            or not distances_source.matches(distances_mtime, distances_size, distances_digest)
+            or not addresses_source.matches(addresses_mtime, addresses_size, addresses_digest)):
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    addresses = view[HEADER.size:HEADER.size + address_length]
+    matrix = view[matrix_start:]
+    if verify and zlib.crc32(matrix, zlib.crc32(addresses)) != checksum:
+        # Views must be released before the mapping can be closed
+        for released in (matrix, addresses, view):
+            released.release()
+        mapped.close()
+        return None
+    if ((distances_mtime, distances_size) != (distances_source.mtime_ns, distances_source.size)
+            or (addresses_mtime, addresses_size) != (addresses_source.mtime_ns, addresses_source.size)):
+        _refresh_header(cache_path, HEADER.pack(
+            magic, version, little_endian, size, address_length, checksum,
+            distances_source.mtime_ns, distances_source.size, distances_source.digest,
+            addresses_source.mtime_ns, addresses_source.size, addresses_source.digest))
+    address_list = bytes(addresses).decode('utf-8').split('\n') if size else []
+    return DistanceIndex(address_list, matrix.cast('d'))
+
+
+def _refresh_header(cache_path, header):
+    """
+    Overwrites a cache file's header in place. The matrix after it is unchanged.
+
+    A cache that cannot be written, for example in a read-only directory, is left as it is.
+
+    Time Complexity: O(1).
+    """
+    try:
+        descriptor = os.open(cache_path, os.O_WRONLY)
+    except OSError:
+        return
+    try:
+        os.pwrite(descriptor, header, 0)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
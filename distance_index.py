@@ -0,0 +1,133 @@
+from array import array
+
+
+class DistanceIndex:
+    """
+    Dense, symmetric distance lookup built once from the raw distance and address tables.
+    Addresses outside the tables can be appended later with `add_addresses`.
+    """
+
+    def __init__(self, address_list, distances):
+        """
+        Initializes the index from an ordered address list and a flat distance buffer.
+
+        Parameters:
+        - address_list: Addresses in matrix order; the position of each address is its id.
+        - distances: A flat array('d') of length n * n holding the full symmetric matrix row by row.
+
+        Attributes:
+        - addresses: The address list, indexed by address id.
+        - ids: A dictionary mapping each address to its integer id.
+        - size: The number of addresses (n).
+        - distances: The flat n * n distance buffer.
+
+        Time Complexity: O(n) - Building the address-to-id map touches each address once.
+        """
+        self.addresses = list(address_list)
+        self.ids = {address: index for index, address in enumerate(self.addresses)}
+        self.size = len(self.addresses)
+        if len(distances) != self.size * self.size:
+            raise ValueError(f"Expected {self.size * self.size} distances, got {len(distances)}")
+        self.distances = distances
+
+    def add_addresses(self, addresses):
+        """
+        Appends new addresses to the index, with no known distance to any other address yet.
+
+        Distances from a new address are infinite except its zero distance to itself, for a caller
+        such as `shortest_paths.add_roads` to fill in. The matrix is always copied into a new
+        array('d'), so an index over a memory-mapped or shared buffer becomes a private, writable one.
+
+        Returns:
+        - The ids of the new addresses, in order.
+
+        Raises:
+        - ValueError: If an address is already in the index or repeats.
+
+        Time Complexity: O(m^2), where m is the number of addresses after the addition.
+        """
+        addresses = list(addresses)
+        duplicates = [address for address in addresses if address in self.ids]
+        if duplicates or len(set(addresses)) != len(addresses):
+            raise ValueError(f"Addresses {duplicates or addresses} are already in the index or repeat")
+        old_size = self.size
+        size = old_size + len(addresses)
+        distances = array('d', [float('inf')]) * (size * size)
+        old, new = memoryview(self.distances), memoryview(distances)
+        for i in range(old_size):
+            new[i * size:i * size + old_size] = old[i * old_size:(i + 1) * old_size]
+        for i in range(size):
+            distances[i * size + i] = 0.0
+
+        self.addresses.extend(addresses)
+        self.ids.update((address, index) for index, address in enumerate(addresses, start=old_size))
+        self.size = size
+        self.distances = distances
+        return list(range(old_size, size))
+
+    def __len__(self):
+        """
+        Returns the number of addresses in the index.
+
+        Time Complexity: O(1).
+        """
+        return self.size
+
+    def __contains__(self, address):
+        """
+        Checks whether an address is known to the index.
+
+        Time Complexity: O(1) - A single dictionary lookup.
+        """
+        return address in self.ids
+
+    def id_of(self, address):
+        """
+        Returns the integer id of an address.
+
+        Raises:
+        - KeyError: If the address is not in the index.
+
+        Time Complexity: O(1) - A single dictionary lookup.
+        """
+        return self.ids[address]
+
+    def distance_by_id(self, id1, id2):
+        """
+        Returns the distance between two address ids.
+
+        Time Complexity: O(1) - A single array access.
+        """
+        return self.distances[id1 * self.size + id2]
+
+    def distance(self, address1, address2):
+        """
+        Returns the distance between two addresses.
+
+        Time Complexity: O(1) - Two dictionary lookups and a single array access.
+        """
+        return self.distances[self.ids[address1] * self.size + self.ids[address2]]
+
+    def row(self, address_id):
+        """
+        Returns the distances from one address id to every other address.
+
+        Returns:
+        - A memoryview over the row, so no data is copied.
+
+        Time Complexity: O(1) - Slicing a memoryview does not copy.
+        """
+        start = address_id * self.size
+        return memoryview(self.distances)[start:start + self.size]
+
+    def as_numpy(self):
+        """
+        Returns the distance matrix as a two-dimensional NumPy array.
+
+        The array shares memory with the underlying buffer, so no data is copied.
+        Requires NumPy, which is only needed by the vectorized routing features.
+
+        Time Complexity: O(1) - The buffer is wrapped, not copied.
+        """
+        import numpy as np
+        return np.frombuffer(self.distances, dtype=np.float64).reshape(self.size, self.size)
@@ -1,92 +1,279 @@
+from array import array
+
+# Slot states, stored one byte per slot
+EMPTY = 0
+OCCUPIED = 1
+DELETED = 2  # Tombstone left by delete so probe chains stay intact
+
+
 class HashTable:
     """
     Implements a hash table for storing and managing packages efficiently.
     """
 
-    def __init__(self, size=40):
+    def __init__(self, size=40, max_load_factor=0.7):
         """
         Initializes the hash table with a specified size.
-        
+
         Parameters:
-        - size: The number of slots in the hash table, default is 40.
-        
+        - size: The initial number of slots in the hash table, default is 40. It is rounded up to a
+          power of two so slot indexes can be computed with a bit mask.
+        - max_load_factor: The fraction of occupied and deleted slots that triggers growth, default is 0.7.
+
         Attributes:
-        - table: A list of fixed size initialized with `None`, representing the hash table.
+        - keys: A compact array of package IDs, one per slot.
+        - values: The packages, in the slots matching `keys`.
+        - states: One byte per slot marking it empty, occupied or deleted.
+        - count: The number of packages stored.
+        - deleted: The number of tombstones.
+
+        Time Complexity: O(size) - Initializing the hash table involves creating arrays of fixed size.
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1")
+        self.max_load_factor = max_load_factor
+        self._allocate(1 << max(int(size) - 1, 1).bit_length())  # O(size)
+
+    def _allocate(self, size):
+        """
+        Private method to replace the slot arrays with empty arrays of the given size.
 
-        Time Complexity: O(size) - Initializing the hash table involves creating a list of fixed size.
+        Time Complexity: O(size).
         """
         self.size = size
-        self.table = [None] * size  # O(size)
+        self.mask = size - 1
+        self.keys = array('q', bytes(8 * size))
+        self.values = [None] * size
+        self.states = bytearray(size)
+        self.count = 0
+        self.deleted = 0
 
     def __str__(self):
         """
         Provides a string representation of all packages in the hash table.
-        
+
         Returns:
         - A string containing all packages, each on a new line.
 
         Time Complexity: O(n), where n is the number of slots in the table. Each slot is iterated once.
         """
-        package_list = str()
-        for package in self.table:  # O(n)
-            package_list += f"{package}\n"  # O(1) for string concatenation
-        return package_list
+        return "".join(f"{package}\n" for package in self.values_view())  # O(n)
+
+    def __len__(self):
+        """
+        Returns the number of packages stored.
+
+        Time Complexity: O(1).
+        """
+        return self.count
+
+    def __contains__(self, package_id):
+        """
+        Checks whether a package ID is stored.
+
+        Time Complexity: Average O(1), like `lookup`.
+        """
+        return self._find(package_id) >= 0
+
+    def __iter__(self):
+        """
+        Iterates over the stored package IDs in slot order.
+
+        Time Complexity: O(n), where n is the number of slots.
+        """
+        keys = self.keys
+        for index, state in enumerate(self.states):
+            if state == OCCUPIED:
+                yield keys[index]
+
+    def values_view(self):
+        """
+        Iterates over the stored packages in slot order.
+
+        Time Complexity: O(n), where n is the number of slots.
+        """
+        values = self.values
+        for index, state in enumerate(self.states):
+            if state == OCCUPIED:
+                yield values[index]
+
+    def items(self):
+        """
+        Iterates over (package_id, package) pairs in slot order.
+
+        Time Complexity: O(n), where n is the number of slots.
+        """
+        keys = self.keys
+        values = self.values
+        for index, state in enumerate(self.states):
+            if state == OCCUPIED:
+                yield keys[index], values[index]
 
     def _hash(self, key: int) -> int:
         """
         Private method to calculate the hash index for a given key.
-        
+
         Parameters:
         - key: The package ID for which the hash index is generated.
-        
+
         Returns:
         - An integer representing the index in the hash table where the key should be stored.
 
-        Time Complexity: O(1) - The hash index is computed in constant time using the modulo operation.
+        Time Complexity: O(1) - The hash index is computed in constant time using a bit mask,
+        which equals `key % size` because the size is a power of two.
+        """
+        return key & self.mask  # O(1)
+
+    def _find(self, package_id):
+        """
+        Private method to locate the slot holding a package ID.
+
+        Returns:
+        - The slot index, or -1 if the package ID is not stored.
+
+        Time Complexity: Average O(1), Worst O(n) - Probing stops at the first empty slot.
+        """
+        keys = self.keys
+        states = self.states
+        mask = self.mask
+        index = self._hash(package_id)  # O(1)
+        perturb = abs(package_id)
+        # Perturbed probing, stepping over tombstones
+        while states[index] != EMPTY:  # O(k), where k is the probe length
+            if states[index] == OCCUPIED and keys[index] == package_id:  # O(1) to compare IDs
+                return index
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+        return -1
+
+    def probe_length(self, package_id):
+        """
+        Returns the number of slots a lookup of the package ID inspects, for profiling.
+
+        Time Complexity: Average O(1), like `lookup`.
+        """
+        states = self.states
+        mask = self.mask
+        index = self._hash(package_id)
+        perturb = abs(package_id)
+        probes = 1
+        while states[index] != EMPTY:
+            if states[index] == OCCUPIED and self.keys[index] == package_id:
+                return probes
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+            probes += 1
+        return probes
+
+    def _resize(self, size):
+        """
+        Private method to rehash every package into a table of the given size, dropping tombstones.
+
+        Time Complexity: O(n + size), where n is the number of packages.
         """
-        return key % self.size  # O(1)
+        items = list(self.items())  # O(n)
+        self._allocate(size)
+        keys = self.keys
+        values = self.values
+        states = self.states
+        mask = self.mask
+        # Keys are already unique, so each one goes straight into the first empty slot
+        for package_id, package in items:
+            index = package_id & mask
+            perturb = abs(package_id)
+            while states[index] != EMPTY:
+                perturb >>= 5
+                index = (5 * index + 1 + perturb) & mask
+            keys[index] = package_id
+            values[index] = package
+            states[index] = OCCUPIED
+        self.count = len(items)
 
     def insert(self, package_id, package):
         """
         Inserts a package into the hash table using open addressing to handle collisions.
-        
+
+        Collisions are probed with the perturbed sequence CPython's dict uses, which mixes in the
+        key's higher bits. Plain linear probing builds long clusters from runs of consecutive
+        package IDs, and every colliding insert then has to walk the whole cluster.
+
+        The table doubles in size before occupied and deleted slots would exceed the maximum
+        load factor, so there is always an empty slot to end each probe.
+
         Parameters:
         - package_id: Unique identifier of the package.
         - package: Package object containing all relevant package details.
 
         Time Complexity:
         - Best Case: O(1) - The slot is empty, and the package is inserted directly.
-        - Worst Case: O(n) - In case of collisions, linear probing may traverse all slots.
-        - Average Case: O(1) - With a good hash function and low load factor, collisions are rare.
+        - Worst Case: O(n) - A resize rehashes every package.
+        - Average Case: O(1) amortized - The load factor is bounded, so probes stay short.
         """
+        if self.count + self.deleted + 1 > self.size * self.max_load_factor:
+            # Grow if live packages fill the table, otherwise just clear out tombstones
+            grow = self.count + 1 > self.size * self.max_load_factor / 2
+            self._resize(self.size * 2 if grow else self.size)  # O(n), amortized O(1)
+
+        keys = self.keys
+        states = self.states
+        mask = self.mask
         index = self._hash(package_id)  # O(1)
-        # Resolve collisions using linear probing
-        while self.table[index] is not None:  # O(k), where k is the number of collisions
-            if self.table[index].package_id == package_id:  # O(1) to compare IDs
-                self.table[index] = package  # O(1) to update
-                return
-            index = (index + 1) % self.size  # O(1) to probe the next slot
-        self.table[index] = package  # O(1) to insert
+        perturb = abs(package_id)
+        tombstone = -1
+        # Resolve collisions using perturbed probing
+        while states[index] != EMPTY:  # O(k), where k is the number of collisions
+            if states[index] == OCCUPIED:
+                if keys[index] == package_id:  # O(1) to compare IDs
+                    self.values[index] = package  # O(1) to update
+                    return
+            elif tombstone < 0:
+                tombstone = index  # Reuse the first tombstone once the key is known to be absent
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+        if tombstone >= 0:
+            index = tombstone
+            self.deleted -= 1
+        keys[index] = package_id  # O(1) to insert
+        self.values[index] = package
+        states[index] = OCCUPIED
+        self.count += 1
 
     def lookup(self, package_id):
         """
         Finds and returns a package from the hash table by its package_id.
-        
+
         Parameters:
         - package_id: The unique identifier for the package to locate.
-        
+
         Returns:
         - The Package object if found, otherwise None.
 
         Time Complexity:
         - Best Case: O(1) - The package is located in the first checked slot.
-        - Worst Case: O(n) - Linear probing may traverse all slots if collisions occur.
-        - Average Case: O(1) - With a good hash function and low load factor, collisions are rare.
+        - Worst Case: O(n) - Probing may traverse many slots if collisions cluster.
+        - Average Case: O(1) - The load factor is bounded, so collisions are rare.
         """
-        index = self._hash(package_id)  # O(1)
-        # Linear probing to find the package if collisions occurred
-        while self.table[index] is not None:  # O(k), where k is the number of collisions
-            if self.table[index].package_id == package_id:  # O(1) to compare IDs
-                return self.table[index]  # O(1) to return the package
-            index = (index + 1) % self.size  # O(1) to probe the next slot
-        return None  # O(1) to return None if not found
+        index = self._find(package_id)
+        return self.values[index] if index >= 0 else None
+
+    def delete(self, package_id):
+        """
+        Removes a package from the hash table, leaving a tombstone in its slot.
+
+        Parameters:
+        - package_id: The unique identifier for the package to remove.
+
+        Returns:
+        - The removed Package object, or None if it was not found.
+
+        Time Complexity: Average O(1), like `lookup`.
+        """
+        index = self._find(package_id)
+        if index < 0:
+            return None
+        package = self.values[index]
+        self.values[index] = None
+        self.states[index] = DELETED
+        self.count -= 1
+        self.deleted += 1
+        return package
@@ -0,0 +1,281 @@
+import csv
+import math
+from array import array
+
+from distance_index import DistanceIndex
+from hash_table import HashTable
+from package import Package, parse_deadline
+
+PACKAGES_PATH = "./csv/packages.csv"
+DISTANCES_PATH = "./csv/distances.csv"
+ADDRESSES_PATH = "./csv/addresses.csv"
+PACKAGE_COLUMNS = ('PackageID', 'Address', 'City', 'State', 'Zip', 'Deadline', 'Weight', 'Notes')
+
+
+class IngestError(ValueError):
+    """
+    Raised when an input file is malformed. The message names the file and line.
+    """
+
+    def __init__(self, path, line, message):
+        """
+        Initializes the error with the file, 1-based line number and a description.
+
+        Time Complexity: O(1).
+        """
+        super().__init__(f"{path}, line {line}: {message}")
+        self.path = path
+        self.line = line
+
+
+def iter_package_chunks(path=PACKAGES_PATH, chunk_size=10000):
+    """
+    Streams packages from a manifest CSV in lists of at most `chunk_size`.
+
+    Only one chunk is held in memory at a time, so manifests of any length can be read.
+
+    Process Flow:
+    1. Check that the header has every required column.
+    2. For each row, validate the ID, weight and deadline, and build a Package.
+    3. Yield the packages whenever a chunk fills up, then yield the last partial chunk.
+
+    Raises:
+    - IngestError: If a column is missing, a value cannot be parsed, or an ID repeats.
+
+    Time Complexity: O(n), where n is the number of packages.
+    """
+    seen = set()
+    with open(path, mode='r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.DictReader(file)
+        missing = [column for column in PACKAGE_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise IngestError(path, 1, f"missing columns {missing}")
+        chunk = []
+        for row in reader:
+            line = reader.line_num
+            try:
+                package_id = int(row['PackageID'])
+                weight = float(row['Weight'])
+                parse_deadline(row['Deadline'])
+            except (TypeError, ValueError) as error:
+                raise IngestError(path, line, str(error)) from None
+            if package_id in seen:
+                raise IngestError(path, line, f"duplicate package ID {package_id}")
+            if not row['Address']:
+                raise IngestError(path, line, "missing address")
+            seen.add(package_id)
+            chunk.append(Package(
+                package_id=package_id,
+                address=row['Address'],
+                deadline=row['Deadline'],
+                city=row['City'],
+                state=row['State'],
+                zip_code=row['Zip'],
+                weight=weight,
+                status=row.get('Status') or 'at hub',
+                notes=row['Notes'] or ''
+            ))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def load_packages(path=PACKAGES_PATH, package_data=None, chunk_size=10000):
+    """
+    Loads a manifest into a hash table (or any table with an `insert` method, such as PackageStore).
+
+    Returns:
+    - The filled table.
+
+    Time Complexity: O(n), where n is the number of packages.
+    """
+    if package_data is None:
+        package_data = HashTable()
+    for chunk in iter_package_chunks(path, chunk_size):
+        for package in chunk:
+            package_data.insert(package.package_id, package)
+    return package_data
+
+
+def load_addresses(path=ADDRESSES_PATH):
+    """
+    Loads the address list, one address per row in matrix order.
+
+    Rows have the form `index,name,address`, and the indexes must count up from 0.
+
+    Raises:
+    - IngestError: If a row is short, an index is out of order, or an address repeats.
+
+    Time Complexity: O(a), where a is the number of addresses.
+    """
+    addresses = []
+    seen = set()
+    with open(path, mode='r', encoding='utf-8-sig', newline='') as file:
+        for line, row in enumerate(csv.reader(file), start=1):
+            if not row:
+                continue
+            if len(row) < 3:
+                raise IngestError(path, line, "expected index, name and address")
+            if row[0].strip() != str(len(addresses)):
+                raise IngestError(path, line, f"expected index {len(addresses)}, got {row[0]!r}")
+            if row[2] in seen:
+                raise IngestError(path, line, f"duplicate address {row[2]!r}")
+            seen.add(row[2])
+            addresses.append(row[2])
+    return addresses
+
+
+def load_roads(path):
+    """
+    Loads road links for `shortest_paths.add_roads`, one two-way road per row.
+
+    Rows have the form `address,address,miles`. Either address may be missing from the address
+    list, which is how addresses outside the distance table are added.
+
+    Raises:
+    - IngestError: If a row is short, an address is blank, or the miles are not a finite,
+      non-negative number.
+
+    Time Complexity: O(r), where r is the number of roads.
+    """
+    roads = []
+    with open(path, mode='r', encoding='utf-8-sig', newline='') as file:
+        for line, row in enumerate(csv.reader(file), start=1):
+            if not row:
+                continue
+            if len(row) < 3 or not row[0] or not row[1]:
+                raise IngestError(path, line, "expected two addresses and the miles between them")
+            try:
+                miles = float(row[2])
+            except ValueError:
+                raise IngestError(path, line, f"miles is not a number: {row[2]!r}") from None
+            if not math.isfinite(miles) or miles < 0:
+                raise IngestError(path, line, f"miles must be finite and not negative: {row[2]!r}")
+            roads.append((row[0], row[1], miles))
+    return roads
+
+
+def load_distance_index(address_list, path=DISTANCES_PATH):
+    """
+    Parses a lower-triangular distance CSV straight into a DistanceIndex.
+
+    Rows are read one at a time and written into a preallocated flat buffer, so no list of string
+    rows is ever built. A value above the diagonal, if present, takes precedence over its mirror,
+    as it did with `calculate_distance`.
+
+    Process Flow:
+    1. Parse each row. A complete lower-triangular row is converted in one bulk step;
+       any other row is checked cell by cell.
+    2. Check that every pair of addresses has a distance in at least one half.
+    3. Mirror each value into any blank cell on the other side of the diagonal.
+
+    Raises:
+    - IngestError: If the matrix has the wrong number of rows or columns, a value is not a
+      finite, non-negative number (NaN and infinity are rejected), or a distance is missing
+      from both halves.
+
+    Time Complexity: O(a^2), where a is the number of addresses. Memory is the a^2 buffer plus
+    one row, with one byte per cell to track which cells were present in the file.
+    """
+    size = len(address_list)
+    distances = array('d', bytes(8 * size * size))
+    explicit = bytearray(size * size)  # 1 for values read from the file, 0 for blanks
+    rows = 0
+    with open(path, mode='r', encoding='utf-8-sig', newline='') as file:
+        for line, row in enumerate(csv.reader(file), start=1):
+            if not row:
+                continue
+            if rows >= size:
+                raise IngestError(path, line, f"more rows than the {size} addresses")
+            if len(row) > size:
+                raise IngestError(path, line, f"{len(row)} columns for {size} addresses")
+            if not _parse_lower_row(row, rows, size, distances, explicit):
+                _parse_cells(path, line, row, rows, size, distances, explicit)
+            rows += 1
+    if rows != size:
+        raise IngestError(path, rows, f"expected {size} rows, got {rows}")
+
+    for i in range(size):
+        start = i * size
+        if explicit.count(0, start, start + i + 1):  # Only inspect rows with blanks in the lower half
+            for j in range(i + 1):
+                if not explicit[start + j] and not explicit[j * size + i]:
+                    raise IngestError(path, i + 1, f"no distance between rows {i + 1} and {j + 1}")
+    _mirror(distances, explicit, size)
+    return DistanceIndex(address_list, distances)
+
+
+def _parse_lower_row(row, i, size, distances, explicit):
+    """
+    Converts row i in one step when it holds exactly i + 1 valid values followed by blanks.
+
+    Returns:
+    - True if the row was stored, or False if it needs the cell-by-cell path.
+
+    Time Complexity: O(a), where a is the number of addresses, with the loops running in C.
+    """
+    count = i + 1
+    lower = row[:count]
+    if len(lower) != count or not all(lower) or any(row[count:]):
+        return False
+    try:
+        values = array('d', map(float, lower))
+    except ValueError:
+        return False
+    if min(values) < 0 or not all(map(math.isfinite, values)):
+        return False
+    start = i * size
+    distances[start:start + count] = values
+    explicit[start:start + count] = b'\x01' * count
+    return True
+
+
+def _parse_cells(path, line, row, i, size, distances, explicit):
+    """
+    Stores row i cell by cell, reporting the exact column of any invalid value.
+
+    Time Complexity: O(a), where a is the number of addresses.
+    """
+    start = i * size
+    for j, cell in enumerate(row):
+        if not cell:
+            continue
+        try:
+            value = float(cell)
+        except ValueError:
+            raise IngestError(path, line, f"column {j + 1} is not a number: {cell!r}") from None
+        if not math.isfinite(value):
+            raise IngestError(path, line, f"column {j + 1} is not a finite number: {cell!r}")
+        if value < 0:
+            raise IngestError(path, line, f"column {j + 1} is negative: {cell!r}")
+        distances[start + j] = value
+        explicit[start + j] = 1
+
+
+def _mirror(distances, explicit, size):
+    """
+    Copies each value across the diagonal into cells that were blank in the file.
+
+    When a row has nothing above the diagonal, its upper half is copied from the column below in
+    one strided slice.
+
+    Time Complexity: O(a^2), where a is the number of addresses.
+    """
+    for j in range(size):
+        upper_start = j * size + j + 1
+        upper_end = (j + 1) * size
+        if upper_start >= upper_end:
+            continue
+        column = slice((j + 1) * size + j, size * size, size)
+        if not explicit.count(1, upper_start, upper_end):
+            distances[upper_start:upper_end] = distances[column]
+            continue
+        for i in range(j + 1, size):
+            upper = j * size + i
+            lower = i * size + j
+            if not explicit[upper]:
+                distances[upper] = distances[lower]
+            elif not explicit[lower]:
+                distances[lower] = distances[upper]
@@ -0,0 +1,261 @@
+import cProfile
+import functools
+import io
+import pstats
+from contextlib import nullcontext
+from time import perf_counter, process_time
+
+from distance_index import DistanceIndex
+from hash_table import HashTable
+
+_NO_STAGE = nullcontext()
+_active = None
+
+
+class _Stage:
+    """
+    Times one pass through a named stage of the program, in wall-clock and CPU time.
+    """
+
+    __slots__ = ('profiler', 'name', 'wall', 'cpu')
+
+    def __init__(self, profiler, name):
+        """
+        Initializes the timer for a stage.
+
+        Time Complexity: O(1).
+        """
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall = perf_counter()
+        self.cpu = process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add_stage(self.name, perf_counter() - self.wall, process_time() - self.cpu)
+        return False
+
+
+class Profiler:
+    """
+    Collects hot-path counters and per-stage timings for one run of the program.
+
+    Counters:
+    - distance_evaluations: Calls to DistanceIndex.distance and distance_by_id.
+    - hash_lookups, hash_probes, max_probe_length: HashTable lookups and the slots each inspected.
+    - routes, route_steps: Nearest neighbor calls and the stops they delivered (one outer loop
+      iteration per stop, each scanning the undelivered packages).
+    """
+
+    def __init__(self):
+        """
+        Initializes empty counters and stage timings.
+
+        Time Complexity: O(1).
+        """
+        self.counters = {}
+        self.stages = {}  # stage name -> [calls, wall seconds, CPU seconds]
+        self.hooks = None
+        self.profile_path = None
+        self.cprofile = None
+
+    def count(self, name, amount=1):
+        """
+        Adds `amount` to a counter.
+
+        Time Complexity: O(1).
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def maximum(self, name, value):
+        """
+        Raises a counter to `value` if it is larger.
+
+        Time Complexity: O(1).
+        """
+        if value > self.counters.get(name, 0):
+            self.counters[name] = value
+
+    def stage(self, name):
+        """
+        Returns a context manager that adds the time spent inside it to the named stage.
+
+        Time Complexity: O(1).
+        """
+        return _Stage(self, name)
+
+    def add_stage(self, name, wall, cpu):
+        """
+        Records one pass through a stage.
+
+        Time Complexity: O(1).
+        """
+        totals = self.stages.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+
+    def summary(self):
+        """
+        Returns a readable report of the stage timings and counters.
+
+        Time Complexity: O(s + c), where s is the number of stages and c the number of counters.
+        """
+        lines = ["Stage                     Calls     Wall (s)      CPU (s)"]
+        for name, (calls, wall, cpu) in self.stages.items():
+            lines.append(f"{name:<24} {calls:>6} {wall:>12.6f} {cpu:>12.6f}")
+        lines.append("")
+        lines.append("Counter                          Value")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<24} {value:>14,}")
+        lookups = self.counters.get('hash_lookups', 0)
+        if lookups:
+            lines.append(f"{'mean_probe_length':<24} {self.counters.get('hash_probes', 0) / lookups:>14.3f}")
+        return "\n".join(lines)
+
+
+def _counting_distance(method):
+    """
+    Wraps a DistanceIndex method so each call counts as a distance evaluation.
+    """
+    @functools.wraps(method)
+    def wrapper(self, first, second):
+        _active.count('distance_evaluations')
+        return method(self, first, second)
+    return wrapper
+
+
+def _counting_lookup(method):
+    """
+    Wraps HashTable.lookup to record how many slots each lookup inspects.
+    """
+    @functools.wraps(method)
+    def wrapper(self, package_id):
+        probes = self.probe_length(package_id)
+        _active.count('hash_lookups')
+        _active.count('hash_probes', probes)
+        _active.maximum('max_probe_length', probes)
+        return method(self, package_id)
+    return wrapper
+
+
+def _counting_route(function):
+    """
+    Wraps a routing function to count routes and the stops delivered on them.
+    """
+    @functools.wraps(function)
+    def wrapper(truck, package_data, distance_index, *args, **kwargs):
+        _active.count('routes')
+        _active.count('route_steps', len(truck.packages))
+        with _active.stage('route'):
+            return function(truck, package_data, distance_index, *args, **kwargs)
+    return wrapper
+
+
+class _Hooks:
+    """
+    The wrapped functions installed while profiling, and the originals they replaced.
+    """
+
+    def __init__(self, targets):
+        """
+        Wraps each (owner, attribute, wrapper factory) target.
+
+        Time Complexity: O(k), where k is the number of targets.
+        """
+        self.originals = []
+        for owner, attribute, make_wrapper in targets:
+            original = getattr(owner, attribute)
+            self.originals.append((owner, attribute, original))
+            setattr(owner, attribute, make_wrapper(original))
+
+    def remove(self):
+        """
+        Restores every original function.
+
+        Time Complexity: O(k), where k is the number of targets.
+        """
+        for owner, attribute, original in reversed(self.originals):
+            setattr(owner, attribute, original)
+        self.originals.clear()
+
+
+def enable(routers=(), profile_path=None):
+    """
+    Starts collecting counters and stage timings, and optionally a cProfile trace.
+
+    Instrumentation is off by default and costs nothing then. The hot paths are left untouched,
+    and counting wrappers are only swapped in here, for the lifetime of the profiling session.
+    Each routing function to count has to be passed in `routers` as a (module, name) pair,
+    because callers look routers up by name on their module.
+
+    Process Flow:
+    1. Create a Profiler and make it the active one.
+    2. Wrap DistanceIndex.distance, DistanceIndex.distance_by_id, HashTable.lookup and each router.
+    3. If `profile_path` is given, start cProfile.
+
+    Parameters:
+    - routers: (module, function name) pairs for the routing functions to count and time.
+    - profile_path: Where `disable` should write the pstats file, or None to skip cProfile.
+
+    Returns:
+    - The active Profiler.
+
+    Time Complexity: O(k), where k is the number of hooks.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Profiling is already enabled")
+    _active = Profiler()
+    targets = [(DistanceIndex, 'distance', _counting_distance),
+               (DistanceIndex, 'distance_by_id', _counting_distance),
+               (HashTable, 'lookup', _counting_lookup)]
+    targets += [(module, name, _counting_route) for module, name in routers]
+    _active.hooks = _Hooks(targets)
+    _active.profile_path = profile_path
+    if profile_path:
+        _active.cprofile = cProfile.Profile()
+        _active.cprofile.enable()
+    return _active
+
+
+def disable():
+    """
+    Stops profiling, restores the original functions and writes the pstats file if one was requested.
+
+    Returns:
+    - The Profiler that was active, or None if profiling was not enabled.
+
+    Time Complexity: O(k), plus the time to write the pstats file.
+    """
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    if profiler.cprofile is not None:
+        profiler.cprofile.disable()
+        profiler.cprofile.dump_stats(profiler.profile_path)
+    profiler.hooks.remove()
+    return profiler
+
+
+def stage(name):
+    """
+    Returns a context manager timing the named stage, or a shared no-op one when profiling is off.
+
+    Time Complexity: O(1).
+    """
+    return _NO_STAGE if _active is None else _active.stage(name)
+
+
+def top_functions(profile_path, limit=15):
+    """
+    Returns the `limit` functions with the highest cumulative time from a pstats file.
+
+    Time Complexity: O(f log f), where f is the number of profiled functions.
+    """
+    output = io.StringIO()
+    pstats.Stats(profile_path, stream=output).sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
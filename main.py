@@ -1,8 +1,15 @@
 from truck import Truck
 from datetime import timedelta
-from hash_table import HashTable
-from package import Package
-import re, csv
+from clock import travel_ticks
+from package import apply_address_correction, attach_address_corrections
+from ingest import ADDRESSES_PATH, DISTANCES_PATH, PACKAGES_PATH, load_packages, load_roads
+from distance_cache import load_cached_distance_index
+from assignment import assign_packages
+from timeline import DeliveryTimeline
+import instrumentation
+import argparse
+import re
+import sys
 
 """
 Name: Mason Wilkins
@@ -11,48 +18,154 @@ Western Governors University
 NHP3 — NHP3 Task 2: WGUPS Routing Program Implementation
 """
 
+HUB_ADDRESS = '4001 South 700 East'
+# Truck 1 leaves at 8:00, truck 2 after the delayed packages arrive, truck 3 after package 9's correction
+DEPARTURE_TIMES = (timedelta(hours=8), timedelta(hours=9, minutes=5), timedelta(hours=10, minutes=20))
+# Corrected addresses, by package ID, as (address, zip code, time the correction is known). A correction
+# applies only to a package whose notes say "Wrong address listed".
+ADDRESS_CORRECTIONS = {9: ('410 S State St', '84111', timedelta(hours=10, minutes=20))}
+
 # Main function
-def main():
+def main(argv=None):
     """
     Main function to run the WGUPS Routing Program.
 
+    With `--profile`, counters and per-stage timings are collected and printed on exit, and
+    `--profile-output FILE` also writes a cProfile/pstats file.
+
     Process Flow:
     1. Load package data, distance matrix, and address data from respective CSV files.
     2. Create and initialize three trucks with their IDs, start locations, and start times.
-    3. Assign specific packages to each truck based on predefined package IDs.
+    3. Assign packages to trucks based on their notes, deadlines, and truck capacity.
     4. Optimize delivery for each truck using the Nearest Neighbor Algorithm.
-    5. Provide a menu for user interaction with four main options:
+    5. Index each package's status over the day in a delivery timeline.
+    6. Provide a menu for user interaction with four main options:
         - View final delivery status of all packages and total mileage.
         - Lookup the delivery status of a single package at a specified time.
         - View delivery statuses of all packages at a specified time.
         - Exit the program.
-    6. Validate user input for menu selections, package IDs, and time formats.
-    7. Process user requests and loop until the user chooses to exit.
+    7. Validate user input for menu selections, package IDs, and time formats.
+    8. Process user requests and loop until the user chooses to exit.
 
     Time Complexity:
-    - Data Loading: O(n), where n is the total size of the CSV files.
+    - Data Loading: O(n), where n is the total size of the CSV files, streamed through the ingest module.
+      The distance matrix is memory-mapped from its binary cache when the CSVs are unchanged.
     - Delivery: O(t^2), where t is the number of packages per truck.
+    - Timeline: O(n) to build, O(log e) per package lookup.
     - Menu Loop: O(1) to O(n), depending on user interaction.
     """
+    parser = argparse.ArgumentParser(description="WGUPS Routing Program")
+    parser.add_argument('--profile', action='store_true', help="Print hot-path counters and stage timings on exit.")
+    parser.add_argument('--profile-output', metavar='FILE', help="With --profile, also write a pstats file.")
+    args = parser.parse_args(argv)
+    if args.profile:
+        instrumentation.enable(routers=[(sys.modules[__name__], 'nearest_neighbor_delivery')],
+                               profile_path=args.profile_output)
+    try:
+        return run_program()
+    finally:
+        profiler = instrumentation.disable()
+        if profiler is not None:
+            print(profiler.summary())
+            if profiler.profile_path:
+                print(instrumentation.top_functions(profiler.profile_path))
+
+
+def plan_day(packages_path=PACKAGES_PATH, addresses_path=ADDRESSES_PATH, distances_path=DISTANCES_PATH,
+             hub=HUB_ADDRESS, departure_times=DEPARTURE_TIMES, router=None, shortest_paths=False,
+             roads_path=None, address_corrections=ADDRESS_CORRECTIONS, workers=None):
+    """
+    Loads the input files, assigns and routes every package, and indexes the day's timeline.
+
+    Parameters:
+    - packages_path, addresses_path, distances_path: The input CSV files.
+    - hub: The address every truck starts from.
+    - departure_times: One departure time per truck, numbered from 1.
+    - router: The routing function for each truck, as in `route_day`.
+    - shortest_paths: Whether to route with the shortest distance through other addresses
+      instead of the direct distance in the table (see `shortest_paths.metric_closure`).
+    - roads_path: A CSV of extra roads, as read by `ingest.load_roads`, that can add addresses
+      missing from the distance table. Implies shortest_paths.
+    - address_corrections: Corrections for packages listed with a wrong address, as taken by
+      `package.attach_address_corrections`.
+    - workers: If set, route the trucks in this many worker processes, as in `route_day`.
+
+    Returns:
+    - A tuple (trucks, package_data, timeline).
+
+    Raises:
+    - ValueError: If a package's address is not in the distance data, or a road is invalid.
+
+    Time Complexity: O(n + a^2 + t^2), for n packages, a addresses and t packages per truck.
+    """
     # Load data
-    package_data = load_package_data()
-    distance_matrix = load_distance_table()
-    address_list = [row[2] for row in load_address_data()]
+    with instrumentation.stage('load packages'):
+        package_data = load_packages(packages_path)
+        corrected = attach_address_corrections(package_data, address_corrections)
+    with instrumentation.stage('load distances'):
+        distance_index = load_cached_distance_index(addresses_path, distances_path,
+                                                    shortest_paths=shortest_paths or roads_path is not None)
+        if roads_path is not None:
+            from shortest_paths import add_roads
+            add_roads(distance_index, load_roads(roads_path))
+        addresses = {package_data.lookup(package_id).delivery_address for package_id in package_data}
+        addresses.update(package_data.lookup(package_id).address_correction.address for package_id in corrected)
+        unknown = sorted(addresses - set(distance_index.ids))
+        if unknown:
+            raise ValueError(f"Addresses {unknown} are not in the distance data. Add roads to them with a roads file.")
 
     # Initialize trucks
-    truck1 = Truck(1, '4001 South 700 East', timedelta(hours=8))
-    truck2 = Truck(2, '4001 South 700 East', timedelta(hours=9, minutes=5))
-    truck3 = Truck(3, '4001 South 700 East', timedelta(hours=10, minutes=20))
+    trucks = [Truck(number, hub, depart_time) for number, depart_time in enumerate(departure_times, start=1)]
+
+    # Assign and deliver packages
+    package_ids = route_day(trucks, package_data, distance_index, router, workers)
+
+    # Index every package's status over the day for time lookups
+    with instrumentation.stage('timeline'):
+        timeline = DeliveryTimeline(package_data, package_ids)
+    return trucks, package_data, timeline
+
+
+def route_day(trucks, package_data, distance_index, router=None, workers=None):
+    """
+    Assigns every package in the table to the trucks and routes each truck.
+
+    Parameters:
+    - router: A function called as router(truck, package_data, distance_index) for each truck,
+      such as `deadline_routing.deadline_aware_delivery`. Defaults to `nearest_neighbor_delivery`.
+    - workers: If set, route the trucks in this many worker processes sharing one copy of the
+      distance matrix (see `parallel_routing.parallel_delivery`). The routes are the same either way.
+
+    Returns:
+    - The sorted package IDs.
 
-    # Assign packages
-    truck1.packages = [1, 13, 14, 15, 16, 19, 20, 29, 30, 31, 34, 37, 40]
-    truck2.packages = [3, 6, 12, 17, 18, 21, 22, 23, 24, 26, 27, 33, 35, 36, 38, 39]
-    truck3.packages = [2, 4, 5, 7, 8, 9, 10, 11, 25, 28, 32]
+    Time Complexity: O(n log n + t^2), where n is the number of packages and t the packages per truck.
+    """
+    package_ids = sorted(package_data)
+    with instrumentation.stage('assign'):
+        assign_packages(trucks, package_data, package_ids, distance_index)
+    router = router or nearest_neighbor_delivery
+    if workers:
+        from parallel_routing import parallel_delivery
+        parallel_delivery(trucks, package_data, distance_index, router=router, max_workers=workers)
+        return package_ids
+    for truck in trucks:
+        router(truck, package_data, distance_index)
+    return package_ids
+
+
+def run_program():
+    """
+    Plans the day, then runs the interactive menu until the user exits.
+
+    Returns:
+    - The exit status, 0.
 
-    # Deliver packages
-    nearest_neighbor_delivery(truck1, package_data, distance_matrix, address_list)
-    nearest_neighbor_delivery(truck2, package_data, distance_matrix, address_list)
-    nearest_neighbor_delivery(truck3, package_data, distance_matrix, address_list)
+    Time Complexity: See `main`.
+    """
+    trucks, package_data, timeline = plan_day()
+    package_ids = sorted(package_data)
+    id_range = f"{package_ids[0]}-{package_ids[-1]}" if package_ids else "none loaded"
 
     # Define time pattern
     time_pattern = r"^(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d$"
@@ -72,29 +185,28 @@ def main():
         ans = input("Which option would you like to select?:  ")
         if ans == '1':
             # Print final delivery status and total mileage
-            for i in range(1, 41):
-                package = package_data.lookup(i)
+            for package_id in package_ids:
+                package = package_data.lookup(package_id)
                 print(package, "\n")
-            total_mileage = truck1.miles + truck2.miles + truck3.miles
+            total_mileage = sum(truck.miles for truck in trucks)
             print(f"\n\nThe total mileage for all trucks is {round(total_mileage, 2)}.")
 
         elif ans == '2':
             # Lookup a single package status at a specific time
             while True:
                 print("If you want to go back to the main menu at any time, enter 'q'")
-                user_package_id = input("Enter a valid Package ID (1-40): ")
+                user_package_id = input(f"Enter a valid Package ID ({id_range}): ")
                 if user_package_id == 'q':
                     break
-                if user_package_id.isnumeric() and 1 <= int(user_package_id) <= 40:
+                if user_package_id.isnumeric() and int(user_package_id) in package_data:
                     package_id = int(user_package_id)
                     user_time = input("Enter time in HH:MM:SS format: ")
                     if re.match(time_pattern, user_time):
                         h, m, s = map(int, user_time.split(":"))
                         current_time = timedelta(hours=h, minutes=m, seconds=s)
-                        package = package_data.lookup(package_id)
-                        update_package_9(package, current_time)
-                        package.update_status(current_time)
-                        print(package, "\n")
+                        with instrumentation.stage('status query'):
+                            status = timeline.status(package_id, current_time)
+                        print(status, "\n")
                     else:
                         print("\nInvalid time format. Please try again (e.g., 08:35:00).")
                 else:
@@ -109,10 +221,9 @@ def main():
                 if re.match(time_pattern, user_time):
                     h, m, s = map(int, user_time.split(":"))
                     current_time = timedelta(hours=h, minutes=m, seconds=s)
-                    for i in range(1, 41):
-                        package = package_data.lookup(i)
-                        update_package_9(package, current_time)
-                        package.update_status(current_time)
+                    with instrumentation.stage('snapshot query'):
+                        snapshot = timeline.snapshot(current_time)
+                    for package in snapshot:
                         print(package)
                     print("\n")
                 else:
@@ -121,52 +232,25 @@ def main():
         elif ans == '4':
             # Exit the program
             print("\nThank you for using WGUPS. Goodbye!\n")
-            exit()
+            return 0
         else:
             print("\nInvalid choice. Please try again.")
 
 
-def calculate_distance(address1, address2, distance_matrix, address_list):
+def calculate_distance(address1, address2, distance_index):
     """
     Calculates the distance between two addresses.
 
     Process Flow:
-    1. Find the indices of the two addresses in the address list.
-    2. Use these indices to access the corresponding distance in the distance matrix.
-    3. Handle cases where the distance is not directly available (use the reverse distance).
-
-    Time Complexity: O(n), where n is the size of the address list.
-    """
-    index1 = address_list.index(address1)
-    index2 = address_list.index(address2)
-    distance = distance_matrix[index1][index2]
-    return float(distance if distance else distance_matrix[index2][index1])
-
-
-def update_package_9(package, time):
-    """
-    Dynamically updates the address for package #9.
-
-    Process Flow:
-    1. Check if the package ID is 9.
-    2. Update the delivery address and zip code based on the current time.
-    3. Add or update notes if necessary.
+    1. Resolve both addresses to their integer ids in the distance index.
+    2. Read the distance from the precomputed symmetric matrix.
 
-    Time Complexity: O(1).
+    Time Complexity: O(1) - Two dictionary lookups and one array access.
     """
-    if package.package_id == 9:
-        if time < timedelta(hours=10, minutes=20):
-            package.delivery_address = '300 State St'
-            package.delivery_zip_code = 84103
-            package.notes = package.notes.replace(". Address fixed at 10:20:00", "")
-        else:
-            package.delivery_address = '410 S State St'
-            package.delivery_zip_code = 84111
-            if ". Address fixed at 10:20:00" not in package.notes:
-                package.notes += ". Address fixed at 10:20:00"
+    return distance_index.distance(address1, address2)
 
 
-def nearest_neighbor_delivery(truck, package_data, distance_matrix, address_list):
+def nearest_neighbor_delivery(truck, package_data, distance_index):
     """
     Implements the Nearest Neighbor Algorithm for package delivery.
 
@@ -189,8 +273,8 @@ def nearest_neighbor_delivery(truck, package_data, distance_matrix, address_list
 
         for package in not_delivered:
             package.reset_package()
-            update_package_9(package, truck.total_time_traveled)
-            distance = calculate_distance(truck.location, package.delivery_address, distance_matrix, address_list)
+            apply_address_correction(package, truck.time_ticks)
+            distance = calculate_distance(truck.location, package.delivery_address, distance_index)
             if distance < shortest_distance:
                 shortest_distance = distance
                 nearest_package = package
@@ -198,76 +282,13 @@ def nearest_neighbor_delivery(truck, package_data, distance_matrix, address_list
         truck.packages.append(nearest_package.package_id)
         not_delivered.remove(nearest_package)
         truck.miles += shortest_distance
-        truck.total_time_traveled += timedelta(hours=shortest_distance / truck.speed)
+        truck.time_ticks += travel_ticks(shortest_distance, truck.speed)
         truck.location = nearest_package.delivery_address
-        nearest_package.delivery_time = truck.total_time_traveled
-        nearest_package.depart_time = truck.depart_time
+        nearest_package.delivery_ticks = truck.time_ticks
+        nearest_package.depart_ticks = truck.depart_ticks
         nearest_package.status = "Delivered"
         nearest_package.truck = truck.truck_number
 
 
-def load_distance_table():
-    """
-    Loads the distance matrix.
-
-    Process Flow:
-    1. Open the distance CSV file.
-    2. Read all rows and convert them into a list of lists.
-
-    Time Complexity: O(n), where n is the number of rows in the CSV file.
-    """
-    with open("./csv/distances.csv", mode='r', encoding='utf-8-sig') as file:
-        distance_data = csv.reader(file)
-        distance_list = list(distance_data)
-    return distance_list
-
-
-def load_address_data():
-    """
-    Loads the address list.
-
-    Process Flow:
-    1. Open the address CSV file.
-    2. Read all rows and convert them into a list of lists.
-
-    Time Complexity: O(n), where n is the number of rows in the CSV file.
-    """
-    with open("./csv/addresses.csv") as address_csv:
-        address_data = csv.reader(address_csv)
-        address_list = list(address_data)
-    return address_list
-
-
-def load_package_data():
-    """
-    Loads package data into a hash table.
-
-    Process Flow:
-    1. Initialize a hash table to store package data.
-    2. Open the package CSV file and read rows one by one.
-    3. For each row, create a Package object and insert it into the hash table.
-
-    Time Complexity: O(n), where n is the number of packages.
-    """
-    hash_table = HashTable()
-    with open("./csv/packages.csv", mode='r', encoding='utf-8-sig') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            package_id = int(row['PackageID'])
-            package = Package(
-                package_id=package_id,
-                address=row['Address'],
-                deadline=row['Deadline'],
-                city=row['City'],
-                state=row['State'],
-                zip_code=row['Zip'],
-                weight=float(row['Weight']),
-                status=row.get('Status', 'at hub'),
-                notes=row['Notes']
-            )
-            hash_table.insert(package_id, package)
-    return hash_table
-
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,8 +1,129 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from clock import to_ticks, to_timedelta
+
+# Notes that mark a package's listed address as wrong, so a configured correction applies to it
+WRONG_ADDRESS_NOTE = "wrong address listed"
+
+AddressCorrection = namedtuple('AddressCorrection', [
+    'listed_address', 'listed_zip_code', 'address', 'zip_code', 'ticks'])
+AddressCorrection.__doc__ = """
+A wrongly listed address and its fix: the package goes to the listed address until `ticks`, the
+time of day in clock ticks when the corrected address becomes known, and to `address` after.
+"""
+
+
+@lru_cache(maxsize=1024)
+def parse_deadline(deadline):
+    """
+    Parses a raw deadline string such as "10:30 AM" or "EOD" into a time of day.
+
+    Manifests repeat a handful of deadlines, so results are cached to skip `strptime`.
+
+    Returns:
+    - A timedelta since midnight, or None for end-of-day ("EOD") deadlines.
+
+    Time Complexity: O(1).
+    """
+    if deadline is None or deadline.strip().upper() == 'EOD':
+        return None
+    parsed = datetime.strptime(deadline.strip(), '%I:%M %p')
+    return timedelta(hours=parsed.hour, minutes=parsed.minute)
+
+
+def apply_address_correction(package, ticks):
+    """
+    Sets a package's address as known at a time of day, if it has a scheduled address correction.
+
+    Process Flow:
+    1. Return unchanged if the package has no `address_correction`.
+    2. Before the correction time, given in clock ticks, use the listed address and zip code.
+       From then on, use the corrected ones.
+    3. Add or remove the note recording when the address was fixed.
+
+    Time Complexity: O(1).
+    """
+    correction = package.address_correction
+    if correction is None:
+        return
+    fixed_note = _fixed_note(correction)
+    if ticks < correction.ticks:
+        package.delivery_address = correction.listed_address
+        package.delivery_zip_code = correction.listed_zip_code
+        package.notes = package.notes.replace(fixed_note, "")
+    else:
+        package.delivery_address = correction.address
+        package.delivery_zip_code = correction.zip_code
+        if fixed_note not in package.notes:
+            package.notes += fixed_note
+
+
+def clear_address_correction(package):
+    """
+    Cancels a package's scheduled address correction, for example when an event sets its address.
+
+    The package keeps its current address, and the note recording when the address was fixed is removed.
+
+    Time Complexity: O(1).
+    """
+    correction = package.address_correction
+    if correction is not None:
+        package.notes = package.notes.replace(_fixed_note(correction), "")
+        package.address_correction = None
+
+
+def _fixed_note(correction):
+    """
+    Returns the note suffix recording when a corrected address became known.
+
+    Time Complexity: O(1).
+    """
+    return f". Address fixed at {to_timedelta(correction.ticks)}"
+
+
+def attach_address_corrections(package_data, corrections):
+    """
+    Schedules the configured address corrections for the packages whose notes ask for one.
+
+    A correction applies only to a package in the table whose notes say its address is wrong
+    ("Wrong address listed"). Other packages keep their listed address, whatever their ID.
+
+    Parameters:
+    - package_data: The hash table (or PackageStore) of packages.
+    - corrections: A dictionary mapping package IDs to (address, zip_code, time), where time is a
+      timedelta since midnight when the corrected address becomes known.
+
+    Returns:
+    - The IDs of the packages that were given a correction.
+
+    Time Complexity: O(c), where c is the number of configured corrections.
+    """
+    corrected = []
+    for package_id, (address, zip_code, time) in corrections.items():
+        package = package_data.lookup(package_id)
+        if package is None or WRONG_ADDRESS_NOTE not in package.notes.lower():
+            continue
+        package.address_correction = AddressCorrection(
+            package.delivery_address, package.delivery_zip_code, address, str(zip_code), to_ticks(time))
+        corrected.append(package_id)
+    return corrected
+
+
 class Package:
     """
     Represents a delivery package with all necessary details.
+
+    Uses __slots__ instead of a per-instance __dict__. This saves only about 56 bytes, or 14%, per
+    package at 100,000 packages (see benchmarks/bench_package_memory.py), because the strings
+    dominate. For large archives, the real saving comes from `package_store.PackageStore`.
     """
 
+    __slots__ = ('package_id', 'delivery_address', '_delivery_deadline', 'deadline_ticks', 'delivery_city',
+                 'delivery_state', 'delivery_zip_code', 'package_weight', 'notes', 'status', 'truck',
+                 'depart_ticks', 'delivery_ticks', 'address_correction')
+
     def __init__(self, package_id, address, deadline, city, state, zip_code, weight, notes, status):
         """
         Initializes a Package instance with all required attributes.
@@ -10,14 +131,16 @@ class Package:
         Parameters:
         - package_id: Unique identifier for the package.
         - address: The delivery address for the package.
-        - deadline: The deadline by which the package must be delivered.
+        - deadline: The deadline by which the package must be delivered, such as "10:30 AM" or "EOD".
+          It is parsed once here into `deadline_ticks`.
         - city: City of the delivery address.
         - state: State of the delivery address.
-        - zip_code: Zip code for the delivery address.
+        - zip_code: Zip code for the delivery address, always stored as a string.
         - weight: Weight of the package in pounds.
         - notes: Any special instructions or notes about the package.
         - status: Current status of the package (default is 'at hub').
         - delivery_time: Time at which the package is delivered (default is None, to be set upon delivery).
+        - address_correction: A scheduled AddressCorrection, set by `attach_address_corrections`.
 
         Time Complexity: O(1) - Initializing an object involves constant time operations.
         """
@@ -27,15 +150,16 @@ class Package:
         self.delivery_deadline = deadline
         self.delivery_city = city
         self.delivery_state = state
-        self.delivery_zip_code = zip_code
+        self.delivery_zip_code = str(zip_code)
         self.package_weight = weight
         self.notes = notes
         self.status = status
 
-        # Additional attributes related to delivery
+        # Additional attributes related to delivery, with times in clock ticks
         self.truck = None  # Truck assigned to deliver the package
-        self.depart_time = None  # Time the package departs the hub
-        self.delivery_time = None  # Time the package is delivered
+        self.depart_ticks = None  # Time the package departs the hub
+        self.delivery_ticks = None  # Time the package is delivered
+        self.address_correction = None  # Scheduled fix of a wrongly listed address, if any
     
     def __str__(self):
         """
@@ -50,13 +174,59 @@ class Package:
         str_3 = f" Weight: {self.package_weight}, Status: {self.status}, Truck Number: {self.truck},"
         str_4 = f" Depart Time: {self.depart_time}, Delivery Time: {self.delivery_time}, Notes: {self.notes}"
         return (str_1 + str_2 + str_3 + str_4)
+
+    @property
+    def delivery_deadline(self):
+        """
+        The raw deadline string. Assigning it also updates `deadline_ticks`, the parsed time of day
+        in clock ticks (None for end of day).
+
+        Raises:
+        - ValueError: If an assigned deadline cannot be parsed.
+        """
+        return self._delivery_deadline
+
+    @delivery_deadline.setter
+    def delivery_deadline(self, value):
+        self.deadline_ticks = to_ticks(parse_deadline(value))
+        self._delivery_deadline = value
+
+    @property
+    def deadline_time(self):
+        """
+        The parsed deadline as a timedelta since midnight, or None for end of day.
+        """
+        return to_timedelta(self.deadline_ticks)
+
+    @property
+    def depart_time(self):
+        """
+        The time the package departs the hub as a timedelta, or None. Routing code uses `depart_ticks`.
+        """
+        return to_timedelta(self.depart_ticks)
+
+    @depart_time.setter
+    def depart_time(self, value):
+        self.depart_ticks = to_ticks(value)
+
+    @property
+    def delivery_time(self):
+        """
+        The time the package is delivered as a timedelta, or None. Routing code uses `delivery_ticks`.
+        """
+        return to_timedelta(self.delivery_ticks)
+
+    @delivery_time.setter
+    def delivery_time(self, value):
+        self.delivery_ticks = to_ticks(value)
     
     def update_status(self, time):
         """
         Updates the status of the package based on the current time.
 
         Parameters:
-        - time: A timedelta object representing the current time.
+        - time: A timedelta object representing the current time. It is compared with the
+          package's times in clock ticks (see `clock.to_ticks`).
 
         Status Updates:
         - "delivered": If the package's delivery time is earlier than the current time.
@@ -66,22 +236,23 @@ class Package:
         Time Complexity: O(1) - The status update involves a series of constant-time comparisons
         and attribute updates.
         """
-        if self.delivery_time and self.delivery_time < time:
+        ticks = to_ticks(time)
+        if self.delivery_ticks and self.delivery_ticks < ticks:
             # Package has been delivered
             self.status = "delivered"
-        elif self.depart_time and self.depart_time <= time <= self.delivery_time:
+        elif self.depart_ticks and self.depart_ticks <= ticks <= self.delivery_ticks:
             # Package is currently being delivered
             self.status = "en route"
-            self.delivery_time = None
+            self.delivery_ticks = None
         else:
             # Package is still at the hub
             self.status = "at hub"
             self.truck = None  # Truck assigned to deliver the package
-            self.depart_time = None  # Time the package departs the hub
-            self.delivery_time = None  # Time the package is delivered
+            self.depart_ticks = None  # Time the package departs the hub
+            self.delivery_ticks = None  # Time the package is delivered
 
     def reset_package(self):
         self.truck = None  # Truck assigned to deliver the package
-        self.depart_time = None  # Time the package departs the hub
-        self.delivery_time = None  # Time the package is delivered
+        self.depart_ticks = None  # Time the package departs the hub
+        self.delivery_ticks = None  # Time the package is delivered
         self.status = 'at hub'
\ No newline at end of file
@@ -0,0 +1,354 @@
+from array import array
+from bisect import bisect_left
+
+from clock import TICKS_PER_SECOND, to_ticks, to_timedelta
+from package import Package, parse_deadline
+
+NO_VALUE = -1  # Stored in integer columns in place of None
+
+
+class _StringTable:
+    """
+    Interns repeated strings so each distinct value is stored once and referenced by an integer id.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty table.
+
+        Time Complexity: O(1).
+        """
+        self.values = []
+        self.ids = {}
+
+    def intern(self, value):
+        """
+        Returns the id of a string, adding it to the table if it is new.
+
+        Time Complexity: O(1) - A single dictionary lookup.
+        """
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+def _text_column(column, table):
+    """
+    Builds a property that reads and writes an interned string column.
+
+    Time Complexity: O(1) per access.
+    """
+    def getter(record):
+        store = record._store
+        return getattr(store, table).values[getattr(store, column)[record._row]]
+
+    def setter(record, value):
+        store = record._store
+        getattr(store, column)[record._row] = getattr(store, table).intern(value)
+    return property(getter, setter)
+
+
+def _ticks_column(column):
+    """
+    Builds a property that reads and writes an optional time in clock ticks (microseconds).
+
+    Time Complexity: O(1) per access.
+    """
+    def getter(record):
+        value = getattr(record._store, column)[record._row]
+        return None if value == NO_VALUE else value
+
+    def setter(record, value):
+        getattr(record._store, column)[record._row] = NO_VALUE if value is None else value
+    return property(getter, setter)
+
+
+def _time_column(column):
+    """
+    Builds a property that reads and writes an optional timedelta stored in clock ticks.
+
+    Time Complexity: O(1) per access.
+    """
+    def getter(record):
+        value = getattr(record._store, column)[record._row]
+        return None if value == NO_VALUE else to_timedelta(value)
+
+    def setter(record, value):
+        getattr(record._store, column)[record._row] = NO_VALUE if value is None else to_ticks(value)
+    return property(getter, setter)
+
+
+class PackageRecord:
+    """
+    A view of one row of a PackageStore that behaves like a Package.
+
+    Reading or assigning an attribute reads or writes the store's columns, so routing code can
+    update packages through the view exactly as it would through a Package object.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        """
+        Initializes a view of one row.
+
+        Time Complexity: O(1).
+        """
+        self._store = store
+        self._row = row
+
+    @property
+    def package_id(self):
+        return self._store.ids[self._row]
+
+    @property
+    def delivery_deadline(self):
+        store = self._store
+        return store.strings.values[store.deadline_ids[self._row]]
+
+    @delivery_deadline.setter
+    def delivery_deadline(self, value):
+        store = self._store
+        store.deadline_ids[self._row] = store.strings.intern(value)
+        store.deadlines[self._row] = _deadline_seconds(value)
+
+    @property
+    def deadline_seconds(self):
+        """
+        The parsed deadline in seconds since midnight, or -1 for end of day.
+        """
+        return self._store.deadlines[self._row]
+
+    @property
+    def deadline_ticks(self):
+        """
+        The parsed deadline in clock ticks, or None for end of day, as on Package.
+        """
+        value = self._store.deadlines[self._row]
+        return None if value == NO_VALUE else value * TICKS_PER_SECOND
+
+    @property
+    def deadline_time(self):
+        """
+        The parsed deadline as a timedelta since midnight, or None for end of day, as on Package.
+        """
+        return to_timedelta(self.deadline_ticks)
+
+    @property
+    def package_weight(self):
+        return self._store.weights[self._row]
+
+    @package_weight.setter
+    def package_weight(self, value):
+        self._store.weights[self._row] = value
+
+    @property
+    def truck(self):
+        value = self._store.trucks[self._row]
+        return None if value == NO_VALUE else value
+
+    @truck.setter
+    def truck(self, value):
+        self._store.trucks[self._row] = NO_VALUE if value is None else value
+
+    delivery_address = _text_column('address_ids', 'addresses')
+    delivery_city = _text_column('city_ids', 'strings')
+    delivery_state = _text_column('state_ids', 'strings')
+    notes = _text_column('note_ids', 'strings')
+    status = _text_column('status_ids', 'strings')
+    depart_ticks = _ticks_column('depart_times')
+    delivery_ticks = _ticks_column('delivery_times')
+    depart_time = _time_column('depart_times')
+    delivery_time = _time_column('delivery_times')
+
+    @property
+    def delivery_zip_code(self):
+        store = self._store
+        return store.strings.values[store.zip_ids[self._row]]
+
+    @delivery_zip_code.setter
+    def delivery_zip_code(self, value):
+        store = self._store
+        store.zip_ids[self._row] = store.strings.intern(str(value))
+
+    @property
+    def address_correction(self):
+        return self._store.corrections.get(self._row)
+
+    @address_correction.setter
+    def address_correction(self, value):
+        if value is None:
+            self._store.corrections.pop(self._row, None)
+        else:
+            self._store.corrections[self._row] = value
+
+    __str__ = Package.__str__
+    update_status = Package.update_status
+    reset_package = Package.reset_package
+
+    def __copy__(self):
+        """
+        Returns a detached Package with this row's current values, so changes to the copy
+        never reach the store.
+
+        Time Complexity: O(1).
+        """
+        return self._store.to_package(self._row)
+
+
+def _deadline_seconds(deadline):
+    """
+    Converts a raw deadline string to seconds since midnight, or -1 for end of day.
+
+    Time Complexity: O(1).
+    """
+    parsed = parse_deadline(deadline)
+    return NO_VALUE if parsed is None else int(parsed.total_seconds())
+
+
+class PackageStore:
+    """
+    A columnar package table that keeps each field in a typed array instead of one object per package.
+
+    Repeated strings (addresses, cities, deadlines, notes and statuses) are interned and stored as
+    integer ids. It offers the same `insert` and `lookup` methods as HashTable, so it can replace
+    it as `package_data`.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty store.
+
+        Attributes:
+        - ids, weights, deadlines: Package IDs, weights, and deadlines in seconds (-1 for EOD).
+        - address_ids: Interned address ids, indexing `addresses.values`.
+        - city_ids, state_ids, zip_ids, deadline_ids, note_ids, status_ids: Interned string ids.
+        - trucks, depart_times, delivery_times: Delivery state, with -1 for None.
+        - corrections: Scheduled address corrections by row. Few packages have one, so they are
+          kept in a dictionary rather than a column.
+
+        Time Complexity: O(1).
+        """
+        self.addresses = _StringTable()
+        self.strings = _StringTable()
+        self.ids = array('q')
+        self.weights = array('d')
+        self.deadlines = array('i')
+        self.address_ids = array('i')
+        self.city_ids = array('i')
+        self.state_ids = array('i')
+        self.zip_ids = array('i')
+        self.deadline_ids = array('i')
+        self.note_ids = array('i')
+        self.status_ids = array('i')
+        self.trucks = array('i')
+        self.depart_times = array('q')
+        self.delivery_times = array('q')
+        self.corrections = {}
+        self._rows = None  # Only built if IDs stop arriving in increasing order
+
+    def __len__(self):
+        """
+        Returns the number of packages stored.
+
+        Time Complexity: O(1).
+        """
+        return len(self.ids)
+
+    def __contains__(self, package_id):
+        """
+        Checks whether a package ID is stored.
+
+        Time Complexity: O(log n) while IDs are sorted, otherwise O(1).
+        """
+        return self._row_of(package_id) >= 0
+
+    def __iter__(self):
+        """
+        Iterates over the stored package IDs in insertion order.
+
+        Time Complexity: O(n).
+        """
+        return iter(self.ids)
+
+    def _row_of(self, package_id):
+        """
+        Returns the row holding a package ID, or -1 if it is not stored.
+
+        While package IDs arrive in increasing order (as they do in packages.csv), rows are found
+        by binary search over the ID column and no index is kept. Otherwise a dictionary index is used.
+
+        Time Complexity: O(log n) while IDs are sorted, otherwise O(1).
+        """
+        if self._rows is not None:
+            return self._rows.get(package_id, -1)
+        ids = self.ids
+        row = bisect_left(ids, package_id)
+        return row if row < len(ids) and ids[row] == package_id else -1
+
+    def insert(self, package_id, package):
+        """
+        Stores a package's fields in a new row, or overwrites the row for an existing ID.
+
+        Parameters:
+        - package_id: Unique identifier of the package.
+        - package: A Package (or any object with the same attributes).
+
+        Time Complexity: Amortized O(1) for increasing IDs, O(log n) to overwrite an existing one.
+        """
+        row = self._row_of(package_id)
+        if row < 0:
+            row = len(self.ids)
+            if self._rows is None and row and package_id < self.ids[-1]:
+                self._rows = {existing: index for index, existing in enumerate(self.ids)}
+            if self._rows is not None:
+                self._rows[package_id] = row
+            self.ids.append(package_id)
+            for column in (self.weights, self.deadlines, self.address_ids, self.city_ids, self.state_ids,
+                           self.zip_ids, self.deadline_ids, self.note_ids, self.status_ids, self.trucks,
+                           self.depart_times, self.delivery_times):
+                column.append(0)
+
+        record = PackageRecord(self, row)
+        record.delivery_address = package.delivery_address
+        record.delivery_deadline = package.delivery_deadline
+        record.delivery_city = package.delivery_city
+        record.delivery_state = package.delivery_state
+        record.delivery_zip_code = package.delivery_zip_code
+        record.package_weight = package.package_weight
+        record.notes = package.notes
+        record.status = package.status
+        record.truck = package.truck
+        record.depart_ticks = package.depart_ticks
+        record.delivery_ticks = package.delivery_ticks
+        record.address_correction = package.address_correction
+
+    def lookup(self, package_id):
+        """
+        Finds a package by its package_id.
+
+        Returns:
+        - A PackageRecord view of the package if found, otherwise None.
+
+        Time Complexity: O(log n) while IDs are sorted, otherwise O(1).
+        """
+        row = self._row_of(package_id)
+        return PackageRecord(self, row) if row >= 0 else None
+
+    def to_package(self, row):
+        """
+        Builds a standalone Package from one row.
+
+        Time Complexity: O(1).
+        """
+        record = PackageRecord(self, row)
+        package = Package(record.package_id, record.delivery_address, record.delivery_deadline,
+                          record.delivery_city, record.delivery_state, record.delivery_zip_code,
+                          record.package_weight, record.notes, record.status)
+        package.truck = record.truck
+        package.depart_ticks = record.depart_ticks
+        package.delivery_ticks = record.delivery_ticks
+        package.address_correction = record.address_correction
+        return package
@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from distance_index import DistanceIndex
+from hash_table import HashTable
+from main import nearest_neighbor_delivery
+from package import Package
+from route_improvement import improve_route
+from truck import Truck
+
+# Set in each worker process by _init_worker
+_worker_index = None
+_worker_memory = None
+
+
+def parallel_delivery(trucks, package_data, distance_index, router=nearest_neighbor_delivery,
+                      improve_time_budget=None, max_workers=None):
+    """
+    Routes every truck in a separate worker process and merges the results back.
+
+    The distance matrix is copied once into shared memory, and every worker reads it in place,
+    so it is never pickled per task. Each truck only sends its own packages, and each worker
+    returns a compact route result. The outcome is identical to routing the trucks one after
+    another with the same router. An improvement pass stops at its time budget, so its result
+    is only identical when the pass finishes within that budget.
+
+    Parameters:
+    - trucks: The loaded Truck objects to route.
+    - package_data: The hash table of packages. Delivered packages are updated in place.
+    - distance_index: The DistanceIndex to route with.
+    - router: A module-level routing function with the signature of `nearest_neighbor_delivery`.
+    - improve_time_budget: If set, run `improve_route` on each truck with this many seconds.
+    - max_workers: The size of the process pool. Defaults to one worker per truck.
+
+    Process Flow:
+    1. Copy the distance buffer into a shared memory block.
+    2. Start a process pool whose workers attach to the block and wrap it in a DistanceIndex.
+    3. Send each truck and its packages as plain tuples, and route them in the workers.
+    4. Copy each route result back onto the trucks and the packages in the hash table.
+
+    Time Complexity: O(n^2 + sum(t_i^2) / w), where n is the number of addresses, t_i the packages on
+    truck i and w the number of workers.
+    """
+    tasks = [_truck_task(truck, package_data) for truck in trucks]
+    if not tasks:
+        return
+
+    with shared_distance_pool(distance_index, max_workers or len(tasks)) as pool:
+        results = list(pool.map(_route_truck, tasks, [router] * len(tasks),
+                                [improve_time_budget] * len(tasks)))
+
+    for truck, result in zip(trucks, results):
+        _merge_result(truck, package_data, result)
+
+
+@contextmanager
+def shared_distance_pool(distance_index, max_workers=None):
+    """
+    Starts a process pool whose workers share one copy of the distance matrix.
+
+    The distance buffer is copied once into a shared memory block. Each worker attaches to it
+    when it starts, and `worker_distance_index` returns the worker's DistanceIndex over the
+    block. The block is released when the context exits.
+
+    Parameters:
+    - distance_index: The DistanceIndex to share.
+    - max_workers: The size of the process pool, defaulting to the CPU count.
+
+    Yields:
+    - The ProcessPoolExecutor.
+
+    Time Complexity: O(n^2) to copy the matrix once, plus O(n) per worker for the address map,
+    where n is the number of addresses.
+    """
+    buffer = memoryview(distance_index.distances).cast('B')
+    memory = shared_memory.SharedMemory(create=True, size=max(buffer.nbytes, 1))
+    try:
+        memory.buf[:buffer.nbytes] = buffer
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(memory.name, distance_index.addresses)) as pool:
+            yield pool
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def worker_distance_index():
+    """
+    Returns the DistanceIndex of the current worker of a `shared_distance_pool`.
+
+    Time Complexity: O(1).
+    """
+    return _worker_index
+
+
+def _truck_task(truck, package_data):
+    """
+    Packs a truck and its packages into plain tuples for sending to a worker.
+
+    Time Complexity: O(t), where t is the number of packages on the truck.
+    """
+    packages = []
+    for package_id in truck.packages:
+        package = package_data.lookup(package_id)
+        packages.append((package.package_id, package.delivery_address, package.delivery_deadline,
+                         package.delivery_city, package.delivery_state, package.delivery_zip_code,
+                         package.package_weight, package.notes, package.status, package.address_correction))
+    return (truck.truck_number, truck.start_location, truck.location, truck.depart_ticks,
+            truck.time_ticks, truck.miles, packages)
+
+
+def _init_worker(memory_name, address_list):
+    """
+    Attaches a worker process to the shared distance buffer.
+
+    Time Complexity: O(n), where n is the number of addresses, to build the address-to-id map.
+    """
+    global _worker_index, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    size = len(address_list)
+    distances = _worker_memory.buf[:8 * size * size].cast('d')
+    _worker_index = DistanceIndex(address_list, distances)
+
+
+def _route_truck(task, router, improve_time_budget):
+    """
+    Rebuilds a truck and its packages in a worker, routes it, and returns a compact result.
+
+    Returns:
+    - A tuple (route, miles, time_ticks, location, deliveries), where deliveries lists
+      (package_id, delivery_address, delivery_zip_code, notes, delivery_ticks) per package.
+
+    Time Complexity: O(t^2), where t is the number of packages on the truck.
+    """
+    truck_number, start_location, location, depart_ticks, time_ticks, miles, packages = task
+    truck = Truck(truck_number, start_location, None)
+    truck.depart_ticks = depart_ticks
+    truck.location = location
+    truck.time_ticks = time_ticks
+    truck.miles = miles
+    package_data = HashTable(max(2 * len(packages), 1))
+    for package_id, address, deadline, city, state, zip_code, weight, notes, status, correction in packages:
+        package = Package(package_id, address, deadline, city, state, zip_code, weight, notes, status)
+        package.address_correction = correction
+        package_data.insert(package_id, package)
+        truck.packages.append(package_id)
+
+    distance_index = worker_distance_index()
+    router(truck, package_data, distance_index)
+    if improve_time_budget is not None:
+        improve_route(truck, package_data, distance_index, time_budget=improve_time_budget)
+
+    deliveries = []
+    for package_id in truck.packages:
+        package = package_data.lookup(package_id)
+        deliveries.append((package_id, package.delivery_address, package.delivery_zip_code,
+                           package.notes, package.delivery_ticks))
+    return truck.packages, truck.miles, truck.time_ticks, truck.location, deliveries
+
+
+def _merge_result(truck, package_data, result):
+    """
+    Applies a worker's route result to the truck and the packages in the hash table.
+
+    Time Complexity: O(t), where t is the number of packages on the truck.
+    """
+    route, miles, time_ticks, location, deliveries = result
+    truck.packages = list(route)
+    truck.miles = miles
+    truck.time_ticks = time_ticks
+    truck.location = location
+    for package_id, address, zip_code, notes, delivery_ticks in deliveries:
+        package = package_data.lookup(package_id)
+        package.delivery_address = address
+        package.delivery_zip_code = zip_code
+        package.notes = notes
+        package.delivery_ticks = delivery_ticks
+        package.depart_ticks = truck.depart_ticks
+        package.status = "Delivered"
+        package.truck = truck.truck_number
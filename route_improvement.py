@@ -0,0 +1,292 @@
+from time import perf_counter
+
+from clock import travel_ticks
+
+EPSILON = 1e-9
+
+
+def improve_route(truck, package_data, distance_index, time_budget=1.0, max_passes=50, neighbor_count=8):
+    """
+    Improves a delivered route with 2-opt and Or-opt local search.
+
+    Run after `nearest_neighbor_delivery`. The route is treated as an open path starting at the
+    truck's hub and ending at its last stop, matching how mileage is counted.
+
+    Parameters:
+    - truck: A truck whose `packages` list holds the delivered route in order.
+    - package_data: The hash table of packages.
+    - distance_index: The DistanceIndex used to route the truck.
+    - time_budget: Maximum seconds to spend searching.
+    - max_passes: Maximum number of improvement passes over the route.
+    - neighbor_count: How many nearest addresses to consider as move candidates for each address.
+
+    Process Flow:
+    1. Resolve each stop's address to an id and build nearest-neighbor candidate lists per address.
+    2. Repeat 2-opt and Or-opt passes until no move improves the route, or a limit is reached.
+        a. Each candidate move is scored by delta evaluation against the distance matrix.
+        b. An improving move is only applied if it does not add late deliveries.
+    3. Recompute the truck's mileage, time traveled, location and each package's delivery time.
+
+    Returns:
+    - The number of miles saved.
+
+    Time Complexity: O(p * t * k) per search, where p is the number of passes, t the number of
+    stops and k the neighbor list length, plus O(t) for every move that is applied.
+    """
+    packages = [package_data.lookup(package_id) for package_id in truck.packages]
+    if len(packages) < 2:
+        return 0.0
+
+    original_miles = truck.miles
+    route = _Route(truck, packages, distance_index, neighbor_count)
+    deadline = perf_counter() + time_budget
+    passes = 0
+    improved = True
+    while improved and passes < max_passes and perf_counter() < deadline:
+        improved = route.two_opt_pass(deadline)
+        improved = route.or_opt_pass(deadline) or improved
+        passes += 1
+
+    truck.packages = [packages[index].package_id for index in route.order]
+    _reschedule(truck, [packages[index] for index in route.order], distance_index)
+    return original_miles - truck.miles
+
+
+def _reschedule(truck, packages, distance_index):
+    """
+    Replays a route from the hub, updating the truck and each package's delivery time.
+
+    Uses the same arithmetic as `nearest_neighbor_delivery`, so an unchanged route keeps
+    identical mileage and delivery times.
+
+    Time Complexity: O(t), where t is the number of stops.
+    """
+    truck.miles = 0.0
+    truck.time_ticks = truck.depart_ticks
+    truck.location = truck.start_location
+    for package in packages:
+        distance = distance_index.distance(truck.location, package.delivery_address)
+        truck.miles += distance
+        truck.time_ticks += travel_ticks(distance, truck.speed)
+        truck.location = package.delivery_address
+        package.delivery_ticks = truck.time_ticks
+
+
+class _Route:
+    """
+    Mutable route state shared by the 2-opt and Or-opt passes.
+    """
+
+    def __init__(self, truck, packages, distance_index, neighbor_count):
+        """
+        Initializes the route from the truck's current delivery order.
+
+        Time Complexity: O(t + a^2 log a), where t is the number of stops and a the number of
+        distinct addresses on the route.
+        """
+        self.truck = truck
+        self.packages = packages
+        self.distance = distance_index.distance_by_id
+        self.hub = distance_index.id_of(truck.start_location)
+        self.stops = [distance_index.id_of(package.delivery_address) for package in packages]
+        self.deadlines = [package.deadline_ticks for package in packages]
+        self.order = list(range(len(packages)))
+        self.neighbors = self._neighbor_lists(neighbor_count)
+        self.violations = self._violations(self.order)
+        self._index_positions()
+
+    def _neighbor_lists(self, neighbor_count):
+        """
+        Lists, for every address on the route, its nearest route addresses by distance.
+
+        The address itself is included first, so stops sharing an address can be grouped.
+
+        Time Complexity: O(a^2 log a), where a is the number of distinct addresses on the route.
+        """
+        addresses = set(self.stops)
+        addresses.add(self.hub)
+        neighbors = {}
+        for address in addresses:
+            ranked = sorted(addresses, key=lambda other: self.distance(address, other))
+            neighbors[address] = ranked[:neighbor_count + 1]
+        return neighbors
+
+    def _index_positions(self):
+        """
+        Maps every address id to the route positions that visit it. The hub is position -1.
+
+        Time Complexity: O(t), where t is the number of stops.
+        """
+        positions = {self.hub: [-1]}
+        for position, index in enumerate(self.order):
+            positions.setdefault(self.stops[index], []).append(position)
+        self.positions = positions
+
+    def _address(self, position):
+        """
+        Returns the address id at a route position, or the hub for position -1.
+
+        Time Complexity: O(1).
+        """
+        return self.hub if position < 0 else self.stops[self.order[position]]
+
+    def _violations(self, order):
+        """
+        Counts deliveries that miss their deadline or precede an address correction.
+
+        Time Complexity: O(t), where t is the number of stops.
+        """
+        violations = 0
+        time = self.truck.depart_ticks
+        location = self.hub
+        for index in order:
+            time += travel_ticks(self.distance(location, self.stops[index]), self.truck.speed)
+            location = self.stops[index]
+            deadline = self.deadlines[index]
+            if deadline is not None and time > deadline:
+                violations += 1
+            correction = self.packages[index].address_correction
+            if correction is not None and time < correction.ticks:
+                violations += 1
+        return violations
+
+    def _try_apply(self, candidate):
+        """
+        Applies a candidate order if it adds no late deliveries.
+
+        Returns:
+        - True if the candidate was applied, otherwise False.
+
+        Time Complexity: O(t), where t is the number of stops.
+        """
+        violations = self._violations(candidate)
+        if violations > self.violations:
+            return False
+        self.order = candidate
+        self.violations = violations
+        self._index_positions()
+        return True
+
+    def two_opt_pass(self, deadline):
+        """
+        Runs one 2-opt pass, reversing route segments that shorten the path.
+
+        For the edge entering position i, only segments ending at a neighbor of the previous
+        address are considered, and the scan stops once the new edge would be no shorter.
+
+        Returns:
+        - True if at least one move was applied.
+
+        Time Complexity: O(t * k) plus O(t) for every applied move.
+        """
+        distance = self.distance
+        improved = False
+        for i in range(len(self.order)):
+            if perf_counter() >= deadline:
+                break
+            previous = self._address(i - 1)
+            current = self._address(i)
+            removed = distance(previous, current)
+            for candidate in self.neighbors[previous]:
+                added = distance(previous, candidate)
+                if added >= removed:
+                    break
+                if self._two_opt_move(i, candidate, previous, current, added - removed):
+                    improved = True
+                    break
+        return improved
+
+    def _two_opt_move(self, i, candidate, previous, current, delta):
+        """
+        Tries reversing the segment from position i to each later visit of the candidate address.
+
+        Time Complexity: O(v + t), where v is the number of visits to the candidate address.
+        """
+        distance = self.distance
+        last = len(self.order) - 1
+        for j in self.positions.get(candidate, ()):
+            if j <= i:
+                continue
+            change = delta
+            if j < last:
+                following = self._address(j + 1)
+                change += distance(current, following) - distance(candidate, following)
+            if change < -EPSILON:
+                reversed_order = self.order[:i] + self.order[i:j + 1][::-1] + self.order[j + 1:]
+                if self._try_apply(reversed_order):
+                    return True
+        return False
+
+    def or_opt_pass(self, deadline, max_segment=3):
+        """
+        Runs one Or-opt pass, moving segments of up to `max_segment` stops elsewhere in the route.
+
+        Segments are reinserted next to a neighbor of their first stop (forward) or last stop
+        (reversed), in either case only while the new edge is shorter than the removal gain.
+
+        Returns:
+        - True if at least one move was applied.
+
+        Time Complexity: O(t * s * k) plus O(t) for every applied move, where s is `max_segment`.
+        """
+        distance = self.distance
+        improved = False
+        i = 0
+        while i < len(self.order):
+            if perf_counter() >= deadline:
+                break
+            moved = False
+            for length in range(1, max_segment + 1):
+                end = i + length - 1
+                if end >= len(self.order):
+                    break
+                previous = self._address(i - 1)
+                first = self._address(i)
+                last = self._address(end)
+                gain = distance(previous, first)
+                if end + 1 < len(self.order):
+                    following = self._address(end + 1)
+                    gain += distance(last, following) - distance(previous, following)
+                if gain <= EPSILON:
+                    continue
+                if self._or_opt_move(i, end, first, last, gain, reverse=False) or \
+                        self._or_opt_move(i, end, last, first, gain, reverse=True):
+                    moved = True
+                    break
+            if moved:
+                improved = True
+            else:
+                i += 1
+        return improved
+
+    def _or_opt_move(self, i, end, head, tail, gain, reverse):
+        """
+        Tries reinserting positions i..end after a visit to a neighbor of `head`.
+
+        `head` is the stop that follows the insertion point and `tail` the stop that precedes the
+        rest of the route, so a reversed move passes the segment's last stop as `head`.
+
+        Time Complexity: O(k * v + t), where v is the number of visits per candidate address.
+        """
+        distance = self.distance
+        last_position = len(self.order) - 1
+        for candidate in self.neighbors[head]:
+            added = distance(candidate, head)
+            if added >= gain:
+                break
+            for p in self.positions.get(candidate, ()):
+                if i - 1 <= p <= end:
+                    continue
+                cost = added
+                if p < last_position:
+                    following = self._address(p + 1)
+                    cost += distance(tail, following) - distance(candidate, following)
+                if cost - gain < -EPSILON:
+                    segment = self.order[i:end + 1]
+                    if reverse:
+                        segment.reverse()
+                    rest = self.order[:i] + self.order[end + 1:]
+                    insert_at = p + 1 if p < i else p + 1 - len(segment)
+                    if self._try_apply(rest[:insert_at] + segment + rest[insert_at:]):
+                        return True
+        return False
@@ -0,0 +1,149 @@
+"""
+Shortest distances between every pair of addresses.
+
+The distance table gives one direct distance per pair, but a direct distance can be longer than
+going through another address. `metric_closure` replaces every distance with the shortest path
+through the table, so routes use the true driving distance. `add_roads` then adds addresses or
+road links to a closure in place, updating only the distances they change. Requires NumPy.
+"""
+import math
+from array import array
+
+import numpy as np
+
+from distance_index import DistanceIndex
+
+# Rows relaxed together in each Floyd-Warshall step, sized so a block stays in cache
+BLOCK_SIZE = 32
+
+
+def metric_closure(distance_index, block_size=BLOCK_SIZE):
+    """
+    Returns a new DistanceIndex holding the shortest distance between every pair of addresses.
+
+    Runs Floyd-Warshall over the matrix with each step vectorized. Pivots are taken a block at a
+    time, and every block of rows is relaxed through all of a block's pivots while it is in cache.
+    The input index is not modified.
+
+    Process Flow:
+    1. Copy the matrix into a new buffer.
+    2. For each block of pivots, relax the pivot rows first, then every other block of rows,
+       through each pivot in turn.
+    3. Wrap the buffer in a new DistanceIndex with the same addresses.
+
+    Parameters:
+    - distance_index: The DistanceIndex to close. Distances must not be negative.
+    - block_size: The number of pivots and rows handled together.
+
+    Returns:
+    - A DistanceIndex where no distance is longer than a path through other addresses.
+
+    Time Complexity: O(n^3), where n is the number of addresses, in O(n^2 / block_size)
+    vectorized passes over blocks of rows.
+    """
+    distances = array('d')
+    distances.frombytes(memoryview(distance_index.distances).cast('B'))
+    closure = DistanceIndex(distance_index.addresses, distances)
+    matrix = closure.as_numpy()
+    size = closure.size
+    scratch = np.empty((block_size, size))
+    for pivot_start in range(0, size, block_size):
+        pivots = range(pivot_start, min(pivot_start + block_size, size))
+        # The pivot rows go first, so the other blocks read pivot rows already relaxed through
+        # the earlier pivots of the block. Shorter rows only ever hold real path lengths.
+        starts = [pivot_start] + [start for start in range(0, size, block_size) if start != pivot_start]
+        for start in starts:
+            rows = matrix[start:start + block_size]
+            candidates = scratch[:len(rows)]
+            for pivot in pivots:
+                np.add(rows[:, pivot, None], matrix[pivot], out=candidates)
+                np.minimum(rows, candidates, out=rows)
+    return closure
+
+
+def add_roads(distance_index, roads):
+    """
+    Adds two-way road links to a metric closure in place, appending any new addresses.
+
+    A new road can only shorten the paths that use it. For a road from a to b, the pair (i, j)
+    improves only if i reaches b faster through a and j is reached from a faster through b, so
+    just those rows and columns are updated. A new address with one road fills in one row and one
+    column, and a shortcut between known addresses touches only the pairs it shortens.
+
+    Process Flow:
+    1. Check every road and that each new address connects to a known one, before changing anything.
+    2. Append the new addresses with infinite distances.
+    3. Relax each road in both directions over the rows and columns it improves.
+
+    Parameters:
+    - distance_index: A DistanceIndex from `metric_closure`. Its buffer is replaced by a private
+      copy, so other holders of the old buffer, such as a worker pool, keep the old distances.
+    - roads: An iterable of (address1, address2, miles).
+
+    Returns:
+    - The new addresses, in the order they were first named.
+
+    Raises:
+    - ValueError: If a distance is negative or not a finite number, or a new address has no road
+      leading to an address already in the index.
+
+    Time Complexity: O(r * (n + i * j)) for r roads and n addresses, where i and j are the
+    numbers of rows and columns a road improves.
+    """
+    roads = [(address1, address2, float(miles)) for address1, address2, miles in roads]
+    new_addresses = list(dict.fromkeys(address for road in roads for address in road[:2]
+                                       if address not in distance_index))
+    for address1, address2, miles in roads:
+        if not math.isfinite(miles) or miles < 0:
+            raise ValueError(f"Road from {address1!r} to {address2!r} has invalid length {miles}")
+    unreachable = _unreachable(distance_index, roads, new_addresses)
+    if unreachable:
+        raise ValueError(f"Addresses {unreachable} have no road to a known address")
+
+    distance_index.add_addresses(new_addresses)
+    matrix = distance_index.as_numpy()
+    for address1, address2, miles in roads:
+        start = distance_index.id_of(address1)
+        end = distance_index.id_of(address2)
+        _relax(matrix, start, end, miles)
+        _relax(matrix, end, start, miles)
+    return new_addresses
+
+
+def _relax(matrix, start, end, miles):
+    """
+    Shortens every path that is improved by a one-way road from `start` to `end`, in place.
+
+    Time Complexity: O(n + i * j), where i and j are the numbers of improved rows and columns.
+    """
+    rows = np.flatnonzero(matrix[:, start] + miles < matrix[:, end])
+    if not len(rows):
+        return
+    columns = np.flatnonzero(miles + matrix[end] < matrix[start])
+    through = matrix[rows, start, None] + miles + matrix[end, columns]
+    block = np.ix_(rows, columns)
+    matrix[block] = np.minimum(matrix[block], through)
+
+
+def _unreachable(distance_index, roads, new_addresses):
+    """
+    Returns the new addresses that no chain of roads connects to an address already in the index.
+
+    Time Complexity: O(r + m), for r roads and m new addresses.
+    """
+    neighbors = {address: [] for address in new_addresses}
+    for address1, address2, _ in roads:
+        if address1 in neighbors:
+            neighbors[address1].append(address2)
+        if address2 in neighbors:
+            neighbors[address2].append(address1)
+    reached = set()
+    waiting = [address for address in new_addresses
+               if any(neighbor in distance_index for neighbor in neighbors[address])]
+    while waiting:
+        address = waiting.pop()
+        if address not in reached:
+            reached.add(address)
+            waiting.extend(neighbor for neighbor in neighbors[address] if neighbor in neighbors)
+    return [address for address in new_addresses if address not in reached]
+
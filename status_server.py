@@ -0,0 +1,260 @@
+"""
+Serves package status lookups over HTTP with asyncio, from the precomputed delivery timeline.
+
+Run from the repository root:
+    python status_server.py --port 8080
+
+Endpoints (times are HH:MM:SS):
+    GET /status?id=9&at=10:25:00   one package's status at a time
+    GET /snapshot?at=10:25:00      every package's status at a time
+    GET /stats                     request and cache counters
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from cli import STATUS_FIELDS, TIME_PATTERN, format_clock
+from main import plan_day
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+MAX_HEADER_LINES = 100
+
+
+class _TimeEntry:
+    """
+    The encoded statuses for one query time, filled in as packages are requested.
+    """
+
+    __slots__ = ('time', 'records', 'body')
+
+    def __init__(self, time):
+        """
+        Initializes an empty entry for a time.
+
+        Time Complexity: O(1).
+        """
+        self.time = time
+        self.records = {}  # package ID -> encoded JSON record
+        self.body = None  # The encoded snapshot of every package, once requested
+
+
+class SnapshotCache:
+    """
+    A least-recently-used cache of encoded statuses, keyed by query time in whole seconds.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Initializes an empty cache holding at most `maxsize` query times.
+
+        Time Complexity: O(1).
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, seconds):
+        """
+        Returns the entry for a time, creating it and evicting the least recently used one if needed.
+
+        Time Complexity: O(1).
+        """
+        entry = self.entries.get(seconds)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(seconds)
+            return entry
+        self.misses += 1
+        entry = self.entries[seconds] = _TimeEntry(timedelta(seconds=seconds))
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return entry
+
+
+def encode_status(time, status):
+    """
+    Encodes a PackageStatus as a JSON record with the same fields as `cli.py status`.
+
+    Time Complexity: O(1).
+    """
+    values = [format_clock(value) if isinstance(value, timedelta) else value for value in (time,) + tuple(status)]
+    return json.dumps(dict(zip(STATUS_FIELDS, values))).encode()
+
+
+class StatusService:
+    """
+    Answers status requests from a DeliveryTimeline, without any network code.
+
+    The timeline holds immutable snapshots, so requests never modify shared state other than the cache.
+    """
+
+    def __init__(self, timeline, package_ids, cache_size=256):
+        """
+        Initializes the service.
+
+        Parameters:
+        - timeline: The DeliveryTimeline to answer from.
+        - package_ids: The IDs included in a full snapshot, in order.
+        - cache_size: The number of query times to keep encoded.
+
+        Time Complexity: O(n), where n is the number of packages.
+        """
+        self.timeline = timeline
+        self.package_ids = list(package_ids)
+        self.cache = SnapshotCache(cache_size)
+        self.requests = 0
+
+    def handle(self, target):
+        """
+        Answers one GET request.
+
+        Returns:
+        - A tuple (HTTP status code, JSON body bytes).
+
+        Time Complexity: O(log e) for a status lookup, O(n) for an uncached snapshot, O(1) when cached.
+        """
+        self.requests += 1
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == '/stats':
+            return 200, json.dumps({'requests': self.requests, 'cache_hits': self.cache.hits,
+                                    'cache_misses': self.cache.misses, 'cached_times': len(self.cache.entries),
+                                    'cache_size': self.cache.maxsize}).encode()
+        if url.path not in ('/status', '/snapshot'):
+            return 404, _error("unknown path")
+
+        at = query.get('at', [''])[0]
+        if not TIME_PATTERN.match(at):
+            return 400, _error("'at' must be a time in HH:MM:SS format")
+        hours, minutes, seconds = map(int, at.split(':'))
+        seconds += hours * 3600 + minutes * 60
+
+        if url.path == '/snapshot':
+            entry = self.cache.get(seconds)
+            if entry.body is None:
+                entry.body = b'[' + b','.join(self._record(entry, package_id) for package_id in self.package_ids) + b']'
+            return 200, entry.body
+
+        # The ID is checked before the cache is touched, so bad requests never evict a cached time
+        package_id = query.get('id', [''])[0]
+        if not package_id.isdigit():
+            return 400, _error("'id' must be a package ID")
+        package_id = int(package_id)
+        if package_id not in self.timeline:
+            return 404, _error(f"unknown package {package_id}")
+        return 200, self._record(self.cache.get(seconds), package_id)
+
+    def _record(self, entry, package_id):
+        """
+        Returns the encoded status of a package at the entry's time, encoding it on first use.
+
+        Time Complexity: O(1) when cached, otherwise O(log e).
+        """
+        record = entry.records.get(package_id)
+        if record is None:
+            record = entry.records[package_id] = encode_status(entry.time, self.timeline.status(package_id, entry.time))
+        return record
+
+
+def _error(message):
+    """
+    Encodes an error message as a JSON body.
+
+    Time Complexity: O(1).
+    """
+    return json.dumps({'error': message}).encode()
+
+
+def _response(status, body, keep_alive):
+    """
+    Builds an HTTP/1.1 response.
+
+    Time Complexity: O(b), where b is the body length.
+    """
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def _serve_connection(service, reader, writer):
+    """
+    Answers requests on one connection until the client closes it or asks to.
+
+    Time Complexity: O(r), where r is the number of requests on the connection.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode('latin-1').split()
+            keep_alive = len(parts) == 3 and parts[2] == 'HTTP/1.1'
+            for _ in range(MAX_HEADER_LINES):
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = header.decode('latin-1').partition(':')
+                if name.strip().lower() == 'connection':
+                    keep_alive = value.strip().lower() == 'keep-alive'
+            if len(parts) != 3:
+                status, body, keep_alive = 400, _error("malformed request line"), False
+            elif parts[0] != 'GET':
+                status, body = 405, _error("only GET is supported")
+            else:
+                status, body = service.handle(parts[1])
+            writer.write(_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service, host='127.0.0.1', port=8080):
+    """
+    Starts serving a StatusService and returns the asyncio server. Port 0 picks a free port.
+
+    Time Complexity: O(1).
+    """
+    return await asyncio.start_server(lambda reader, writer: _serve_connection(service, reader, writer),
+                                      host, port)
+
+
+def main(argv=None):
+    """
+    Plans the day and serves status queries until interrupted.
+
+    Returns:
+    - The exit status, 0.
+    """
+    parser = argparse.ArgumentParser(description="Serve WGUPS package status queries over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cache-size', type=int, default=256, help="Query times to keep encoded.")
+    args = parser.parse_args(argv)
+
+    _, package_data, timeline = plan_day()
+    service = StatusService(timeline, sorted(package_data), args.cache_size)
+
+    async def serve():
+        server = await start_server(service, args.host, args.port)
+        print(f"Serving on http://{args.host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
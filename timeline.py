@@ -0,0 +1,155 @@
+import copy
+from bisect import bisect_right
+from collections import namedtuple
+
+from clock import to_ticks, to_timedelta
+from package import apply_address_correction
+
+# update_status treats a package as delivered only strictly after its delivery time
+_AFTER = 1
+
+
+class PackageStatus(namedtuple('PackageStatus', [
+        'package_id', 'delivery_address', 'delivery_deadline', 'delivery_city', 'delivery_state',
+        'delivery_zip_code', 'package_weight', 'status', 'truck', 'depart_time', 'delivery_time',
+        'notes'])):
+    """
+    An immutable view of a package's state at one moment of the day.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        """
+        Returns the same representation as `Package.__str__` for the package at that moment.
+
+        Time Complexity: O(1).
+        """
+        str_1 = f"Package ID: {self.package_id}, Address: {self.delivery_address}, Deadline: {self.delivery_deadline}"
+        str_2 = f" City: {self.delivery_city}, State: {self.delivery_state}, Zip Code: {self.delivery_zip_code},"
+        str_3 = f" Weight: {self.package_weight}, Status: {self.status}, Truck Number: {self.truck},"
+        str_4 = f" Depart Time: {self.depart_time}, Delivery Time: {self.delivery_time}, Notes: {self.notes}"
+        return (str_1 + str_2 + str_3 + str_4)
+
+
+class DeliveryTimeline:
+    """
+    A precomputed, read-only index of every package's status over the day.
+    """
+
+    def __init__(self, package_data, package_ids):
+        """
+        Builds the timeline once, after all trucks have been routed.
+
+        Each package gets a sorted tuple of change times in ticks (departure, delivery and any
+        address change) and one PackageStatus per interval between them. The Package objects are read,
+        never modified.
+
+        Parameters:
+        - package_data: The hash table of routed packages.
+        - package_ids: The IDs of the packages to index.
+
+        Time Complexity: O(n), where n is the number of packages. Each package has at most three events.
+        """
+        self._times = {}
+        self._states = {}
+        self.update(package_data, package_ids)
+
+    def update(self, package_data, package_ids):
+        """
+        Re-indexes the given packages from their current state, for example after a truck is re-routed.
+
+        Time Complexity: O(k), where k is the number of packages to index.
+        """
+        for package_id in package_ids:
+            package = package_data.lookup(package_id)
+            events = set()
+            if package.depart_ticks is not None:
+                events.add(package.depart_ticks)
+            if package.delivery_ticks is not None:
+                events.add(package.delivery_ticks + _AFTER)
+            if package.address_correction is not None:
+                events.add(package.address_correction.ticks)
+            times = tuple(sorted(events))
+            # The first interval is represented by a moment just before the first event
+            samples = ((times[0] - _AFTER,) if times else (0,)) + times
+            self._times[package_id] = times
+            self._states[package_id] = tuple(_status_at(package, sample) for sample in samples)
+
+    def __len__(self):
+        """
+        Returns the number of packages in the timeline.
+
+        Time Complexity: O(1).
+        """
+        return len(self._times)
+
+    def __contains__(self, package_id):
+        """
+        Checks whether a package is in the timeline.
+
+        Time Complexity: O(1).
+        """
+        return package_id in self._times
+
+    def status(self, package_id, time):
+        """
+        Returns a package's status at a time of day.
+
+        Parameters:
+        - package_id: The ID of the package.
+        - time: A timedelta since midnight.
+
+        Returns:
+        - A PackageStatus, or None if the package is not in the timeline.
+
+        Time Complexity: O(log e), where e is the number of events for the package.
+        """
+        times = self._times.get(package_id)
+        if times is None:
+            return None
+        return self._states[package_id][bisect_right(times, to_ticks(time))]
+
+    def snapshot(self, time, package_ids=None):
+        """
+        Returns the status of many packages at a time of day.
+
+        Parameters:
+        - time: A timedelta since midnight.
+        - package_ids: The packages to include, in order. Defaults to every package in the timeline.
+
+        Time Complexity: O(n log e), where n is the number of packages requested.
+        """
+        if package_ids is None:
+            package_ids = self._times
+        return [self.status(package_id, time) for package_id in package_ids]
+
+
+def _status_at(package, ticks):
+    """
+    Computes a package's status at a time in ticks, as `apply_address_correction` and `update_status` would,
+    without modifying the package.
+
+    Time Complexity: O(1).
+    """
+    address_source = package
+    if package.address_correction is not None:
+        address_source = copy.copy(package)
+        apply_address_correction(address_source, ticks)
+
+    truck = package.truck
+    depart_ticks = package.depart_ticks
+    delivery_ticks = package.delivery_ticks
+    if delivery_ticks is not None and delivery_ticks < ticks:
+        status = "delivered"
+    elif depart_ticks is not None and depart_ticks <= ticks and (delivery_ticks is None or ticks <= delivery_ticks):
+        status = "en route"
+        delivery_ticks = None
+    else:
+        status = "at hub"
+        truck = depart_ticks = delivery_ticks = None
+
+    return PackageStatus(package.package_id, address_source.delivery_address, package.delivery_deadline,
+                         package.delivery_city, package.delivery_state, address_source.delivery_zip_code,
+                         package.package_weight, status, truck, to_timedelta(depart_ticks),
+                         to_timedelta(delivery_ticks), address_source.notes)
@@ -1,5 +1,8 @@
 import datetime
 
+from clock import to_ticks, to_timedelta
+
+
 class Truck:
     """
     Represents a delivery truck, including its routing and delivery functionality.
@@ -13,11 +16,13 @@ class Truck:
         """
         self.truck_number = truck_number
         self.location = location
+        self.start_location = location  # Hub the truck departs from
         self.speed = 18  # Fixed speed
+        self.capacity = 16  # Maximum packages per load
         self.miles = 0.0  # Initial mileage
         self.packages = []  # Packages assigned to the truck
-        self.depart_time = time  # Departure time
-        self.total_time_traveled = time  # Total time spent traveling
+        self.depart_ticks = to_ticks(time)  # Departure time, in clock ticks
+        self.time_ticks = self.depart_ticks  # Time of day the truck has reached, in clock ticks
 
     def clear(self):
         """
@@ -27,8 +32,30 @@ class Truck:
         """
         self.miles = 0.0
         self.packages.clear()  # Efficiently clears the list of packages
-        self.location = "4001 South 700 East"  # Resets to the hub location
-        self.total_time_traveled = self.depart_time  # Resets to the departure time
+        self.location = self.start_location  # Resets to the truck's hub
+        self.time_ticks = self.depart_ticks  # Resets to the departure time
+
+    @property
+    def depart_time(self):
+        """
+        The departure time as a timedelta since midnight. Routing code uses `depart_ticks`.
+        """
+        return to_timedelta(self.depart_ticks)
+
+    @depart_time.setter
+    def depart_time(self, value):
+        self.depart_ticks = to_ticks(value)
+
+    @property
+    def total_time_traveled(self):
+        """
+        The time of day the truck has reached as a timedelta. Routing code uses `time_ticks`.
+        """
+        return to_timedelta(self.time_ticks)
+
+    @total_time_traveled.setter
+    def total_time_traveled(self, value):
+        self.time_ticks = to_ticks(value)
 
     def __repr__(self):
         """
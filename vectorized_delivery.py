@@ -0,0 +1,66 @@
+import numpy as np
+
+from clock import travel_ticks
+from package import apply_address_correction
+
+
+def vectorized_nearest_neighbor_delivery(truck, package_data, distance_index):
+    """
+    Implements the Nearest Neighbor Algorithm with NumPy, for trucks carrying large manifests.
+
+    Produces exactly the same route, mileage and delivery times as `nearest_neighbor_delivery`.
+    Ties are broken the same way, because argmin returns the first minimum in manifest order.
+
+    Process Flow:
+    1. Retrieve all packages assigned to the truck and resolve their addresses to ids once.
+    2. While there are undelivered packages:
+        a. Gather the distances from the truck's current location to every package in one row read.
+        b. Mask delivered packages and pick the nearest one with a single argmin.
+        c. Update the truck's location, mileage, and time traveled.
+        d. Mark the package as delivered and update its status.
+    3. Repeat until all packages are delivered.
+
+    Time Complexity: O(t^2), where t is the number of packages assigned to the truck,
+    but each of the t steps is a single vectorized pass instead of a Python loop.
+    """
+    packages = [package_data.lookup(package_id) for package_id in truck.packages]
+    truck.packages.clear()
+    if not packages:
+        return
+
+    matrix = distance_index.as_numpy()
+    for package in packages:
+        package.reset_package()
+        apply_address_correction(package, truck.time_ticks)
+    address_ids = np.fromiter(
+        (distance_index.id_of(package.delivery_address) for package in packages),
+        dtype=np.intp,
+        count=len(packages),
+    )
+    # Only packages whose address depends on the time of day need re-resolving between steps
+    dynamic = [index for index, package in enumerate(packages) if package.address_correction is not None]
+    delivered = np.zeros(len(packages), dtype=bool)
+    location_id = distance_index.id_of(truck.location)
+
+    for _ in range(len(packages)):
+        for index in dynamic:
+            if not delivered[index]:
+                apply_address_correction(packages[index], truck.time_ticks)
+                address_ids[index] = distance_index.id_of(packages[index].delivery_address)
+
+        candidates = matrix[location_id, address_ids]
+        candidates[delivered] = np.inf
+        nearest = int(candidates.argmin())
+        shortest_distance = float(candidates[nearest])
+        nearest_package = packages[nearest]
+
+        delivered[nearest] = True
+        truck.packages.append(nearest_package.package_id)
+        truck.miles += shortest_distance
+        truck.time_ticks += travel_ticks(shortest_distance, truck.speed)
+        truck.location = nearest_package.delivery_address
+        location_id = address_ids[nearest]
+        nearest_package.delivery_ticks = truck.time_ticks
+        nearest_package.depart_ticks = truck.depart_ticks
+        nearest_package.status = "Delivered"
+        nearest_package.truck = truck.truck_number